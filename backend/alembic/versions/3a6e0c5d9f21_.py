@@ -0,0 +1,29 @@
+"""add agent_sessions.state_seq
+
+Revision ID: 3a6e0c5d9f21
+Revises: 7d3f1a9c2b64
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a6e0c5d9f21"
+down_revision: Union[str, Sequence[str], None] = "7d3f1a9c2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("agent_sessions", sa.Column("state_seq", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("agent_sessions", "state_seq")
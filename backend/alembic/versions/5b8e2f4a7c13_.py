@@ -0,0 +1,58 @@
+"""add callback_receipts
+
+Revision ID: 5b8e2f4a7c13
+Revises: 3a6e0c5d9f21
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e2f4a7c13"
+down_revision: Union[str, Sequence[str], None] = "3a6e0c5d9f21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "callback_receipts",
+        sa.Column("callback_id", sa.String(length=64), nullable=False),
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["session_id"], ["agent_sessions.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("callback_id"),
+    )
+    op.create_index(
+        op.f("ix_callback_receipts_session_id"),
+        "callback_receipts",
+        ["session_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_callback_receipts_session_id"), table_name="callback_receipts"
+    )
+    op.drop_table("callback_receipts")
@@ -0,0 +1,43 @@
+"""widen agent_sessions.state_seq to bigint
+
+Revision ID: 8f2a6c1d4e97
+Revises: 5b8e2f4a7c13
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2a6c1d4e97"
+down_revision: Union[str, Sequence[str], None] = "5b8e2f4a7c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "agent_sessions",
+        "state_seq",
+        existing_type=sa.Integer(),
+        type_=sa.BigInteger(),
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Time-based sequence numbers do not fit in 32 bits; drop them.
+    op.execute("UPDATE agent_sessions SET state_seq = NULL")
+    op.alter_column(
+        "agent_sessions",
+        "state_seq",
+        existing_type=sa.BigInteger(),
+        type_=sa.Integer(),
+        existing_nullable=True,
+    )
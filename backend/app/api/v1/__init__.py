@@ -7,11 +7,13 @@ from app.api.v1 import (
     env_vars,
     models,
     internal_claude_md,
+    internal_config_version,
     internal_env_vars,
     internal_plugin_config,
     internal_slash_commands,
     internal_mcp_config,
     internal_scheduled_tasks,
+    internal_sessions,
     internal_skill_config,
     internal_subagents,
     internal_user_input_requests,
@@ -53,10 +55,12 @@ api_v1_router.include_router(env_vars.router)
 api_v1_router.include_router(claude_md.router)
 api_v1_router.include_router(models.router)
 api_v1_router.include_router(internal_claude_md.router)
+api_v1_router.include_router(internal_config_version.router)
 api_v1_router.include_router(internal_env_vars.router)
 api_v1_router.include_router(internal_mcp_config.router)
 api_v1_router.include_router(internal_skill_config.router)
 api_v1_router.include_router(internal_scheduled_tasks.router)
+api_v1_router.include_router(internal_sessions.router)
 api_v1_router.include_router(internal_user_input_requests.router)
 api_v1_router.include_router(internal_slash_commands.router)
 api_v1_router.include_router(internal_subagents.router)
@@ -5,7 +5,12 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
-from app.schemas.callback import AgentCallbackRequest, CallbackResponse
+from app.schemas.callback import (
+    AgentCallbackBatchRequest,
+    AgentCallbackRequest,
+    CallbackBatchResponse,
+    CallbackResponse,
+)
 from app.schemas.response import Response, ResponseSchema
 from app.services.callback_service import CallbackService
 
@@ -29,6 +34,48 @@ async def receive_callback(
     )
 
 
+@router.post("/batch", response_model=ResponseSchema[CallbackBatchResponse])
+async def receive_callback_batch(
+    request: AgentCallbackBatchRequest,
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Receives several executor callbacks and applies them in order.
+
+    Each callback commits on its own, so a failure is reported per item instead of
+    failing the request after earlier items were already applied.
+    """
+    results: list[CallbackResponse] = []
+    for index, callback in enumerate(request.callbacks):
+        try:
+            results.append(callback_service.process_agent_callback(db, callback))
+        except Exception:
+            db.rollback()
+            logger.exception(
+                "callback_batch_item_failed",
+                extra={
+                    "callback_session_id": callback.session_id,
+                    "callback_id": callback.callback_id,
+                },
+            )
+            results.extend(
+                CallbackResponse(
+                    session_id=item.session_id,
+                    status="error",
+                    callback_status=item.status,
+                    message="Callback failed"
+                    if item is callback
+                    else "Not applied after an earlier failure",
+                    applied=False,
+                )
+                for item in request.callbacks[index:]
+            )
+            break
+    return Response.success(
+        data=CallbackBatchResponse(results=results),
+        message="Callbacks processed successfully",
+    )
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
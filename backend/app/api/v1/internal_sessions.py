@@ -0,0 +1,58 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
+from app.repositories.session_repository import SessionRepository
+from app.schemas.response import Response, ResponseSchema
+from app.schemas.session import SessionLivenessRequest, SessionLivenessResponse
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def require_internal_token(
+    x_internal_token: str | None = Header(default=None, alias="X-Internal-Token"),
+) -> None:
+    settings = get_settings()
+    if not settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Internal API token is not configured",
+        )
+    if not x_internal_token or x_internal_token != settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Invalid internal token",
+        )
+
+
+@router.post(
+    "/sessions/deleted",
+    response_model=ResponseSchema[SessionLivenessResponse],
+)
+async def list_deleted_sessions(
+    request: SessionLivenessRequest,
+    _: None = Depends(require_internal_token),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Report which of the given sessions are deleted (or never existed).
+
+    Used by Executor Manager to reclaim the exported workspaces of deleted sessions.
+    """
+    parsed: dict[str, uuid.UUID] = {}
+    for session_id in request.session_ids:
+        try:
+            parsed[session_id] = uuid.UUID(session_id)
+        except ValueError:
+            continue
+    live = SessionRepository.list_live_ids(db, list(parsed.values()))
+    deleted = [sid for sid in request.session_ids if parsed.get(sid) not in live]
+    return Response.success(
+        data=SessionLivenessResponse(deleted=deleted).model_dump(),
+        message="Deleted sessions listed",
+    )
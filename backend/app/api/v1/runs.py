@@ -1,3 +1,4 @@
+import time
 import uuid
 
 from fastapi import APIRouter, Depends
@@ -9,12 +10,17 @@ from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.schemas.response import Response, ResponseSchema
 from app.schemas.run import (
+    RunBatchClaimRequest,
+    RunBatchClaimResponse,
     RunClaimRequest,
     RunClaimResponse,
     RunFailRequest,
     RunResponse,
     RunStartRequest,
+    RunWaitRequest,
+    RunWaitResponse,
 )
+from app.services.run_queue_notifier import run_queue_notifier
 from app.services.run_service import RunService
 from app.services.session_service import SessionService
 
@@ -34,6 +40,55 @@ async def claim_next_run(
     return Response.success(data=result, message="Run claimed" if result else "No runs")
 
 
+@router.post("/claim-batch", response_model=ResponseSchema[RunBatchClaimResponse])
+async def claim_runs(
+    request: RunBatchClaimRequest,
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Claim up to `limit` runs in one transaction (at most one per session)."""
+    claims = run_service.claim_runs(db, request)
+    return Response.success(
+        data=RunBatchClaimResponse(runs=claims),
+        message=f"{len(claims)} runs claimed" if claims else "No runs",
+    )
+
+
+@router.post("/wait", response_model=ResponseSchema[RunWaitResponse])
+async def wait_for_runs(
+    request: RunWaitRequest,
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Long-poll until a run may be claimable or the timeout elapses.
+
+    Returns immediately when a matching run is already claimable; otherwise waits for
+    a run queue notification (or the next scheduled run becoming due). `ready` is a
+    hint: callers still claim via /runs/claim-batch, which may race other workers.
+    """
+    deadline = time.monotonic() + request.timeout_seconds
+    while True:
+        # Read the generation before querying so a commit in between isn't missed.
+        generation = run_queue_notifier.generation
+        delay = run_service.seconds_until_claimable(db, request.schedule_modes)
+        if delay == 0:
+            ready = True
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            ready = False
+            break
+        timeout = remaining if delay is None else min(remaining, delay)
+        if not await run_queue_notifier.wait(generation, timeout):
+            if delay is not None and delay <= remaining:
+                # A scheduled run just became due; re-check it.
+                continue
+            ready = False
+            break
+    return Response.success(
+        data=RunWaitResponse(ready=ready),
+        message="Runs available" if ready else "No runs",
+    )
+
+
 @router.post("/{run_id}/start", response_model=ResponseSchema[RunResponse])
 async def start_run(
     run_id: uuid.UUID,
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 import json
 from urllib.error import HTTPError, URLError
@@ -31,12 +32,14 @@ from app.services.session_service import SessionService
 from app.services.storage_service import S3StorageService
 from app.services.tool_execution_service import ToolExecutionService
 from app.services.usage_service import UsageService
+from app.services.workspace_archive_service import WorkspaceArchiveService
 from app.utils.computer import build_browser_screenshot_key
 from app.utils.workspace import build_workspace_file_nodes
 from app.utils.workspace_manifest import (
     build_nodes_from_manifest,
     extract_manifest_files,
     normalize_manifest_path,
+    resolve_manifest_object_key,
 )
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
@@ -46,6 +49,7 @@ message_service = MessageService()
 tool_execution_service = ToolExecutionService()
 usage_service = UsageService()
 storage_service = S3StorageService()
+workspace_archive_service = WorkspaceArchiveService(storage_service)
 
 
 def _cancel_executor_manager(session_id: uuid.UUID, reason: str | None) -> bool:
@@ -395,21 +399,15 @@ async def get_session_workspace_files(
     manifest = storage_service.get_manifest(db_session.workspace_manifest_key)
     raw_nodes = build_nodes_from_manifest(manifest)
     manifest_files = extract_manifest_files(manifest)
-    prefix = (db_session.workspace_files_prefix or "").rstrip("/")
     file_url_map: dict[str, str] = {}
 
     for file_entry in manifest_files:
         file_path = normalize_manifest_path(file_entry.get("path"))
         if not file_path:
             continue
-        object_key = (
-            file_entry.get("key")
-            or file_entry.get("object_key")
-            or file_entry.get("oss_key")
-            or file_entry.get("s3_key")
+        object_key = resolve_manifest_object_key(
+            manifest, file_entry, db_session.workspace_files_prefix
         )
-        if not object_key and prefix:
-            object_key = f"{prefix}/{file_path.lstrip('/')}"
         if not object_key:
             continue
         mime_type = file_entry.get("mimeType") or file_entry.get("mime_type")
@@ -448,13 +446,24 @@ async def get_session_workspace_archive(
         )
 
     filename = f"workspace-{session_id}.zip"
+    manifest_key = (db_session.workspace_manifest_key or "").strip()
     archive_key = (db_session.workspace_archive_key or "").strip()
-    if not archive_key or db_session.workspace_export_status != "ready":
+    if db_session.workspace_export_status != "ready" or not (
+        manifest_key or archive_key
+    ):
         return Response.success(
             data=WorkspaceArchiveResponse(url=None, filename=filename),
             message="Workspace export not ready",
         )
 
+    if manifest_key:
+        # Built on first request and cached per manifest content.
+        archive_key = await asyncio.to_thread(
+            workspace_archive_service.get_or_build,
+            manifest_key,
+            db_session.workspace_files_prefix,
+        )
+
     url = storage_service.presign_get(
         archive_key,
         response_content_disposition=f'attachment; filename="{filename}"',
@@ -4,6 +4,11 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.core.database import engine
+from app.services.config_version_service import register_config_version_listener
+from app.services.run_queue_notifier import (
+    register_run_queue_listeners,
+    run_queue_notifier,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +19,12 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
     logger.info("Database engine initialized")
+    register_config_version_listener()
+    register_run_queue_listeners()
+    run_queue_notifier.start_listener()
     yield
     # Shutdown
+    await run_queue_notifier.stop_listener()
     logger.info("Shutting down database engine...")
     engine.dispose()
     logger.info("Database engine disposed")
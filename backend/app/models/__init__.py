@@ -4,6 +4,7 @@ from app.models.agent_message import AgentMessage
 from app.models.agent_run import AgentRun
 from app.models.agent_scheduled_task import AgentScheduledTask
 from app.models.agent_session import AgentSession
+from app.models.callback_receipt import CallbackReceipt
 from app.models.claude_md import UserClaudeMdSetting
 from app.models.env_var import UserEnvVar
 from app.models.mcp_server import McpServer
@@ -16,6 +17,7 @@ from app.models.slash_command import SlashCommand
 from app.models.sub_agent import SubAgent
 from app.models.tool_execution import ToolExecution
 from app.models.usage_log import UsageLog
+from app.models.user_config_version import UserConfigVersion
 from app.models.user_mcp_install import UserMcpInstall
 from app.models.user_plugin_install import UserPluginInstall
 from app.models.user_input_request import UserInputRequest
@@ -28,6 +30,7 @@ __all__ = [
     "AgentRun",
     "AgentScheduledTask",
     "AgentSession",
+    "CallbackReceipt",
     "UserClaudeMdSetting",
     "UserEnvVar",
     "McpServer",
@@ -40,6 +43,7 @@ __all__ = [
     "SubAgent",
     "ToolExecution",
     "UsageLog",
+    "UserConfigVersion",
     "UserMcpInstall",
     "UserPluginInstall",
     "UserInputRequest",
@@ -1,7 +1,15 @@
 import uuid
 from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import ForeignKey, JSON, Boolean, String, Text, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    JSON,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, TimestampMixin
@@ -32,6 +40,9 @@ class AgentSession(Base, TimestampMixin):
     config_snapshot: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     workspace_archive_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     state_patch: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Executor sequence number of state_patch (grows across runs; time-based, so
+    # 64-bit); state deltas apply only on top of it.
+    state_seq: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     workspace_files_prefix: Mapped[str | None] = mapped_column(Text, nullable=True)
     workspace_manifest_key: Mapped[str | None] = mapped_column(Text, nullable=True)
     workspace_archive_key: Mapped[str | None] = mapped_column(Text, nullable=True)
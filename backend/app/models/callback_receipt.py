@@ -0,0 +1,21 @@
+import uuid
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base, TimestampMixin
+
+
+class CallbackReceipt(Base, TimestampMixin):
+    """Idempotency key of an executor callback that was already processed.
+
+    Executors redeliver un-acked callbacks from their outbox, so the same callback
+    can arrive more than once.
+    """
+
+    __tablename__ = "callback_receipts"
+
+    callback_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("agent_sessions.id", ondelete="CASCADE"), nullable=False, index=True
+    )
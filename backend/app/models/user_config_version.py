@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base, TimestampMixin
+
+
+class UserConfigVersion(Base, TimestampMixin):
+    """Monotonic stamp bumped whenever a user's execution config changes.
+
+    Executor managers compare it to decide whether a cached resolved config is stale.
+    System-scoped resources bump the row of the system user.
+    """
+
+    __tablename__ = "user_config_versions"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
@@ -0,0 +1,28 @@
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.models.callback_receipt import CallbackReceipt
+
+
+class CallbackReceiptRepository:
+    """Data access layer for processed callback idempotency keys."""
+
+    @staticmethod
+    def exists(session_db: Session, callback_id: str) -> bool:
+        """Checks whether a callback was already processed."""
+        return (
+            session_db.query(CallbackReceipt.callback_id)
+            .filter(CallbackReceipt.callback_id == callback_id)
+            .first()
+            is not None
+        )
+
+    @staticmethod
+    def create(
+        session_db: Session, callback_id: str, session_id: uuid.UUID
+    ) -> CallbackReceipt:
+        """Records a processed callback."""
+        receipt = CallbackReceipt(callback_id=callback_id, session_id=session_id)
+        session_db.add(receipt)
+        return receipt
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import exists, select, update
+from sqlalchemy import exists, func, select, update
 from sqlalchemy.orm import Session, aliased
 
 from app.models.agent_run import AgentRun
@@ -97,6 +97,36 @@ class RunRepository:
         result = session_db.connection().execute(stmt)
         return result.rowcount
 
+    @staticmethod
+    def _has_active_run():
+        """EXISTS clause: the run's session already has a claimed/running run."""
+        running_or_claimed = aliased(AgentRun)
+        return exists(
+            select(1)
+            .select_from(running_or_claimed)
+            .where(running_or_claimed.session_id == AgentRun.session_id)
+            .where(running_or_claimed.status.in_(["claimed", "running"]))
+        )
+
+    @staticmethod
+    def next_claimable_at(
+        session_db: Session,
+        schedule_modes: list[str] | None = None,
+    ) -> datetime | None:
+        """Returns the earliest scheduled_at among queued runs a worker could claim.
+
+        A value in the past means a run is claimable now; None means nothing is queued
+        outside sessions that already have an active run.
+        """
+        stmt = (
+            select(func.min(AgentRun.scheduled_at))
+            .where(AgentRun.status == "queued")
+            .where(~RunRepository._has_active_run())
+        )
+        if schedule_modes:
+            stmt = stmt.where(AgentRun.schedule_mode.in_(schedule_modes))
+        return session_db.execute(stmt).scalar()
+
     @staticmethod
     def claim_next(
         session_db: Session,
@@ -104,44 +134,67 @@ class RunRepository:
         lease_seconds: int = 30,
         schedule_modes: list[str] | None = None,
     ) -> AgentRun | None:
-        """Claims the next available run for execution.
+        """Claims the next available run for execution."""
+        runs = RunRepository.claim_batch(
+            session_db,
+            worker_id=worker_id,
+            lease_seconds=lease_seconds,
+            limit=1,
+            schedule_modes=schedule_modes,
+        )
+        return runs[0] if runs else None
+
+    @staticmethod
+    def claim_batch(
+        session_db: Session,
+        worker_id: str,
+        lease_seconds: int = 30,
+        limit: int = 1,
+        schedule_modes: list[str] | None = None,
+    ) -> list[AgentRun]:
+        """Claims up to `limit` available runs in the current transaction.
 
         Uses SELECT ... FOR UPDATE SKIP LOCKED to support multiple workers.
-        Ensures only one claimed/running run per session at a time.
+        Ensures only one claimed/running run per session at a time, including
+        across the runs claimed by this batch.
         """
         if lease_seconds <= 0:
             lease_seconds = 30
+        limit = max(1, limit)
 
         _ = RunRepository.release_expired_claims(session_db)
 
         now = datetime.now(timezone.utc)
         lease_until = now + timedelta(seconds=lease_seconds)
 
-        running_or_claimed = aliased(AgentRun)
-        has_active_run = exists(
-            select(1)
-            .select_from(running_or_claimed)
-            .where(running_or_claimed.session_id == AgentRun.session_id)
-            .where(running_or_claimed.status.in_(["claimed", "running"]))
-        )
-
-        stmt = (
+        base = (
             select(AgentRun)
             .where(AgentRun.status == "queued")
             .where(AgentRun.scheduled_at <= now)
-            .where(~has_active_run)
+            .where(~RunRepository._has_active_run())
             .order_by(AgentRun.scheduled_at.asc(), AgentRun.created_at.asc())
             .with_for_update(skip_locked=True)
-            .limit(1)
         )
         if schedule_modes:
-            stmt = stmt.where(AgentRun.schedule_mode.in_(schedule_modes))
-
-        run = session_db.execute(stmt).scalars().first()
-        if not run:
-            return None
-
-        run.status = "claimed"
-        run.claimed_by = worker_id
-        run.lease_expires_at = lease_until
-        return run
+            base = base.where(AgentRun.schedule_mode.in_(schedule_modes))
+
+        claimed: list[AgentRun] = []
+        claimed_sessions: set[uuid.UUID] = set()
+        while len(claimed) < limit:
+            remaining = limit - len(claimed)
+            # Over-fetch a little: a session may have several queued runs.
+            stmt = base.limit(remaining * 2)
+            if claimed_sessions:
+                stmt = stmt.where(AgentRun.session_id.not_in(claimed_sessions))
+            candidates = session_db.execute(stmt).scalars().all()
+            if not candidates:
+                break
+            for run in candidates:
+                if len(claimed) >= limit or run.session_id in claimed_sessions:
+                    continue
+                run.status = "claimed"
+                run.claimed_by = worker_id
+                run.lease_expires_at = lease_until
+                claimed_sessions.add(run.session_id)
+                claimed.append(run)
+        return claimed
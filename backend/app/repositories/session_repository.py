@@ -118,6 +118,23 @@ class SessionRepository:
             .count()
         )
 
+    @staticmethod
+    def list_live_ids(
+        session_db: Session, session_ids: list[uuid.UUID]
+    ) -> set[uuid.UUID]:
+        """Returns the subset of session_ids that exist and are not deleted."""
+        if not session_ids:
+            return set()
+        rows = (
+            session_db.query(AgentSession.id)
+            .filter(
+                AgentSession.id.in_(session_ids),
+                AgentSession.is_deleted.is_(False),
+            )
+            .all()
+        )
+        return {row[0] for row in rows}
+
     @staticmethod
     def clear_project_id(session_db: Session, project_id: uuid.UUID) -> None:
         session_db.query(AgentSession).filter(
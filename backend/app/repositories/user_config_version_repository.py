@@ -0,0 +1,41 @@
+from collections.abc import Iterable
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.user_config_version import UserConfigVersion
+
+
+class UserConfigVersionRepository:
+    """Data access layer for per-user config version stamps."""
+
+    @staticmethod
+    def get_versions(session_db: Session, user_ids: list[str]) -> dict[str, int]:
+        rows = (
+            session_db.query(UserConfigVersion.user_id, UserConfigVersion.version)
+            .filter(UserConfigVersion.user_id.in_(user_ids))
+            .all()
+        )
+        return {user_id: int(version) for user_id, version in rows}
+
+    @staticmethod
+    def bump(session_db: Session, user_ids: Iterable[str]) -> None:
+        """Atomically increment (or create) the version rows in the current transaction.
+
+        Uses the session connection directly so it is safe to call from flush events.
+        """
+        ids = sorted({uid for uid in user_ids if uid})
+        if not ids:
+            return
+        connection = session_db.connection()
+        insert = (
+            sqlite.insert if connection.dialect.name == "sqlite" else postgresql.insert
+        )
+        table = UserConfigVersion.__table__
+        stmt = insert(table).values([{"user_id": uid, "version": 1} for uid in ids])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={"version": table.c.version + 1, "updated_at": func.now()},
+        )
+        connection.execute(stmt)
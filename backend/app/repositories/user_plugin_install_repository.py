@@ -2,6 +2,9 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.user_plugin_install import UserPluginInstall
+from app.repositories.user_config_version_repository import (
+    UserConfigVersionRepository,
+)
 
 
 class UserPluginInstallRepository:
@@ -55,13 +58,16 @@ class UserPluginInstallRepository:
             if not install_ids:
                 return 0
             query = query.filter(UserPluginInstall.id.in_(install_ids))
-        return query.update(
+        updated = query.update(
             {
                 UserPluginInstall.enabled: enabled,
                 UserPluginInstall.updated_at: func.now(),
             },
             synchronize_session=False,
         )
+        # Bulk updates bypass flush events; bump the config version explicitly.
+        UserConfigVersionRepository.bump(session_db, [user_id])
+        return updated
 
     @staticmethod
     def delete(session_db: Session, install: UserPluginInstall) -> None:
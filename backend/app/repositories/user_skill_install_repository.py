@@ -2,6 +2,9 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.user_skill_install import UserSkillInstall
+from app.repositories.user_config_version_repository import (
+    UserConfigVersionRepository,
+)
 
 
 class UserSkillInstallRepository:
@@ -55,13 +58,16 @@ class UserSkillInstallRepository:
             if not install_ids:
                 return 0
             query = query.filter(UserSkillInstall.id.in_(install_ids))
-        return query.update(
+        updated = query.update(
             {
                 UserSkillInstall.enabled: enabled,
                 UserSkillInstall.updated_at: func.now(),
             },
             synchronize_session=False,
         )
+        # Bulk updates bypass flush events; bump the config version explicitly.
+        UserConfigVersionRepository.bump(session_db, [user_id])
+        return updated
 
     @staticmethod
     def delete(session_db: Session, install: UserSkillInstall) -> None:
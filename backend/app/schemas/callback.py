@@ -68,6 +68,29 @@ class AgentCurrentState(BaseModel):
     current_step: str | None = None
 
 
+class FileChangeKey(BaseModel):
+    """Identifies a file change (a path can be both modified and staged)."""
+
+    path: str
+    status: str
+
+
+class AgentStateDelta(BaseModel):
+    """Agent state changes since the callback whose state_seq is `base_seq`.
+
+    `fields` replaces top-level state fields (for `workspace_state` everything but
+    `file_changes`; None clears it). MCP entries are keyed by server name and file
+    changes by (path, status).
+    """
+
+    base_seq: int
+    fields: dict[str, Any] = Field(default_factory=dict)
+    mcp_upserts: list[McpStatus] = Field(default_factory=list)
+    mcp_removed: list[str] = Field(default_factory=list)
+    file_upserts: list[FileChange] = Field(default_factory=list)
+    file_removed: list[FileChangeKey] = Field(default_factory=list)
+
+
 class AgentCallbackRequest(BaseModel):
     """Agent execution callback request."""
 
@@ -78,7 +101,13 @@ class AgentCallbackRequest(BaseModel):
     error_message: str | None = None
     new_message: Any | None = None
     state_patch: AgentCurrentState | None = None
+    state_delta: AgentStateDelta | None = None
+    state_seq: int | None = None
     sdk_session_id: str | None = None
+    # Idempotency key: redelivered callbacks with a known id are ignored.
+    callback_id: str | None = None
+    # Run that produced the callback; without it the session's active run is assumed.
+    run_id: str | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
     workspace_archive_key: str | None = None
@@ -92,3 +121,29 @@ class CallbackResponse(BaseModel):
     status: str
     callback_status: CallbackStatus | None = None
     message: str | None = None
+    # False for batch items that were not applied and should be sent again.
+    applied: bool = True
+    # The callback's state was not applied (stale or missing delta base); the
+    # executor should send a full state_patch above `state_seq` next.
+    resync_required: bool = False
+    # Version of the stored session state after this callback.
+    state_seq: int | None = None
+    # The callback belongs to an earlier run that a later run of the session has
+    # superseded: it only updated its own run, not the session.
+    superseded: bool = False
+
+
+class AgentCallbackBatchRequest(BaseModel):
+    """Several callbacks of one run, applied in order."""
+
+    callbacks: list[AgentCallbackRequest] = Field(min_length=1, max_length=500)
+
+
+class CallbackBatchResponse(BaseModel):
+    """Batch callback response.
+
+    One result per callback, in order. Application stops at the first failing
+    callback: it and every later one come back with `applied=False`.
+    """
+
+    results: list[CallbackResponse]
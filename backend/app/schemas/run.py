@@ -52,6 +52,12 @@ class RunClaimRequest(BaseModel):
     schedule_modes: list[str] | None = None
 
 
+class RunBatchClaimRequest(RunClaimRequest):
+    """Claim up to `limit` runs in one transaction."""
+
+    limit: int = Field(default=1, ge=1, le=50)
+
+
 class RunClaimResponse(BaseModel):
     """Claim next run response for worker dispatch."""
 
@@ -60,6 +66,27 @@ class RunClaimResponse(BaseModel):
     prompt: str
     config_snapshot: dict | None = None
     sdk_session_id: str | None = None
+    # Last stored state version; the run's callbacks continue from it.
+    state_seq: int | None = None
+
+
+class RunBatchClaimResponse(BaseModel):
+    """Batch claim response; empty when no runs are claimable."""
+
+    runs: list[RunClaimResponse] = Field(default_factory=list)
+
+
+class RunWaitRequest(BaseModel):
+    """Long-poll until a run may be claimable."""
+
+    schedule_modes: list[str] | None = None
+    timeout_seconds: float = Field(default=25, ge=0, le=60)
+
+
+class RunWaitResponse(BaseModel):
+    """`ready` is False when the wait timed out with nothing claimable."""
+
+    ready: bool
 
 
 class RunStartRequest(BaseModel):
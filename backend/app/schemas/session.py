@@ -49,6 +49,7 @@ class SessionUpdateRequest(BaseModel):
     workspace_archive_url: str | None = None
     project_id: UUID | None = None
     state_patch: dict[str, Any] | None = None
+    state_seq: int | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
     workspace_archive_key: str | None = None
@@ -100,3 +101,15 @@ class SessionCancelResponse(BaseModel):
     canceled_runs: int = 0
     expired_user_input_requests: int = 0
     executor_cancelled: bool = False
+
+
+class SessionLivenessRequest(BaseModel):
+    """Session ids to check (internal)."""
+
+    session_ids: list[str] = Field(default_factory=list, max_length=1000)
+
+
+class SessionLivenessResponse(BaseModel):
+    """Ids of the requested sessions that are deleted or unknown."""
+
+    deleted: list[str] = Field(default_factory=list)
@@ -6,12 +6,16 @@ from typing import Any
 from sqlalchemy.orm import Session
 
 from app.models.agent_run import AgentRun
+from app.repositories.callback_receipt_repository import CallbackReceiptRepository
 from app.repositories.scheduled_task_repository import ScheduledTaskRepository
 from app.repositories.message_repository import MessageRepository
+from app.repositories.run_repository import RunRepository
 from app.repositories.tool_execution_repository import ToolExecutionRepository
 from app.repositories.usage_log_repository import UsageLogRepository
 from app.schemas.callback import (
     AgentCallbackRequest,
+    AgentCurrentState,
+    AgentStateDelta,
     CallbackResponse,
     CallbackStatus,
 )
@@ -49,6 +53,129 @@ class CallbackService:
         elif db_run.status == "completed":
             db_task.last_error = None
 
+    @staticmethod
+    def _apply_state_delta(
+        state: dict[str, Any], delta: AgentStateDelta
+    ) -> dict[str, Any]:
+        """Return `state` (a stored state_patch) with `delta` applied."""
+        merged = dict(state)
+
+        for key, value in delta.fields.items():
+            if key == "workspace_state" and value is not None:
+                previous = merged.get(key) or {}
+                value = {**value, "file_changes": previous.get("file_changes") or []}
+            merged[key] = value
+
+        if delta.mcp_upserts or delta.mcp_removed:
+            removed = set(delta.mcp_removed)
+            entries = {
+                m.get("server_name"): m
+                for m in merged.get("mcp_status") or []
+                if m.get("server_name") not in removed
+            }
+            for entry in delta.mcp_upserts:
+                entries[entry.server_name] = entry.model_dump(mode="json")
+            merged["mcp_status"] = list(entries.values())
+
+        workspace_state = merged.get("workspace_state")
+        if workspace_state is not None:
+            removed_files = {(k.path, k.status) for k in delta.file_removed}
+            changes = {
+                (c.get("path"), c.get("status")): c
+                for c in workspace_state.get("file_changes") or []
+                if (c.get("path"), c.get("status")) not in removed_files
+            }
+            for change in delta.file_upserts:
+                changes[(change.path, change.status)] = change.model_dump(mode="json")
+            file_changes = list(changes.values())
+            merged["workspace_state"] = {
+                **workspace_state,
+                "file_changes": file_changes,
+                "total_added_lines": sum(
+                    c.get("added_lines") or 0 for c in file_changes
+                ),
+                "total_deleted_lines": sum(
+                    c.get("deleted_lines") or 0 for c in file_changes
+                ),
+            }
+
+        return AgentCurrentState.model_validate(merged).model_dump(mode="json")
+
+    @classmethod
+    def _resolve_state_update(
+        cls,
+        stored_state: dict[str, Any] | None,
+        stored_seq: int | None,
+        callback: AgentCallbackRequest,
+    ) -> tuple[dict[str, Any], bool]:
+        """Session fields to update from the callback's state.
+
+        Also returns whether the state was not applied and the executor has to send
+        a full snapshot (resync).
+        """
+        if callback.state_patch is not None:
+            # Replayed callbacks can be older than the stored state: keep the newer one.
+            if (
+                callback.state_seq is None
+                or stored_seq is None
+                or callback.state_seq >= stored_seq
+            ):
+                return {
+                    "state_patch": callback.state_patch.model_dump(mode="json"),
+                    "state_seq": callback.state_seq,
+                }, False
+            return {}, True
+        if callback.state_delta is not None:
+            # A delta only applies on top of the snapshot it was diffed against; a
+            # state cleared for a new run has no base.
+            if (
+                stored_state
+                and stored_seq is not None
+                and callback.state_delta.base_seq == stored_seq
+            ):
+                return {
+                    "state_patch": cls._apply_state_delta(
+                        stored_state, callback.state_delta
+                    ),
+                    "state_seq": callback.state_seq,
+                }, False
+            return {}, True
+        return {}, False
+
+    @staticmethod
+    def _resolve_run(
+        db: Session, session_id: uuid.UUID, run_id: str | None
+    ) -> tuple[AgentRun | None, bool]:
+        """The run a callback belongs to, and whether a later run has superseded it.
+
+        Callbacks without a run id (or of the active run) belong to the session's
+        active run. Others are late callbacks of an earlier run, e.g. replayed from
+        the executor's outbox after the run was given up on; they are superseded
+        once another run of the session is active or was created after theirs.
+        """
+        active_run = (
+            db.query(AgentRun)
+            .filter(AgentRun.session_id == session_id)
+            .filter(AgentRun.status.in_(["claimed", "running"]))
+            .order_by(AgentRun.created_at.desc())
+            .first()
+        )
+        if not run_id or (active_run is not None and str(active_run.id) == run_id):
+            return active_run, False
+        try:
+            db_run = RunRepository.get_by_id(db, uuid.UUID(run_id))
+        except ValueError:
+            db_run = None
+        if db_run is None or db_run.session_id != session_id:
+            return active_run, False
+        newer_run = (
+            db.query(AgentRun.id)
+            .filter(AgentRun.session_id == session_id)
+            .filter(AgentRun.created_at > db_run.created_at)
+            .first()
+        )
+        return db_run, active_run is not None or newer_run is not None
+
     def _extract_sdk_session_id_from_message(
         self, message: dict[str, Any]
     ) -> str | None:
@@ -296,6 +423,28 @@ class CallbackService:
                 callback_status=callback.status,
             )
 
+        db_run, superseded = self._resolve_run(db, db_session.id, callback.run_id)
+
+        # Executors redeliver callbacks whose acknowledgement they did not receive.
+        if callback.callback_id and CallbackReceiptRepository.exists(
+            db, callback.callback_id
+        ):
+            logger.info(
+                "callback_duplicate_ignored",
+                extra={
+                    "session_id": str(db_session.id),
+                    "callback_id": callback.callback_id,
+                },
+            )
+            return CallbackResponse(
+                session_id=str(db_session.id),
+                status=db_session.status,
+                callback_status=callback.status,
+                message="Duplicate callback",
+                state_seq=db_session.state_seq,
+                superseded=superseded,
+            )
+
         derived_sdk_session_id = callback.sdk_session_id
         if (
             not derived_sdk_session_id
@@ -314,15 +463,37 @@ class CallbackService:
         ):
             update_data["sdk_session_id"] = derived_sdk_session_id
 
-        # Do not override a user-canceled session back to completed/failed.
-        if db_session.status != "canceled" and callback.status in [
-            CallbackStatus.COMPLETED,
-            CallbackStatus.FAILED,
-        ]:
+        # Do not override a user-canceled session back to completed/failed, nor
+        # let an earlier run finish the session while a newer run is active.
+        if (
+            not superseded
+            and db_session.status != "canceled"
+            and callback.status
+            in [
+                CallbackStatus.COMPLETED,
+                CallbackStatus.FAILED,
+            ]
+        ):
             update_data["status"] = callback.status.value
 
-        if callback.state_patch is not None:
-            update_data["state_patch"] = callback.state_patch.model_dump(mode="json")
+        state_update, resync_required = (
+            ({}, False)
+            if superseded
+            else self._resolve_state_update(
+                db_session.state_patch, db_session.state_seq, callback
+            )
+        )
+        update_data.update(state_update)
+        if resync_required and callback.state_delta is not None:
+            logger.warning(
+                "callback_state_delta_skipped",
+                extra={
+                    "session_id": str(db_session.id),
+                    "state_seq": callback.state_seq,
+                    "base_seq": callback.state_delta.base_seq,
+                    "stored_seq": db_session.state_seq,
+                },
+            )
 
         if callback.workspace_files_prefix is not None:
             update_data["workspace_files_prefix"] = callback.workspace_files_prefix
@@ -355,18 +526,24 @@ class CallbackService:
                     },
                 )
 
+        if callback.callback_id:
+            # Committed together with the message the callback delivers.
+            CallbackReceiptRepository.create(db, callback.callback_id, db_session.id)
+
         if callback.new_message:
             self._persist_message_and_tools(db, db_session.id, callback.new_message)
             # Extract and persist usage data if this is a ResultMessage
             self._extract_and_persist_usage(db, db_session.id, callback.new_message)
 
-        db_run = (
-            db.query(AgentRun)
-            .filter(AgentRun.session_id == db_session.id)
-            .filter(AgentRun.status.in_(["claimed", "running"]))
-            .order_by(AgentRun.created_at.desc())
-            .first()
-        )
+        terminal = callback.status in [CallbackStatus.COMPLETED, CallbackStatus.FAILED]
+        # A finished run only takes its own (replayed) outcome; a canceled one stays
+        # canceled.
+        if (
+            db_run
+            and db_run.status not in ["claimed", "running"]
+            and (not terminal or db_run.status in ["canceled", callback.status.value])
+        ):
+            db_run = None
 
         if db_run:
             db_run.progress = int(callback.progress or 0)
@@ -376,9 +553,9 @@ class CallbackService:
                 if db_run.started_at is None:
                     db_run.started_at = datetime.now(timezone.utc)
 
-            if callback.status in [CallbackStatus.COMPLETED, CallbackStatus.FAILED]:
+            if terminal:
                 db_run.status = callback.status.value
-                db_run.finished_at = datetime.now(timezone.utc)
+                db_run.finished_at = db_run.finished_at or datetime.now(timezone.utc)
                 if callback.status == CallbackStatus.COMPLETED:
                     db_run.progress = 100
                     db_run.last_error = None
@@ -387,10 +564,14 @@ class CallbackService:
                         db_run.last_error = callback.error_message
 
             self._sync_scheduled_task_last_status(db, db_run)
-            db.commit()
+
+        db.commit()
 
         return CallbackResponse(
             session_id=str(db_session.id),
             status=db_session.status,
             callback_status=callback.status,
+            resync_required=resync_required,
+            state_seq=db_session.state_seq,
+            superseded=superseded,
         )
@@ -0,0 +1,80 @@
+import logging
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.claude_md import UserClaudeMdSetting
+from app.models.env_var import UserEnvVar
+from app.models.mcp_server import McpServer
+from app.models.plugin import Plugin
+from app.models.skill import Skill
+from app.models.slash_command import SlashCommand
+from app.models.sub_agent import SubAgent
+from app.models.user_mcp_install import UserMcpInstall
+from app.models.user_plugin_install import UserPluginInstall
+from app.models.user_skill_install import UserSkillInstall
+from app.repositories.user_config_version_repository import (
+    UserConfigVersionRepository,
+)
+from app.services.env_var_service import SYSTEM_USER_ID
+
+logger = logging.getLogger(__name__)
+
+_SCOPED_MODELS = (McpServer, Skill, Plugin)
+_USER_MODELS = (
+    UserClaudeMdSetting,
+    UserEnvVar,
+    SlashCommand,
+    SubAgent,
+    UserMcpInstall,
+    UserPluginInstall,
+    UserSkillInstall,
+)
+
+
+def _config_owner(obj: object) -> str | None:
+    """Return the user whose resolved execution config depends on obj."""
+    if isinstance(obj, _SCOPED_MODELS):
+        # System resources can be installed by anyone; bump the shared stamp.
+        return obj.owner_user_id if obj.scope == "user" else SYSTEM_USER_ID
+    if isinstance(obj, _USER_MODELS):
+        return obj.user_id
+    return None
+
+
+def _bump_config_versions(session: Session, flush_context: object) -> None:
+    owners: set[str] = set()
+    for obj in chain(session.new, session.deleted):
+        owner = _config_owner(obj)
+        if owner:
+            owners.add(owner)
+    for obj in session.dirty:
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        owner = _config_owner(obj)
+        if owner:
+            owners.add(owner)
+    if owners:
+        UserConfigVersionRepository.bump(session, owners)
+
+
+def register_config_version_listener() -> None:
+    """Bump user config versions on every flush touching execution config models.
+
+    Bulk `query.update()` calls bypass flush events and must call
+    `UserConfigVersionRepository.bump` themselves.
+    """
+    if not event.contains(Session, "after_flush", _bump_config_versions):
+        event.listen(Session, "after_flush", _bump_config_versions)
+
+
+class ConfigVersionService:
+    """Service for the config version stamp used by executor manager caches."""
+
+    def get_version(self, db: Session, user_id: str) -> str:
+        """Return an opaque stamp that changes whenever the user's config changes."""
+        versions = UserConfigVersionRepository.get_versions(
+            db, [user_id, SYSTEM_USER_ID]
+        )
+        return f"{versions.get(user_id, 0)}.{versions.get(SYSTEM_USER_ID, 0)}"
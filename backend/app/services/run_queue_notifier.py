@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import threading
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.models.agent_run import AgentRun
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "poco_run_queue"
+_PENDING_KEY = "run_queue_changed"
+
+
+class RunQueueNotifier:
+    """Wakes long-polling claimers when a run may have become claimable.
+
+    Every notification bumps a generation counter and resolves the futures of pending
+    waiters. Local notifications come from commits in this process; with Postgres a
+    LISTEN connection relays NOTIFYs sent by any backend process, so a run queued on
+    one replica wakes waiters on all of them.
+    """
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = (
+            set()
+        )
+        self._listen_task: asyncio.Task[None] | None = None
+
+    def notify(self) -> None:
+        """Wake all waiters. Safe to call from any thread."""
+        with self._lock:
+            self.generation += 1
+            waiters = list(self._waiters)
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # Loop already closed.
+                pass
+
+    async def wait(self, generation: int, timeout: float) -> bool:
+        """Wait until the generation moves past `generation`; False on timeout."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if self.generation != generation:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(future, timeout=max(0.0, timeout))
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def start_listener(self) -> None:
+        """Relay Postgres NOTIFYs on CHANNEL to local waiters (no-op elsewhere)."""
+        if engine.dialect.name != "postgresql" or self._listen_task is not None:
+            return
+        self._listen_task = asyncio.create_task(self._listen_forever())
+
+    async def stop_listener(self) -> None:
+        task, self._listen_task = self._listen_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    @staticmethod
+    def _connect():
+        raw = engine.raw_connection()
+        # LISTEN state is per connection; keep this one out of the pool.
+        raw.detach()
+        conn = raw.dbapi_connection
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return raw
+
+    async def _listen_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        backoff = 1.0
+        while True:
+            raw = None
+            fileno = None
+            try:
+                raw = await asyncio.to_thread(self._connect)
+                conn = raw.dbapi_connection
+                readable = asyncio.Event()
+                fileno = conn.fileno()
+                loop.add_reader(fileno, readable.set)
+                logger.info("run_queue_listener_connected", extra={"channel": CHANNEL})
+                # Anything queued while we were disconnected was not relayed.
+                self.notify()
+                backoff = 1.0
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.notify()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "run_queue_listener_error",
+                    extra={
+                        "error": f"{type(exc).__name__}: {exc}",
+                        "retry_in": backoff,
+                    },
+                )
+            finally:
+                if fileno is not None:
+                    loop.remove_reader(fileno)
+                if raw is not None:
+                    try:
+                        raw.close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+run_queue_notifier = RunQueueNotifier()
+
+
+# Moving into these states never makes another run claimable.
+_ACTIVE_STATUSES = frozenset({"claimed", "running"})
+
+
+def _run_queue_touched(session: Session) -> bool:
+    for obj in session.new:
+        if isinstance(obj, AgentRun) and obj.status == "queued":
+            return True
+    for obj in session.dirty:
+        if not isinstance(obj, AgentRun):
+            continue
+        added = inspect(obj).attrs.status.history.added
+        if any(status not in _ACTIVE_STATUSES for status in added):
+            return True
+    return False
+
+
+def _mark_run_queue_changed(session: Session, flush_context: object) -> None:
+    if session.info.get(_PENDING_KEY) or not _run_queue_touched(session):
+        return
+    session.info[_PENDING_KEY] = True
+    if session.get_bind().dialect.name == "postgresql":
+        # Transactional: delivered to listeners only if this transaction commits.
+        session.connection().execute(
+            text("SELECT pg_notify(:channel, '')"), {"channel": CHANNEL}
+        )
+
+
+def _notify_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        run_queue_notifier.notify()
+
+
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_run_queue_listeners() -> None:
+    """Notify run queue waiters whenever a commit may make a run claimable.
+
+    That is a newly queued run, or a run leaving claimed/running: finishing a run
+    unblocks the next queued run of the same session. Bulk `update()` statements (e.g. expired-lease release) bypass these
+    events; the executor manager's interval poll covers them.
+    """
+    for name, fn in (
+        ("after_flush", _mark_run_queue_changed),
+        ("after_commit", _notify_after_commit),
+        ("after_rollback", _discard_after_rollback),
+    ):
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
@@ -1,15 +1,16 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
 from sqlalchemy.orm import Session
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
-from app.repositories.scheduled_task_repository import ScheduledTaskRepository
 from app.repositories.message_repository import MessageRepository
 from app.repositories.run_repository import RunRepository
+from app.repositories.scheduled_task_repository import ScheduledTaskRepository
 from app.repositories.session_repository import SessionRepository
 from app.schemas.run import (
+    RunBatchClaimRequest,
     RunClaimRequest,
     RunClaimResponse,
     RunFailRequest,
@@ -90,9 +91,50 @@ class RunService:
             item.usage = usage_by_run_id.get(item.run_id)
         return responses
 
+    @staticmethod
+    def _normalize_schedule_modes(schedule_modes: list[str] | None) -> list[str] | None:
+        if not schedule_modes:
+            return None
+        return [m.strip() for m in schedule_modes if isinstance(m, str) and m.strip()]
+
+    def seconds_until_claimable(
+        self, db: Session, schedule_modes: list[str] | None = None
+    ) -> float | None:
+        """Seconds until the next queued run becomes claimable (0 if one is now).
+
+        Returns None when nothing is queued. Ends the read transaction so long-polling
+        callers don't hold a pooled connection while they wait.
+        """
+        try:
+            next_at = RunRepository.next_claimable_at(
+                db, self._normalize_schedule_modes(schedule_modes)
+            )
+        finally:
+            db.rollback()
+        if next_at is None:
+            return None
+        if next_at.tzinfo is None:
+            next_at = next_at.replace(tzinfo=UTC)
+        return max(0.0, (next_at - datetime.now(UTC)).total_seconds())
+
     def claim_next_run(
         self, db: Session, request: RunClaimRequest
     ) -> RunClaimResponse | None:
+        claims = self.claim_runs(
+            db,
+            RunBatchClaimRequest(
+                worker_id=request.worker_id,
+                lease_seconds=request.lease_seconds,
+                schedule_modes=request.schedule_modes,
+                limit=1,
+            ),
+        )
+        return claims[0] if claims else None
+
+    def claim_runs(
+        self, db: Session, request: RunBatchClaimRequest
+    ) -> list[RunClaimResponse]:
+        """Claim up to request.limit runs (at most one per session) in one transaction."""
         worker_id = request.worker_id.strip()
         if not worker_id:
             raise AppException(
@@ -100,62 +142,65 @@ class RunService:
                 message="worker_id cannot be empty",
             )
 
-        schedule_modes = (
-            [
-                m.strip()
-                for m in request.schedule_modes
-                if isinstance(m, str) and m.strip()
-            ]
-            if request.schedule_modes
-            else None
-        )
+        schedule_modes = self._normalize_schedule_modes(request.schedule_modes)
 
-        db_run = RunRepository.claim_next(
+        db_runs = RunRepository.claim_batch(
             session_db=db,
             worker_id=worker_id,
             lease_seconds=request.lease_seconds,
+            limit=request.limit,
             schedule_modes=schedule_modes,
         )
 
-        if not db_run:
+        if not db_runs:
             db.commit()
-            return None
-
-        db_session = SessionRepository.get_by_id(db, db_run.session_id)
-        if not db_session:
-            raise AppException(
-                error_code=ErrorCode.NOT_FOUND,
-                message=f"Session not found: {db_run.session_id}",
-            )
+            return []
 
-        db_message = MessageRepository.get_by_id(db, db_run.user_message_id)
-        if not db_message:
-            raise AppException(
-                error_code=ErrorCode.NOT_FOUND,
-                message=f"Message not found: {db_run.user_message_id}",
-            )
+        prepared = []
+        for db_run in db_runs:
+            db_session = SessionRepository.get_by_id(db, db_run.session_id)
+            if not db_session:
+                raise AppException(
+                    error_code=ErrorCode.NOT_FOUND,
+                    message=f"Session not found: {db_run.session_id}",
+                )
 
-        prompt = (
-            self._extract_prompt_from_message(db_message.content)
-            or db_message.text_preview
-        )
+            db_message = MessageRepository.get_by_id(db, db_run.user_message_id)
+            if not db_message:
+                raise AppException(
+                    error_code=ErrorCode.NOT_FOUND,
+                    message=f"Message not found: {db_run.user_message_id}",
+                )
 
-        if not prompt:
-            raise AppException(
-                error_code=ErrorCode.BAD_REQUEST,
-                message="Unable to extract prompt from message",
+            prompt = (
+                self._extract_prompt_from_message(db_message.content)
+                or db_message.text_preview
             )
 
+            if not prompt:
+                raise AppException(
+                    error_code=ErrorCode.BAD_REQUEST,
+                    message="Unable to extract prompt from message",
+                )
+            prepared.append((db_run, db_session, prompt))
+
         db.commit()
-        db.refresh(db_run)
 
-        return RunClaimResponse(
-            run=RunResponse.model_validate(db_run),
-            user_id=db_session.user_id,
-            prompt=prompt,
-            config_snapshot=db_run.config_snapshot or db_session.config_snapshot,
-            sdk_session_id=db_session.sdk_session_id,
-        )
+        claims: list[RunClaimResponse] = []
+        for db_run, db_session, prompt in prepared:
+            db.refresh(db_run)
+            claims.append(
+                RunClaimResponse(
+                    run=RunResponse.model_validate(db_run),
+                    user_id=db_session.user_id,
+                    prompt=prompt,
+                    config_snapshot=db_run.config_snapshot
+                    or db_session.config_snapshot,
+                    sdk_session_id=db_session.sdk_session_id,
+                    state_seq=db_session.state_seq,
+                )
+            )
+        return claims
 
     def start_run(
         self, db: Session, run_id: uuid.UUID, request: RunStartRequest
@@ -197,7 +242,7 @@ class RunService:
                 message="Run is claimed by another worker",
             )
 
-        now = datetime.now(timezone.utc)
+        now = datetime.now(UTC)
         db_run.status = "running"
         db_run.started_at = now
         db_run.lease_expires_at = None
@@ -243,7 +288,7 @@ class RunService:
                 message="Run is claimed by another worker",
             )
 
-        now = datetime.now(timezone.utc)
+        now = datetime.now(UTC)
         db_run.status = "failed"
         db_run.last_error = request.error_message
         db_run.finished_at = now
@@ -428,6 +428,7 @@ class ScheduledTaskService:
                 return None
 
         # Clear previous execution state so the UI doesn't show stale file changes.
+        # state_seq is kept so versions keep growing across runs.
         db_session.state_patch = {}
         db_session.status = "pending"
 
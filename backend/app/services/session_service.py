@@ -106,6 +106,8 @@ class SessionService:
             db_session.workspace_archive_url = request.workspace_archive_url
         if request.state_patch is not None:
             db_session.state_patch = request.state_patch
+        if "state_seq" in request.model_fields_set:
+            db_session.state_seq = request.state_seq
         if request.workspace_files_prefix is not None:
             db_session.workspace_files_prefix = request.workspace_files_prefix
         if request.workspace_manifest_key is not None:
@@ -178,3 +178,48 @@ class S3StorageService:
                 message="Failed to download file",
                 details={"key": key, "error": str(exc)},
             ) from exc
+
+    def download_fileobj(self, *, key: str, fileobj) -> None:
+        try:
+            self.client.download_fileobj(self.bucket, key, fileobj)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to download object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to download file",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def list_keys(self, prefix: str) -> list[str]:
+        keys: list[str] = []
+        try:
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                keys.extend(
+                    item["Key"] for item in page.get("Contents", []) if item.get("Key")
+                )
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to list objects under {prefix}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to list objects",
+                details={"prefix": prefix, "error": str(exc)},
+            ) from exc
+        return keys
+
+    def delete_objects(self, keys: list[str]) -> None:
+        """Delete keys in batches of 1000 (the S3 DeleteObjects limit)."""
+        for start in range(0, len(keys), 1000):
+            batch = keys[start : start + 1000]
+            try:
+                self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True},
+                )
+            except (ClientError, BotoCoreError) as exc:
+                logger.error(f"Failed to delete {len(batch)} objects: {exc}")
+                raise AppException(
+                    error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                    message="Failed to delete objects",
+                    details={"error": str(exc)},
+                ) from exc
@@ -206,7 +206,8 @@ class TaskService:
                     message="Session does not belong to the user",
                 )
             # Clear previous execution state so the UI doesn't show stale file changes
-            # while a new run is queued/starting.
+            # while a new run is queued/starting. state_seq is kept: it only grows, and
+            # an emptied state cannot serve as a delta base (see CallbackService).
             db_session.state_patch = {}
             if project_id is not None and db_session.project_id != project_id:
                 raise AppException(
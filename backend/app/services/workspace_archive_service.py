@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import tempfile
+import time
+import zipfile
+from pathlib import PurePosixPath
+
+from app.services.storage_service import S3StorageService
+from app.utils.workspace_manifest import (
+    extract_manifest_files,
+    normalize_manifest_path,
+    resolve_manifest_object_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# Archives up to this size are built in memory before spilling to a temp file.
+_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+# Deflating these again costs CPU for (almost) no size reduction.
+_COMPRESSED_SUFFIXES = frozenset(
+    {
+        ".7z",
+        ".avif",
+        ".br",
+        ".bz2",
+        ".docx",
+        ".gif",
+        ".gz",
+        ".heic",
+        ".jar",
+        ".jpeg",
+        ".jpg",
+        ".m4a",
+        ".mkv",
+        ".mov",
+        ".mp3",
+        ".mp4",
+        ".ogg",
+        ".pdf",
+        ".png",
+        ".pptx",
+        ".rar",
+        ".tgz",
+        ".webm",
+        ".webp",
+        ".whl",
+        ".xlsx",
+        ".xz",
+        ".zip",
+        ".zst",
+    }
+)
+
+
+class WorkspaceArchiveService:
+    """Builds workspace zip archives on demand from exported manifests.
+
+    Exports only upload changed files, so the archive is not rebuilt on every run.
+    It is assembled from the manifest's objects the first time it is requested and
+    cached next to the manifest under the manifest's content hash; archives of
+    older manifests are deleted when a new one is built.
+    """
+
+    def __init__(self, storage_service: S3StorageService) -> None:
+        self.storage_service = storage_service
+
+    def get_or_build(self, manifest_key: str, files_prefix: str | None) -> str:
+        """Return the key of the archive for the manifest's current content."""
+        manifest = self.storage_service.get_manifest(manifest_key)
+        digest = hashlib.sha256(
+            json.dumps(manifest, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        archives_prefix = f"{PurePosixPath(manifest_key).parent}/archives/"
+        archive_key = f"{archives_prefix}{digest[:32]}.zip"
+        if self.storage_service.exists(archive_key):
+            return archive_key
+
+        started = time.perf_counter()
+        files = 0
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as buffer:
+            with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+                for item in extract_manifest_files(manifest):
+                    file_path = normalize_manifest_path(item.get("path"))
+                    object_key = resolve_manifest_object_key(
+                        manifest, item, files_prefix
+                    )
+                    if not file_path or not object_key:
+                        continue
+                    arcname = f"workspace{file_path}"
+                    compress_type = (
+                        zipfile.ZIP_STORED
+                        if PurePosixPath(file_path).suffix.lower()
+                        in _COMPRESSED_SUFFIXES
+                        else zipfile.ZIP_DEFLATED
+                    )
+                    info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+                    info.compress_type = compress_type
+                    with zipf.open(info, "w", force_zip64=True) as entry:
+                        self.storage_service.download_fileobj(
+                            key=object_key, fileobj=entry
+                        )
+                    files += 1
+            size = buffer.tell()
+            buffer.seek(0)
+            self.storage_service.upload_fileobj(
+                fileobj=buffer, key=archive_key, content_type="application/zip"
+            )
+
+        stale = [
+            key
+            for key in self.storage_service.list_keys(archives_prefix)
+            if key != archive_key
+        ]
+        if stale:
+            self.storage_service.delete_objects(stale)
+        logger.info(
+            "timing",
+            extra={
+                "step": "workspace_archive_build",
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+                "manifest_key": manifest_key,
+                "files": files,
+                "bytes": size,
+                "pruned": len(stale),
+            },
+        )
+        return archive_key
@@ -46,6 +46,36 @@ def extract_manifest_files(manifest: Any) -> list[dict[str, Any]]:
     return []
 
 
+def resolve_manifest_object_key(
+    manifest: Any, item: dict[str, Any], files_prefix: str | None = None
+) -> str | None:
+    """Resolve the object key holding a manifest file's content.
+
+    Explicit keys win. Content-addressed manifests (with a top-level `blob_prefix`)
+    map a file's sha256 to `{blob_prefix}/{sha[:2]}/{sha}`; older manifests fall back
+    to `{files_prefix}/{path}`.
+    """
+    object_key = (
+        item.get("key")
+        or item.get("object_key")
+        or item.get("oss_key")
+        or item.get("s3_key")
+    )
+    if object_key:
+        return object_key
+
+    blob_prefix = manifest.get("blob_prefix") if isinstance(manifest, dict) else None
+    digest = item.get("sha256")
+    if isinstance(blob_prefix, str) and isinstance(digest, str) and len(digest) > 2:
+        return f"{blob_prefix.rstrip('/')}/{digest[:2]}/{digest}"
+
+    file_path = normalize_manifest_path(item.get("path"))
+    prefix = (files_prefix or "").rstrip("/")
+    if file_path and prefix:
+        return f"{prefix}/{file_path.lstrip('/')}"
+    return None
+
+
 def build_nodes_from_manifest(manifest: Any) -> list[dict[str, Any]]:
     if isinstance(manifest, dict):
         nodes = manifest.get("nodes")
@@ -0,0 +1,141 @@
+from datetime import UTC, datetime
+
+from app.schemas.callback import (
+    AgentCallbackRequest,
+    AgentCurrentState,
+    AgentStateDelta,
+    CallbackStatus,
+)
+from app.services.callback_service import CallbackService
+
+LAST_CHANGE = "2026-01-01T00:00:00Z"
+
+
+def _state(**overrides) -> dict:
+    state = AgentCurrentState.model_validate(
+        {
+            "todos": [{"content": "write tests", "status": "in_progress"}],
+            "mcp_status": [
+                {"server_name": "github", "status": "connected"},
+                {"server_name": "slack", "status": "connected"},
+            ],
+            "workspace_state": {
+                "branch": "main",
+                "last_change": LAST_CHANGE,
+                "file_changes": [
+                    {"path": "a.py", "status": "modified", "added_lines": 3},
+                    {"path": "b.py", "status": "added", "added_lines": 5},
+                ],
+            },
+        }
+    ).model_dump(mode="json")
+    state.update(overrides)
+    return state
+
+
+def _callback(**fields) -> AgentCallbackRequest:
+    return AgentCallbackRequest(
+        session_id="s1",
+        time=datetime.now(UTC),
+        status=CallbackStatus.RUNNING,
+        progress=0,
+        **fields,
+    )
+
+
+def test_apply_state_delta_replaces_fields_and_merges_keyed_entries():
+    delta = AgentStateDelta.model_validate(
+        {
+            "base_seq": 4,
+            "fields": {"current_step": "testing"},
+            "mcp_upserts": [{"server_name": "github", "status": "failed"}],
+            "mcp_removed": ["slack"],
+            "file_upserts": [
+                {"path": "c.py", "status": "added", "added_lines": 2},
+                {"path": "a.py", "status": "modified", "added_lines": 4},
+            ],
+            "file_removed": [{"path": "b.py", "status": "added"}],
+        }
+    )
+
+    merged = CallbackService._apply_state_delta(_state(), delta)
+
+    assert merged["current_step"] == "testing"
+    assert merged["todos"] == _state()["todos"]
+    assert [(m["server_name"], m["status"]) for m in merged["mcp_status"]] == [
+        ("github", "failed")
+    ]
+    workspace = merged["workspace_state"]
+    assert [(c["path"], c["added_lines"]) for c in workspace["file_changes"]] == [
+        ("a.py", 4),
+        ("c.py", 2),
+    ]
+    assert workspace["total_added_lines"] == 6
+
+
+def test_apply_state_delta_keeps_file_changes_when_workspace_fields_change():
+    delta = AgentStateDelta(
+        base_seq=4,
+        fields={"workspace_state": {"branch": "feature", "last_change": LAST_CHANGE}},
+    )
+
+    workspace = CallbackService._apply_state_delta(_state(), delta)["workspace_state"]
+
+    assert workspace["branch"] == "feature"
+    assert [c["path"] for c in workspace["file_changes"]] == ["a.py", "b.py"]
+
+
+def test_apply_state_delta_clears_workspace_state():
+    delta = AgentStateDelta(base_seq=4, fields={"workspace_state": None})
+
+    merged = CallbackService._apply_state_delta(_state(), delta)
+
+    assert merged["workspace_state"] is None
+
+
+def test_delta_on_the_stored_version_is_applied():
+    callback = _callback(
+        state_seq=5,
+        state_delta=AgentStateDelta(base_seq=4, fields={"current_step": "next"}),
+    )
+
+    update, resync = CallbackService._resolve_state_update(_state(), 4, callback)
+
+    assert resync is False
+    assert update["state_seq"] == 5
+    assert update["state_patch"]["current_step"] == "next"
+
+
+def test_delta_with_a_mismatched_base_requests_a_resync():
+    callback = _callback(
+        state_seq=7,
+        state_delta=AgentStateDelta(base_seq=6, fields={"current_step": "next"}),
+    )
+
+    assert CallbackService._resolve_state_update(_state(), 4, callback) == ({}, True)
+
+
+def test_delta_on_a_cleared_state_requests_a_resync():
+    # Enqueuing a run clears the stored state but keeps its version.
+    callback = _callback(
+        state_seq=5,
+        state_delta=AgentStateDelta(base_seq=4, fields={"current_step": "next"}),
+    )
+
+    assert CallbackService._resolve_state_update({}, 4, callback) == ({}, True)
+
+
+def test_stale_snapshot_is_ignored_and_requests_a_resync():
+    callback = _callback(state_seq=3, state_patch=AgentCurrentState(current_step="old"))
+
+    assert CallbackService._resolve_state_update(_state(), 4, callback) == ({}, True)
+
+
+def test_newer_snapshot_replaces_the_stored_state():
+    callback = _callback(state_seq=5, state_patch=AgentCurrentState(current_step="new"))
+
+    update, resync = CallbackService._resolve_state_update({}, 4, callback)
+
+    assert resync is False
+    assert update["state_seq"] == 5
+    assert update["state_patch"]["current_step"] == "new"
@@ -3,16 +3,17 @@ import logging
 from fastapi import APIRouter, BackgroundTasks
 
 from app.core.callback import CallbackClient
+from app.core.callback_outbox import CallbackOutbox
 from app.core.computer import ComputerClient
-from app.core.user_input import UserInputClient
 from app.core.engine import AgentExecutor
+from app.core.observability.request_context import get_request_id, get_trace_id
+from app.core.user_input import UserInputClient
 from app.hooks.base import AgentHook
 from app.hooks.callback import CallbackHook
 from app.hooks.computer import BrowserScreenshotHook
 from app.hooks.run_snapshot import RunSnapshotHook
 from app.hooks.todo import TodoHook
 from app.hooks.workspace import WorkspaceHook
-from app.core.observability.request_context import get_request_id, get_trace_id
 from app.schemas.request import TaskRun
 
 router = APIRouter(prefix="/v1/tasks")
@@ -39,7 +40,14 @@ async def run_task(req: TaskRun, background_tasks: BackgroundTasks) -> dict:
     hooks: list[AgentHook] = [
         WorkspaceHook(),
         TodoHook(),
-        CallbackHook(client=callback_client),
+        CallbackHook(
+            client=callback_client,
+            outbox=CallbackOutbox.create(
+                req.session_id, req.callback_url, run_id=req.run_id
+            ),
+            run_id=req.run_id,
+            state_seq=req.state_seq,
+        ),
     ]
     if req.config.browser_enabled:
         hooks.append(BrowserScreenshotHook(client=computer_client))
@@ -1,30 +1,517 @@
+import asyncio
+import logging
+import os
+import random
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
 import httpx
 
-from app.schemas.callback import AgentCallbackRequest
+from app.core.callback_outbox import (
+    CallbackOutbox,
+    claim_outbox,
+    outbox_paths,
+    release_outbox,
+    session_outbox_paths,
+)
+from app.core.http_client import get_http_client
 from app.core.observability.request_context import (
     generate_request_id,
     generate_trace_id,
     get_request_id,
     get_trace_id,
 )
+from app.schemas.callback import AgentCallbackRequest
+from app.schemas.enums import CallbackStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw.strip())
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw.strip())
+    except ValueError:
+        return default
+
+
+# Client errors that can succeed when retried.
+_RETRYABLE_CLIENT_ERRORS = frozenset({408, 425, 429})
+
+
+def _is_rejected(response: httpx.Response) -> bool:
+    """The receiver refused the callback itself: resending it cannot succeed."""
+    return (
+        response.is_client_error
+        and response.status_code not in _RETRYABLE_CLIENT_ERRORS
+    )
 
 
 class CallbackClient:
-    def __init__(self, callback_url: str, timeout: float = 30.0):
+    def __init__(
+        self,
+        callback_url: str,
+        timeout: float = 30.0,
+        on_resync: Callable[[int | None], None] | None = None,
+    ):
         self.callback_url = callback_url
+        self.batch_url = f"{callback_url.rstrip('/')}/batch"
         self.timeout = timeout
+        # Called with the stored state version when the receiver did not apply a
+        # callback's state and needs a full snapshot.
+        self.on_resync = on_resync
+        self.http = get_http_client()
+
+    def _check_resync(self, results: list[Any]) -> None:
+        stored = [
+            result.get("state_seq")
+            for result in results
+            if isinstance(result, dict) and result.get("resync_required")
+        ]
+        if stored and self.on_resync is not None:
+            seqs = [seq for seq in stored if isinstance(seq, int)]
+            self.on_resync(max(seqs) if seqs else None)
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "X-Request-ID": get_request_id() or generate_request_id(),
+            "X-Trace-ID": get_trace_id() or generate_trace_id(),
+        }
 
     async def send(self, report: AgentCallbackRequest) -> bool:
+        """Deliver one callback; False when it should be retried.
+
+        A permanently rejected callback (4xx) is logged and dropped.
+        """
+        try:
+            response = await self.http.post(
+                self.callback_url,
+                timeout=self.timeout,
+                json=report.model_dump(mode="json"),
+                headers=self._headers(),
+            )
+        except httpx.RequestError:
+            return False
+        if _is_rejected(response):
+            logger.error(
+                "callback_rejected",
+                extra={
+                    "session_id": report.session_id,
+                    "callback_id": report.callback_id,
+                    "callback_status": str(report.status.value),
+                    "status_code": response.status_code,
+                    "body": response.text[:500],
+                },
+            )
+            return True
+        if not response.is_success:
+            return False
+        try:
+            self._check_resync([response.json()["data"]])
+        except (ValueError, KeyError, TypeError):
+            pass
+        return True
+
+    async def send_batch(self, reports: list[AgentCallbackRequest]) -> int:
+        """Deliver several callbacks, in order, in one request.
+
+        Returns how many of them (from the start) the receiver applied or
+        permanently rejected. A rejected batch is resent one by one so only the
+        offending callbacks are dropped.
+        """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.callback_url,
-                    json=report.model_dump(mode="json"),
-                    headers={
-                        "X-Request-ID": get_request_id() or generate_request_id(),
-                        "X-Trace-ID": get_trace_id() or generate_trace_id(),
+            response = await self.http.post(
+                self.batch_url,
+                timeout=self.timeout,
+                json={"callbacks": [r.model_dump(mode="json") for r in reports]},
+                headers=self._headers(),
+            )
+        except httpx.RequestError:
+            return 0
+        if _is_rejected(response):
+            applied = 0
+            for report in reports:
+                if not await self.send(report):
+                    break
+                applied += 1
+            return applied
+        if not response.is_success:
+            return 0
+        try:
+            results = response.json()["data"]["results"]
+        except (ValueError, KeyError, TypeError):
+            return len(reports)
+        applied = 0
+        for result in results[: len(reports)]:
+            if not isinstance(result, dict) or result.get("status") == "failed":
+                break
+            applied += 1
+        self._check_resync(results[:applied])
+        return applied
+
+
+def _is_progress_only(report: AgentCallbackRequest) -> bool:
+    return (
+        report.status == CallbackStatus.RUNNING
+        and report.new_message is None
+        and report.state_patch is None
+        and report.state_delta is None
+    )
+
+
+def coalesce_reports(
+    reports: list[AgentCallbackRequest],
+) -> list[AgentCallbackRequest]:
+    """Drop RUNNING progress-only reports superseded by a later report."""
+    return [
+        report
+        for i, report in enumerate(reports)
+        if i == len(reports) - 1 or not _is_progress_only(report)
+    ]
+
+
+class CallbackSender:
+    """Background, order-preserving transport for one run's callbacks.
+
+    Reports are queued (bounded; `submit` waits when full) and delivered by a single
+    worker over the pooled keep-alive client, so the agent loop never waits for a
+    callback round trip. Reports that pile up while a request is in flight go out
+    together through the batch endpoint, with superseded progress-only reports
+    dropped; a partially applied batch is resent from its first unapplied report.
+    `flush` waits until everything queued so far was delivered.
+
+    Every report gets a `callback_id` (the receiver's idempotency key) and, with an
+    outbox, is written to disk before it is sent. Reports the receiver rejects (4xx)
+    are dropped; other failed deliveries are retried with exponential backoff until
+    they succeed, ahead of anything newer, so the receiver never sees reports out of
+    order. After `max_attempts` the stall is logged as an error; once the queue
+    fills up, `submit` (and with it the agent) waits. Reports still undelivered when
+    the sender is closed stay in the outbox, which is then replayed in the
+    background (`replay_outboxes`) or adopted by the session's next run
+    (`adopt_outboxes`).
+    """
+
+    def __init__(
+        self,
+        client: CallbackClient,
+        *,
+        outbox: CallbackOutbox | None = None,
+        max_queue_size: int | None = None,
+        max_batch_size: int | None = None,
+        max_attempts: int | None = None,
+        on_failure: Callable[[], None] | None = None,
+    ) -> None:
+        self.client = client
+        self.outbox = outbox
+        self.max_batch_size = max(
+            1,
+            max_batch_size
+            if max_batch_size is not None
+            else _env_int("CALLBACK_BATCH_MAX_SIZE", 50),
+        )
+        self.queue: asyncio.Queue[AgentCallbackRequest] = asyncio.Queue(
+            maxsize=max(
+                1,
+                max_queue_size
+                if max_queue_size is not None
+                else _env_int("CALLBACK_QUEUE_MAX_SIZE", 1000),
+            )
+        )
+        self.max_attempts = max(
+            1,
+            max_attempts
+            if max_attempts is not None
+            else _env_int("CALLBACK_RETRY_MAX_ATTEMPTS", 6),
+        )
+        self.retry_base_seconds = max(
+            0.0, _env_float("CALLBACK_RETRY_BASE_SECONDS", 0.5)
+        )
+        self.retry_max_seconds = max(0.0, _env_float("CALLBACK_RETRY_MAX_SECONDS", 30))
+        self.flush_timeout_seconds = _env_float("CALLBACK_FLUSH_TIMEOUT_SECONDS", 120)
+        self.on_failure = on_failure
+        self._worker: asyncio.Task[None] | None = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, report: AgentCallbackRequest) -> None:
+        if not report.callback_id:
+            report.callback_id = uuid.uuid4().hex
+        if self.outbox is not None:
+            await self.outbox.put(report)
+        self._ensure_worker()
+        await self.queue.put(report)
+
+    async def flush(self) -> None:
+        if not self.queue.empty():
+            self._ensure_worker()
+        await self.queue.join()
+
+    async def close(self) -> None:
+        """Flush (bounded by the flush timeout) and stop the worker.
+
+        The outbox file is removed when everything was delivered and kept for replay
+        otherwise.
+        """
+        try:
+            await asyncio.wait_for(self.flush(), timeout=self.flush_timeout_seconds)
+        except TimeoutError:
+            logger.warning(
+                "callback_flush_timeout",
+                extra={
+                    "queued": self.queue.qsize(),
+                    "timeout_seconds": self.flush_timeout_seconds,
+                },
+            )
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        if self.outbox is not None:
+            if self.outbox.pending_count:
+                logger.warning(
+                    "callback_outbox_kept",
+                    extra={
+                        "path": str(self.outbox.path),
+                        "pending": self.outbox.pending_count,
                     },
                 )
-                return response.is_success
-        except httpx.RequestError:
+            else:
+                await self.outbox.discard()
+            release_outbox(self.outbox.path)
+
+    async def _run(self) -> None:
+        while True:
+            reports = [await self.queue.get()]
+            while len(reports) < self.max_batch_size:
+                try:
+                    reports.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._deliver(coalesce_reports(reports))
+                if self.outbox is not None:
+                    # Coalesced-away reports were superseded: ack them too.
+                    await self.outbox.ack([r.callback_id for r in reports])
+            except Exception:
+                logger.exception("callback_outbox_ack_failed")
+            finally:
+                for _ in reports:
+                    self.queue.task_done()
+
+    def _retry_delay(self, attempt: int) -> float:
+        delay = min(
+            self.retry_max_seconds,
+            self.retry_base_seconds * 2 ** min(attempt - 1, 30),
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _deliver(self, reports: list[AgentCallbackRequest]) -> None:
+        """Deliver `reports` in order, retrying until all were applied or rejected.
+
+        Nothing newer is taken from the queue meanwhile; the worker only stops when
+        it is cancelled (`close`), leaving the rest in the outbox.
+        """
+        attempt = 0
+        while reports:
+            attempt += 1
+            try:
+                if len(reports) == 1:
+                    applied = 1 if await self.client.send(reports[0]) else 0
+                else:
+                    applied = await self.client.send_batch(reports)
+                if applied and self.outbox is not None:
+                    await self.outbox.ack([r.callback_id for r in reports[:applied]])
+            except Exception:
+                logger.exception("callback_delivery_error")
+                applied = 0
+            reports = reports[applied:]
+            if not reports:
+                return
+            extra = {
+                "session_id": reports[0].session_id,
+                "count": len(reports),
+                "statuses": sorted({str(r.status.value) for r in reports}),
+                "attempt": attempt,
+                "max_attempts": self.max_attempts,
+            }
+            if attempt == self.max_attempts:
+                # Still retried: dropping them would let newer reports overtake.
+                logger.error("callback_delivery_stalled", extra=extra)
+            else:
+                logger.warning("callback_delivery_failed", extra=extra)
+            if self.on_failure is not None:
+                self.on_failure()
+            await asyncio.sleep(self._retry_delay(attempt))
+
+
+def _for_adoption(
+    report: AgentCallbackRequest, outbox_run_id: str | None, same_run: bool
+) -> AgentCallbackRequest | None:
+    """Adapt a report left by an earlier run (or attempt) to the run that is starting.
+
+    Reports of another run keep their status: they carry that run's id, so the
+    receiver records its outcome without finishing the run that is starting. They
+    lose their state and are dropped when they carry neither a message nor an
+    outcome. Terminal reports of an earlier attempt of the same run, or of an
+    unknown run, are downgraded to RUNNING: the attempt that is starting reports
+    the run's outcome.
+    """
+    update: dict[str, Any] = {}
+    run_id = report.run_id or outbox_run_id
+    if run_id != report.run_id:
+        update["run_id"] = run_id
+    terminal = report.status != CallbackStatus.RUNNING
+    if terminal and (same_run or not run_id):
+        update.update(status=CallbackStatus.RUNNING, error_message=None)
+        terminal = False
+    if not same_run:
+        if report.new_message is None and not terminal:
+            return None
+        update.update(
+            state_patch=None, state_delta=None, state_seq=None, sdk_session_id=None
+        )
+    return report.model_copy(update=update) if update else report
+
+
+async def adopt_outboxes(
+    sender: CallbackSender, session_id: str, run_id: str | None
+) -> int:
+    """Queue the callbacks earlier runs of this session left un-acked.
+
+    Called when a run starts, once `/workspace` belongs to the session (warm-pool
+    containers only get it when claimed). The reports go out ahead of the run's own,
+    through its sender and outbox, adapted by `_for_adoption` so they can neither
+    finish nor overwrite the run that is starting. Files being replayed right now
+    are left to the replay.
+    """
+    adopted = 0
+    for path in session_outbox_paths(session_id):
+        if not claim_outbox(path):
+            continue
+        try:
+            outbox, reports = await asyncio.to_thread(CallbackOutbox.load, path)
+            same_run = bool(run_id) and outbox.run_id == run_id
+            for report in reports:
+                report = _for_adoption(report, outbox.run_id, same_run)
+                if report is not None:
+                    await sender.submit(report)
+                    adopted += 1
+            await outbox.discard()
+        except Exception:
+            logger.exception("callback_outbox_adopt_failed", extra={"path": str(path)})
+            continue
+        finally:
+            release_outbox(path)
+        logger.info(
+            "callback_outbox_adopted",
+            extra={"path": str(path), "pending": len(reports), "same_run": same_run},
+        )
+    return adopted
+
+
+async def replay_outbox(
+    path: Path,
+    client: CallbackClient | None = None,
+    batch_size: int | None = None,
+) -> bool:
+    """Deliver a left-behind outbox file in order; True once nothing is pending.
+
+    Reports keep their status and state: each carries its run id, so the receiver
+    applies it to its own run. Delivery stops at the first failure and resumes from
+    there on the next replay.
+    """
+    outbox, reports = await asyncio.to_thread(CallbackOutbox.load, path)
+    if reports and not outbox.callback_url:
+        logger.warning(
+            "callback_outbox_unroutable",
+            extra={"path": str(path), "pending": len(reports)},
+        )
+        await outbox.discard()
+        return True
+    if client is None:
+        client = CallbackClient(outbox.callback_url)
+    batch_size = max(
+        1,
+        batch_size
+        if batch_size is not None
+        else _env_int("CALLBACK_BATCH_MAX_SIZE", 50),
+    )
+    reports = [
+        report
+        if report.run_id or not outbox.run_id
+        else report.model_copy(update={"run_id": outbox.run_id})
+        for report in reports
+    ]
+    while reports:
+        batch = reports[:batch_size]
+        if len(batch) == 1:
+            applied = 1 if await client.send(batch[0]) else 0
+        else:
+            applied = await client.send_batch(batch)
+        if applied:
+            await outbox.ack([r.callback_id for r in batch[:applied]])
+        reports = reports[applied:]
+        if applied < len(batch):
             return False
+    await outbox.discard()
+    return True
+
+
+async def replay_outboxes(interval_seconds: float | None = None) -> None:
+    """Replay outbox files no run is using, for the lifetime of the process.
+
+    Covers reports left undelivered by a run that has ended (including its terminal
+    callback) even when the session never runs again. A file that keeps failing is
+    retried with exponential backoff, up to ten replay intervals apart.
+    """
+    interval = max(
+        1.0,
+        interval_seconds
+        if interval_seconds is not None
+        else _env_float("CALLBACK_REPLAY_INTERVAL_SECONDS", 30),
+    )
+    max_delay = interval * 10
+    # path -> (consecutive failures, monotonic time of the next attempt)
+    backoff: dict[Path, tuple[int, float]] = {}
+    while True:
+        paths = await asyncio.to_thread(outbox_paths)
+        backoff = {path: backoff[path] for path in paths if path in backoff}
+        for path in paths:
+            failures, next_at = backoff.get(path, (0, 0.0))
+            if time.monotonic() < next_at or not claim_outbox(path):
+                continue
+            try:
+                if await replay_outbox(path):
+                    backoff.pop(path, None)
+                    logger.info("callback_outbox_replayed", extra={"path": str(path)})
+                    continue
+            except Exception:
+                logger.exception(
+                    "callback_outbox_replay_failed", extra={"path": str(path)}
+                )
+            finally:
+                release_outbox(path)
+            failures += 1
+            delay = min(max_delay, interval * 2 ** min(failures - 1, 30))
+            backoff[path] = (failures, time.monotonic() + delay)
+        await asyncio.sleep(interval)
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+from app.schemas.callback import AgentCallbackRequest
+
+logger = logging.getLogger(__name__)
+
+# Outbox files this process is writing or delivering (a run's sender, an adoption
+# or a replay); the others were left behind and may be replayed.
+_claimed_paths: set[Path] = set()
+
+
+def outbox_enabled() -> bool:
+    raw = os.getenv("CALLBACK_OUTBOX_ENABLED", "true")
+    return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def outbox_dir() -> Path:
+    raw = (os.getenv("CALLBACK_OUTBOX_DIR") or "").strip()
+    if raw:
+        return Path(raw)
+    workspace = os.environ.get("WORKSPACE_PATH", "/workspace")
+    return Path(workspace) / ".claude_data" / "callback_outbox"
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        # Removed since it was listed.
+        return 0.0
+
+
+def _outbox_paths(pattern: str) -> list[Path]:
+    directory = outbox_dir()
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(pattern), key=_mtime)
+
+
+def session_outbox_paths(session_id: str) -> list[Path]:
+    """Outbox files of a session, oldest first."""
+    return _outbox_paths(f"{session_id}-*.jsonl")
+
+
+def outbox_paths() -> list[Path]:
+    """All outbox files, oldest first."""
+    return _outbox_paths("*.jsonl")
+
+
+def claim_outbox(path: Path) -> bool:
+    """Reserve an outbox file for this caller; False if someone else has it."""
+    if path in _claimed_paths:
+        return False
+    _claimed_paths.add(path)
+    return True
+
+
+def release_outbox(path: Path) -> None:
+    _claimed_paths.discard(path)
+
+
+def load_pending(
+    path: Path,
+) -> tuple[str | None, str | None, list[dict[str, Any]]]:
+    """Read an outbox file; return its callback URL, run id and the un-acked reports.
+
+    A torn last line (the process died mid-write) is ignored.
+    """
+    callback_url: str | None = None
+    run_id: str | None = None
+    pending: dict[str, dict[str, Any]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("op") == "put":
+                callback_url = record.get("callback_url") or callback_url
+                run_id = record.get("run_id") or run_id
+                report = record.get("report") or {}
+                if report.get("callback_id"):
+                    pending[report["callback_id"]] = report
+            elif record.get("op") == "ack":
+                for callback_id in record.get("ids") or []:
+                    pending.pop(callback_id, None)
+    return callback_url, run_id, list(pending.values())
+
+
+class CallbackOutbox:
+    """Append-only on-disk log of one run's callbacks, kept until they are acked.
+
+    Each queued report is written as a `put` line (with its callback URL) before it
+    is sent (tagged with the run id) and each delivery appends an `ack` line with the
+    delivered ids. The file is removed once everything was acked; otherwise it
+    survives the process (persistent containers keep `/workspace`) and is replayed
+    in the background or picked up by the session's next run, whichever comes
+    first. Lines are written without fsync: they survive a process or container
+    restart, not a host crash.
+    """
+
+    def __init__(
+        self, path: Path, callback_url: str, run_id: str | None = None
+    ) -> None:
+        self.path = path
+        self.callback_url = callback_url
+        self.run_id = run_id
+        self._pending: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def create(
+        cls, session_id: str, callback_url: str, run_id: str | None = None
+    ) -> "CallbackOutbox | None":
+        """Outbox file for a new run, or None when the outbox is disabled."""
+        if not outbox_enabled():
+            return None
+        path = outbox_dir() / f"{session_id}-{uuid.uuid4().hex[:8]}.jsonl"
+        # Owned by the run's sender until it closes.
+        claim_outbox(path)
+        return cls(path, callback_url, run_id)
+
+    @classmethod
+    def load(cls, path: Path) -> tuple["CallbackOutbox", list[AgentCallbackRequest]]:
+        """Reopen an outbox file left by a previous process, with its pending reports."""
+        callback_url, run_id, records = load_pending(path)
+        reports: list[AgentCallbackRequest] = []
+        for record in records:
+            try:
+                reports.append(AgentCallbackRequest.model_validate(record))
+            except ValueError:
+                logger.warning(f"Dropping unreadable callback from outbox {path}")
+        outbox = cls(path, callback_url or "", run_id)
+        outbox._pending = {r.callback_id for r in reports if r.callback_id}
+        return outbox, reports
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _write(self, lines: list[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+    async def _append(self, records: list[dict[str, Any]]) -> None:
+        lines = [json.dumps(r, ensure_ascii=False) + "\n" for r in records]
+        async with self._lock:
+            try:
+                await asyncio.to_thread(self._write, lines)
+            except OSError as exc:
+                logger.warning(f"Failed to write callback outbox {self.path}: {exc}")
+
+    async def put(self, report: AgentCallbackRequest) -> None:
+        if not report.callback_id or report.callback_id in self._pending:
+            return
+        self._pending.add(report.callback_id)
+        await self._append(
+            [
+                {
+                    "op": "put",
+                    "callback_url": self.callback_url,
+                    "run_id": self.run_id,
+                    "report": report.model_dump(mode="json"),
+                }
+            ]
+        )
+
+    async def ack(self, callback_ids: list[str]) -> None:
+        ids = [i for i in callback_ids if i in self._pending]
+        if not ids:
+            return
+        self._pending.difference_update(ids)
+        await self._append([{"op": "ack", "ids": ids}])
+
+    async def discard(self) -> None:
+        """Remove the file; only call once nothing is pending."""
+        async with self._lock:
+            await asyncio.to_thread(self.path.unlink, missing_ok=True)
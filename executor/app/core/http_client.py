@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import random
+from functools import lru_cache
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_RETRY_STATUS_CODES = frozenset({502, 503, 504})
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw.strip())
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw.strip())
+    except Exception:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+class PooledHttpClient:
+    """Keep-alive httpx client with retry/backoff.
+
+    Same retry policy as executor_manager's `app.core.http_client`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        timeout: httpx.Timeout,
+        http2: bool = False,
+        retry_max_attempts: int = 3,
+        retry_backoff_seconds: float = 0.2,
+        retry_backoff_max_seconds: float = 2.0,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max(1, max_connections),
+            max_keepalive_connections=max(0, max_keepalive_connections),
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self.retry_max_attempts = max(1, retry_max_attempts)
+        self.retry_backoff_seconds = max(0.0, retry_backoff_seconds)
+        self.retry_backoff_max_seconds = max(0.0, retry_backoff_max_seconds)
+        self._client: httpx.AsyncClient | None = None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning(
+                    "HTTP/2 requested but the 'h2' package is not installed; "
+                    "falling back to HTTP/1.1"
+                )
+                http2 = False
+        return httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=http2)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(
+            self.retry_backoff_max_seconds,
+            self.retry_backoff_seconds * (2 ** (attempt - 1)),
+        )
+        return random.uniform(0, ceiling)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        method = method.upper()
+        idempotent = method in _IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                retryable = idempotent or isinstance(exc, _UNSENT_ERRORS)
+                if not retryable or attempt >= self.retry_max_attempts:
+                    raise
+                logger.warning(
+                    "http_request_retry",
+                    extra={
+                        "method": method,
+                        "url": url,
+                        "attempt": attempt,
+                        "error": f"{type(exc).__name__}: {exc}",
+                    },
+                )
+            else:
+                if (
+                    not idempotent
+                    or response.status_code not in _RETRY_STATUS_CODES
+                    or attempt >= self.retry_max_attempts
+                ):
+                    return response
+                await response.aclose()
+                logger.warning(
+                    "http_request_retry",
+                    extra={
+                        "method": method,
+                        "url": url,
+                        "attempt": attempt,
+                        "status_code": response.status_code,
+                    },
+                )
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+@lru_cache
+def get_http_client() -> PooledHttpClient:
+    """Process-wide pooled client shared by the callback, user-input and computer clients.
+
+    Configured from the HTTP_* variables Executor Manager passes to the container.
+    """
+    return PooledHttpClient(
+        max_connections=_env_int("HTTP_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=_env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10),
+        keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY_SECONDS", 30.0),
+        timeout=httpx.Timeout(
+            _env_float("HTTP_TIMEOUT_SECONDS", 30.0),
+            connect=_env_float("HTTP_CONNECT_TIMEOUT_SECONDS", 5.0),
+        ),
+        http2=_env_bool("HTTP2_ENABLED", False),
+        retry_max_attempts=_env_int("HTTP_RETRY_MAX_ATTEMPTS", 3),
+        retry_backoff_seconds=_env_float("HTTP_RETRY_BACKOFF_SECONDS", 0.2),
+        retry_backoff_max_seconds=_env_float("HTTP_RETRY_BACKOFF_MAX_SECONDS", 2.0),
+    )
@@ -2,8 +2,7 @@ import asyncio
 from datetime import datetime, timezone
 from typing import Any
 
-import httpx
-
+from app.core.http_client import get_http_client
 from app.core.observability.request_context import (
     generate_request_id,
     generate_trace_id,
@@ -22,6 +21,7 @@ class UserInputClient:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.poll_interval = poll_interval
+        self.http = get_http_client()
 
     @staticmethod
     def resolve_base_url(callback_url: str, callback_base_url: str | None) -> str:
@@ -32,31 +32,31 @@ class UserInputClient:
         return callback_url.rstrip("/")
 
     async def create_request(self, payload: dict[str, Any]) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/user-input-requests",
-                json=payload,
-                headers={
-                    "X-Request-ID": get_request_id() or generate_request_id(),
-                    "X-Trace-ID": get_trace_id() or generate_trace_id(),
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", {})
+        response = await self.http.post(
+            f"{self.base_url}/api/v1/user-input-requests",
+            timeout=self.timeout,
+            json=payload,
+            headers={
+                "X-Request-ID": get_request_id() or generate_request_id(),
+                "X-Trace-ID": get_trace_id() or generate_trace_id(),
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("data", {})
 
     async def get_request(self, request_id: str) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                f"{self.base_url}/api/v1/user-input-requests/{request_id}",
-                headers={
-                    "X-Request-ID": get_request_id() or generate_request_id(),
-                    "X-Trace-ID": get_trace_id() or generate_trace_id(),
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", {})
+        response = await self.http.get(
+            f"{self.base_url}/api/v1/user-input-requests/{request_id}",
+            timeout=self.timeout,
+            headers={
+                "X-Request-ID": get_request_id() or generate_request_id(),
+                "X-Trace-ID": get_trace_id() or generate_trace_id(),
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("data", {})
 
     async def wait_for_answer(
         self, request_id: str, timeout_seconds: float = 60
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import os
 import shutil
@@ -7,15 +8,14 @@ from pathlib import Path
 from urllib.parse import urlparse
 
 from app.schemas.request import TaskConfig
-from app.utils.git.operations import (
-    GitCommandError,
-    GitError,
+from app.utils.git.async_operations import (
+    checkout,
     clone,
+    fetch,
     init_repository,
     is_repository,
-    checkout,
-    fetch,
 )
+from app.utils.git.operations import GitCommandError, GitError
 
 logger = logging.getLogger(__name__)
 
@@ -60,9 +60,9 @@ class WorkspaceManager:
             self.root_path.mkdir(parents=True, exist_ok=True)
 
         await self._setup_session_persistence()
-        self.work_path = self._prepare_repository(config)
+        self.work_path = await self._prepare_repository(config)
         self._ensure_inputs_dir(self.work_path)
-        self._ensure_git_excludes(self.work_path)
+        await self._ensure_git_excludes(self.work_path)
 
     async def _setup_session_persistence(self):
         self.persistent_claude_data.mkdir(exist_ok=True)
@@ -87,19 +87,19 @@ class WorkspaceManager:
                 pass
             self._git_askpass_path = None
 
-    def _prepare_repository(self, config: TaskConfig) -> Path:
+    async def _prepare_repository(self, config: TaskConfig) -> Path:
         repo_url = (config.repo_url or "").strip()
         if repo_url:
-            return self._ensure_cloned_repo(
+            return await self._ensure_cloned_repo(
                 repo_url,
                 config.git_branch,
                 git_token=(config.git_token or "").strip() or None,
             )
 
-        self._ensure_git_repo(self.root_path)
+        await self._ensure_git_repo(self.root_path)
         return self.root_path
 
-    def _ensure_cloned_repo(
+    async def _ensure_cloned_repo(
         self,
         repo_url: str,
         branch: str | None,
@@ -109,17 +109,31 @@ class WorkspaceManager:
         repo_path = self._derive_repo_path(repo_url)
         git_env = self._build_git_env(repo_url, git_token)
 
-        if repo_path.exists() and is_repository(repo_path):
-            self._checkout_branch(repo_path, branch, env=git_env)
+        if repo_path.exists():
+            if not await is_repository(repo_path):
+                raise RuntimeError(
+                    f"Target path exists but is not a git repository: {repo_path}"
+                )
+            await self._checkout_branch(repo_path, branch, env=git_env)
             return repo_path
 
-        if repo_path.exists() and not is_repository(repo_path):
-            raise RuntimeError(
-                f"Target path exists but is not a git repository: {repo_path}"
-            )
+        reference = self._find_git_mirror(repo_url)
+        if reference is not None:
+            try:
+                return await clone(
+                    repo_url,
+                    path=repo_path,
+                    branch=branch,
+                    env=git_env,
+                    reference=reference,
+                    dissociate=True,
+                )
+            except (GitCommandError, GitError, OSError) as exc:
+                logger.warning(f"Clone with git mirror reference failed: {exc}")
+                shutil.rmtree(repo_path, ignore_errors=True)
 
         try:
-            return clone(repo_url, path=repo_path, branch=branch, env=git_env)
+            return await clone(repo_url, path=repo_path, branch=branch, env=git_env)
         except (GitCommandError, GitError, OSError) as exc:
             detail = str(exc)
             # Keep the error message compact for the UI.
@@ -129,6 +143,23 @@ class WorkspaceManager:
                 f"Failed to clone repository: {repo_url}. {detail}"
             ) from exc
 
+    @staticmethod
+    def _find_git_mirror(repo_url: str) -> Path | None:
+        """Node-level bare mirror of the repo, mounted read-only by Executor Manager.
+
+        The key must match executor_manager's `git_mirror_cache.mirror_key`. Objects
+        found in the mirror are not downloaded again; `--dissociate` then copies them
+        so the clone does not depend on the mount.
+        """
+        mirror_dir = os.environ.get("GIT_MIRROR_DIR", "").strip()
+        if not mirror_dir:
+            return None
+        clean = repo_url.strip().split("?", 1)[0].split("#", 1)[0].rstrip("/")
+        clean = clean.removesuffix(".git").lower()
+        key = hashlib.sha256(clean.encode("utf-8")).hexdigest()
+        mirror = Path(mirror_dir) / f"{key}.git"
+        return mirror if mirror.is_dir() else None
+
     def _build_git_env(self, repo_url: str, git_token: str | None) -> dict[str, str]:
         """Build a per-command env map for git operations.
 
@@ -193,23 +224,23 @@ esac
         return self.root_path / name
 
     @staticmethod
-    def _ensure_git_repo(path: Path) -> None:
-        if is_repository(path):
+    async def _ensure_git_repo(path: Path) -> None:
+        if await is_repository(path):
             return
         try:
-            init_repository(path)
+            await init_repository(path)
         except Exception as exc:
             logger.warning(f"Failed to init git repository at {path}: {exc}")
 
     @staticmethod
-    def _checkout_branch(
+    async def _checkout_branch(
         path: Path, branch: str | None, *, env: dict[str, str] | None = None
     ) -> None:
         if not branch:
             return
         try:
-            fetch(remote="origin", branch=branch, cwd=path, env=env)
-            checkout(branch, cwd=path)
+            await fetch(remote="origin", branch=branch, cwd=path, env=env)
+            await checkout(branch, cwd=path)
         except (GitCommandError, GitError, OSError) as exc:
             detail = str(exc)
             if len(detail) > 2000:
@@ -218,8 +249,8 @@ esac
                 f"Failed to checkout branch '{branch}' for repo at {path}. {detail}"
             ) from exc
 
-    def _ensure_git_excludes(self, repo_path: Path) -> None:
-        if not is_repository(repo_path):
+    async def _ensure_git_excludes(self, repo_path: Path) -> None:
+        if not await is_repository(repo_path):
             return
 
         extra = os.environ.get("WORKSPACE_GIT_IGNORE", "")
@@ -1,37 +1,121 @@
-from typing import Any, Optional
+import os
+from typing import Any
 
 from claude_agent_sdk.types import ResultMessage, SystemMessage
 
-from app.core.callback import CallbackClient
+from app.core.callback import CallbackClient, CallbackSender, adopt_outboxes
+from app.core.callback_outbox import CallbackOutbox
 from app.hooks.base import AgentHook, ExecutionContext
 from app.schemas.callback import AgentCallbackRequest
 from app.schemas.enums import CallbackStatus, TodoStatus
 from app.utils.serializer import serialize_message
+from app.utils.state_delta import diff_state
+
+
+def _full_state_every() -> int:
+    raw = os.getenv("CALLBACK_FULL_STATE_EVERY")
+    if raw is None:
+        return 50
+    try:
+        return max(1, int(raw.strip()))
+    except ValueError:
+        return 50
 
 
 class CallbackHook(AgentHook):
-    def __init__(self, client: CallbackClient):
+    """Reports agent progress, messages and state to Executor Manager.
+
+    Reports go through a background `CallbackSender`; terminal callbacks flush it.
+    With an outbox, undelivered reports are kept on disk; those left by earlier runs
+    of the session are sent first when a run starts.
+
+    State is versioned with a sequence number that continues from the version the
+    backend last stored (`state_seq`, passed with the run), so a late report of an
+    earlier run never replaces newer state. The first callback, every
+    `full_state_every`-th state-bearing callback, terminal callbacks and the first
+    callback after a failed delivery or a resync request from the receiver carry the
+    full state; all others carry only the delta against the previously sent state
+    (or no state at all when nothing changed).
+    """
+
+    def __init__(
+        self,
+        client: CallbackClient,
+        full_state_every: int | None = None,
+        outbox: CallbackOutbox | None = None,
+        run_id: str | None = None,
+        state_seq: int | None = None,
+    ):
         self.client = client
-        self.execution_error: Optional[Exception] = None
-        self.sdk_session_id: Optional[str] = None
+        self.client.on_resync = self._resync
+        self.run_id = run_id
+        self.execution_error: Exception | None = None
+        self.sdk_session_id: str | None = None
+        self.full_state_every = (
+            _full_state_every() if full_state_every is None else full_state_every
+        )
+        self.sender = CallbackSender(client, outbox=outbox, on_failure=self._resync)
+        self._state_seq = state_seq or 0
+        # Last state (JSON) sent to the receiver; None forces a full snapshot.
+        self._sent_state: dict[str, Any] | None = None
+        self._sent_seq = 0
+        self._deltas_since_full = 0
+
+    def _resync(self, state_seq: int | None = None) -> None:
+        # The receiver may have missed a version: resync with a full snapshot,
+        # numbered above the version it has stored.
+        self._sent_state = None
+        if state_seq is not None:
+            self._state_seq = max(self._state_seq, state_seq)
 
     def _build_report(
         self,
         context: ExecutionContext,
         status: str,
         progress: int,
-        new_message: Optional[Any] = None,
+        new_message: Any | None = None,
         error_message: str | None = None,
-    ) -> AgentCallbackRequest:
-        return AgentCallbackRequest(
+        full_state: bool = False,
+    ) -> tuple[AgentCallbackRequest, dict[str, Any] | None]:
+        """Build a report and the state it carries (None if it carries no state)."""
+        report = AgentCallbackRequest(
             session_id=context.session_id,
             status=status,
             progress=progress,
             error_message=error_message,
             new_message=serialize_message(new_message),
-            state_patch=context.current_state,
             sdk_session_id=self.sdk_session_id,
+            run_id=self.run_id,
         )
+        state = context.current_state.model_dump(mode="json")
+        delta = None
+        if not full_state and self._sent_state is not None:
+            delta = diff_state(self._sent_state, state, base_seq=self._sent_seq)
+            if delta is None:
+                return report, None
+        self._state_seq += 1
+        report.state_seq = self._state_seq
+        if delta is None or self._deltas_since_full >= self.full_state_every:
+            # Copied: the report is serialized later, by the sender.
+            report.state_patch = context.current_state.model_copy(deep=True)
+        else:
+            report.state_delta = delta
+        return report, state
+
+    async def _send(
+        self, report: AgentCallbackRequest, state: dict[str, Any] | None
+    ) -> None:
+        if state is not None:
+            self._sent_state = state
+            self._sent_seq = report.state_seq or 0
+            self._deltas_since_full = (
+                0 if report.state_patch is not None else self._deltas_since_full + 1
+            )
+        await self.sender.submit(report)
+
+    async def on_setup(self, context: ExecutionContext):
+        if self.sender.outbox is not None:
+            await adopt_outboxes(self.sender, context.session_id, self.run_id)
 
     def _calculate_progress(self, todos) -> int:
         if not todos:
@@ -47,8 +131,8 @@ class CallbackHook(AgentHook):
         elif isinstance(message, ResultMessage):
             self.sdk_session_id = message.session_id
 
-        await self.client.send(
-            self._build_report(
+        await self._send(
+            *self._build_report(
                 context=context,
                 status=CallbackStatus.RUNNING,
                 progress=self._calculate_progress(context.current_state.todos),
@@ -71,14 +155,17 @@ class CallbackHook(AgentHook):
                 detail = detail[:2000] + "..."
             error_message = detail
 
-        await self.client.send(
-            self._build_report(
+        await self._send(
+            *self._build_report(
                 context=context,
                 status=status,
                 progress=progress,
                 error_message=error_message,
+                full_state=True,
             )
         )
+        # Terminal callbacks are delivered before the run is reported finished.
+        await self.sender.close()
 
     async def on_error(self, context: ExecutionContext, error: Exception):
         self.execution_error = error
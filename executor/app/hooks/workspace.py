@@ -1,38 +1,144 @@
+import asyncio
+import logging
+import os
+import time
 from datetime import datetime, timezone
 from typing import Any
 
+from claude_agent_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
 from app.hooks.base import AgentHook, ExecutionContext
 from app.schemas.enums import FileStatus
 from app.schemas.state import FileChange, WorkspaceState
-from app.utils.git.operations import (
-    GitNotRepositoryError,
-    diff,
-    get_numstat,
+from app.utils.git.async_operations import (
+    diff_files,
     get_status,
     is_repository,
     list_remotes,
     remote_url,
+    set_config,
+    supports_fsmonitor,
+)
+from app.utils.git.operations import GitNotRepositoryError
+
+logger = logging.getLogger(__name__)
+
+# Tools that cannot change files; results of any other tool (Write, Edit, Bash, Task,
+# MCP tools, ...) mark the workspace as possibly changed.
+READ_ONLY_TOOLS = frozenset(
+    {"Read", "Grep", "Glob", "LS", "TodoWrite", "Skill", "WebFetch", "WebSearch"}
 )
 
 
+def _debounce_seconds() -> float:
+    raw = os.getenv("WORKSPACE_DIFF_DEBOUNCE_SECONDS")
+    if raw is None:
+        return 0.5
+    try:
+        return max(0.0, float(raw.strip()))
+    except Exception:
+        return 0.5
+
+
 class WorkspaceHook(AgentHook):
-    """Hook that monitors workspace file changes and updates state."""
+    """Hook that monitors workspace file changes and updates state.
+
+    The git diff is only recomputed after results of tools that may have touched the
+    filesystem; bursts of such results are debounced into one background refresh.
+    The final result message (and errors) flush any pending refresh inline, so the
+    terminal callback carries the final workspace state.
+    """
+
+    def __init__(self, debounce_seconds: float | None = None) -> None:
+        self.debounce_seconds = (
+            _debounce_seconds() if debounce_seconds is None else debounce_seconds
+        )
+        # The first message always computes a baseline (the repo may be pre-populated).
+        self._dirty = True
+        self._pending_tool_ids: set[str] = set()
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    async def on_setup(self, context: ExecutionContext) -> None:
+        await self._tune_repository(context.cwd)
 
     async def on_agent_response(self, context: ExecutionContext, message: Any) -> None:
-        """Capture Git-tracked file changes after each agent response.
+        """Track file-mutating tool calls and refresh workspace state when needed.
 
         Args:
             context: The execution context containing workspace state.
-            message: The agent response message (unused).
+            message: The agent response message.
         """
+        if isinstance(message, AssistantMessage):
+            for block in message.content:
+                if (
+                    isinstance(block, ToolUseBlock)
+                    and block.name not in READ_ONLY_TOOLS
+                ):
+                    self._pending_tool_ids.add(block.id)
+        elif isinstance(message, UserMessage) and isinstance(message.content, list):
+            for block in message.content:
+                if (
+                    isinstance(block, ToolResultBlock)
+                    and block.tool_use_id in self._pending_tool_ids
+                ):
+                    self._pending_tool_ids.discard(block.tool_use_id)
+                    self._dirty = True
+
+        if isinstance(message, ResultMessage):
+            await self._flush(context)
+        elif self._dirty and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_loop(context))
+
+    async def on_error(self, context: ExecutionContext, error: Exception) -> None:
+        await self._flush(context)
+
+    async def on_teardown(self, context: ExecutionContext) -> None:
+        # The state was flushed by the result message; later git activity (the run
+        # snapshot commit) must not be reported as agent changes.
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _refresh_loop(self, context: ExecutionContext) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.debounce_seconds)
+            self._dirty = False
+            await self._refresh(context)
+
+    async def _flush(self, context: ExecutionContext) -> None:
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            self._dirty = True
+        if self._dirty:
+            self._dirty = False
+            await self._refresh(context)
+
+    async def _refresh(self, context: ExecutionContext) -> None:
+        """Recompute the Git-tracked file changes of the workspace."""
+        started = time.perf_counter()
         try:
-            if not is_repository(context.cwd):
+            if not await is_repository(context.cwd):
                 context.current_state.workspace_state = WorkspaceState()
                 return
 
-            git_status = get_status(context.cwd)
-            repository = self._get_repository_url(context.cwd)
-            file_changes = self._collect_file_changes(git_status, context.cwd)
+            git_status = await get_status(context.cwd)
+            repository = await self._get_repository_url(context.cwd)
+            file_changes = await self._collect_file_changes(git_status, context.cwd)
 
             total_added = sum(fc.added_lines for fc in file_changes)
             total_deleted = sum(fc.deleted_lines for fc in file_changes)
@@ -49,10 +155,25 @@ class WorkspaceHook(AgentHook):
             context.current_state.workspace_state = WorkspaceState()
         except Exception:
             context.current_state.workspace_state = WorkspaceState()
+        logger.info(
+            "timing",
+            extra={
+                "step": "workspace_diff",
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+                "session_id": context.session_id,
+                "file_count": len(
+                    context.current_state.workspace_state.file_changes
+                    if context.current_state.workspace_state
+                    else []
+                ),
+            },
+        )
 
-    def _collect_file_changes(self, git_status, cwd: str) -> list[FileChange]:
+    async def _collect_file_changes(self, git_status, cwd: str) -> list[FileChange]:
         """Collect file changes with diff information.
 
+        Unstaged and staged patches each come from a single `git diff` run.
+
         Args:
             git_status: The Git status object.
             cwd: Current working directory.
@@ -62,32 +183,38 @@ class WorkspaceHook(AgentHook):
         """
         file_changes = []
 
-        unstaged_numstat = get_numstat(cwd, cached=False)
-        staged_numstat = get_numstat(cwd, cached=True)
+        unstaged = (
+            {d.path: d for d in await diff_files(cwd, cached=False)}
+            if git_status.modified
+            else {}
+        )
+        staged = (
+            {d.path: d for d in await diff_files(cwd, cached=True)}
+            if git_status.staged
+            else {}
+        )
 
         for file in git_status.modified:
-            added, deleted = unstaged_numstat.get(file, (0, 0))
-            diff_content = diff(file=file, cwd=cwd, cached=False)
+            file_diff = unstaged.get(file)
             file_changes.append(
                 FileChange(
                     path=file,
                     status=FileStatus.MODIFIED,
-                    added_lines=added,
-                    deleted_lines=deleted,
-                    diff=diff_content or None,
+                    added_lines=file_diff.added_lines if file_diff else 0,
+                    deleted_lines=file_diff.deleted_lines if file_diff else 0,
+                    diff=(file_diff.patch if file_diff else None) or None,
                 )
             )
 
         for file in git_status.staged:
-            added, deleted = staged_numstat.get(file, (0, 0))
-            diff_content = diff(file=file, cwd=cwd, cached=True)
+            file_diff = staged.get(file)
             file_changes.append(
                 FileChange(
                     path=file,
                     status=FileStatus.STAGED,
-                    added_lines=added,
-                    deleted_lines=deleted,
-                    diff=diff_content or None,
+                    added_lines=file_diff.added_lines if file_diff else 0,
+                    deleted_lines=file_diff.deleted_lines if file_diff else 0,
+                    diff=(file_diff.patch if file_diff else None) or None,
                 )
             )
 
@@ -121,7 +248,7 @@ class WorkspaceHook(AgentHook):
 
         return file_changes
 
-    def _get_repository_url(self, cwd: str) -> str | None:
+    async def _get_repository_url(self, cwd: str) -> str | None:
         """Get repository URL from Git remotes.
 
         Tries 'origin', then 'upstream', then the first available remote.
@@ -135,14 +262,26 @@ class WorkspaceHook(AgentHook):
         try:
             for remote_name in ["origin", "upstream"]:
                 try:
-                    return remote_url(remote_name, cwd)
+                    return await remote_url(remote_name, cwd)
                 except Exception:
                     continue
 
-            remotes = list_remotes(cwd)
+            remotes = await list_remotes(cwd)
             if remotes:
                 return remotes[0].fetch_url
         except Exception:
             pass
 
         return None
+
+    @staticmethod
+    async def _tune_repository(cwd: str) -> None:
+        """Speed up repeated `git status` with the untracked cache and fsmonitor."""
+        try:
+            if not await is_repository(cwd):
+                return
+            await set_config("core.untrackedCache", "true", cwd=cwd)
+            if await supports_fsmonitor(cwd):
+                await set_config("core.fsmonitor", "true", cwd=cwd)
+        except Exception as exc:
+            logger.warning(f"Failed to tune workspace git repository: {exc}")
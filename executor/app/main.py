@@ -1,9 +1,14 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
 from app.api import task_router
+from app.core.callback import replay_outboxes
+from app.core.callback_outbox import outbox_enabled
+from app.core.http_client import get_http_client
 from app.core.middleware import setup_middleware
 from app.core.observability.logging import configure_logging
 
@@ -12,7 +17,21 @@ configure_logging(
     service_name="executor",
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Delivers callbacks earlier processes or finished runs left in the outbox.
+    replay_task = asyncio.create_task(replay_outboxes()) if outbox_enabled() else None
+    yield
+    if replay_task is not None:
+        replay_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await replay_task
+    # Close pooled keep-alive connections used by callback/user-input/computer clients.
+    await get_http_client().aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 setup_middleware(app)
 app.include_router(task_router)
@@ -1,5 +1,5 @@
-from datetime import datetime, timezone
-from typing import Any, Optional
+from datetime import UTC, datetime
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -7,14 +7,44 @@ from app.schemas.enums import CallbackStatus
 from app.schemas.state import AgentCurrentState
 
 
+class FileChangeKey(BaseModel):
+    """Identifies a workspace file change (a path can be both modified and staged)."""
+
+    path: str
+    status: str
+
+
+class AgentStateDelta(BaseModel):
+    """Changes to the agent state since the callback whose state_seq is `base_seq`.
+
+    `fields` replaces top-level state fields wholesale (for `workspace_state` without
+    its `file_changes`; None clears the workspace state). MCP entries are keyed by
+    server name and file changes by (path, status).
+    """
+
+    base_seq: int
+    fields: dict[str, Any] = Field(default_factory=dict)
+    mcp_upserts: list[dict[str, Any]] = Field(default_factory=list)
+    mcp_removed: list[str] = Field(default_factory=list)
+    file_upserts: list[dict[str, Any]] = Field(default_factory=list)
+    file_removed: list[FileChangeKey] = Field(default_factory=list)
+
+
 class AgentCallbackRequest(BaseModel):
     """Callback request sent during agent execution."""
 
     session_id: str
-    time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    time: datetime = Field(default_factory=lambda: datetime.now(UTC))
     status: CallbackStatus
     progress: int
     error_message: str | None = None
-    new_message: Optional[Any] = None
-    state_patch: Optional[AgentCurrentState] = None
-    sdk_session_id: Optional[str] = None
+    new_message: Any | None = None
+    state_patch: AgentCurrentState | None = None
+    state_delta: AgentStateDelta | None = None
+    # Version of the state carried by state_patch (full snapshot) or state_delta.
+    state_seq: int | None = None
+    sdk_session_id: str | None = None
+    # Idempotency key, assigned when the report is queued for delivery.
+    callback_id: str | None = None
+    # Run that produced the report, so a late report cannot finish a later run.
+    run_id: str | None = None
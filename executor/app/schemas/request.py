@@ -58,3 +58,6 @@ class TaskRun(BaseModel):
     sdk_session_id: str | None = None
     callback_base_url: str | None = None
     permission_mode: str = "default"
+    # Last state version the backend stored for the session; callbacks continue
+    # from it.
+    state_seq: int | None = None
@@ -0,0 +1,472 @@
+"""
+Asyncio-native twins of the git operations used on the executor event loop.
+
+Every command runs through `asyncio.create_subprocess_exec`, so a slow `git status`
+or clone never blocks SDK message consumption, callbacks or user-input polling.
+Each call is bounded by a timeout; on timeout or task cancellation the git process is
+killed and reaped before the error propagates. Exceptions, result dataclasses and
+output parsers are shared with `app.utils.git.operations`.
+"""
+
+import asyncio
+import os
+import shlex
+import signal
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.utils.git.operations import (
+    GitCommandError,
+    GitError,
+    GitFileDiff,
+    GitNotRepositoryError,
+    GitRemote,
+    GitStatus,
+    GitTimeoutError,
+    _looks_like_not_a_repository,
+    _parse_numstat,
+    _parse_numstat_patch,
+    _parse_remotes,
+    _parse_status_porcelain_v1_z,
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw.strip())
+    except Exception:
+        return default
+
+
+# Local commands (status, diff, commit, ...) and commands that talk to a remote.
+DEFAULT_TIMEOUT_SECONDS = _env_float("GIT_COMMAND_TIMEOUT_SECONDS", 60.0)
+NETWORK_TIMEOUT_SECONDS = _env_float("GIT_NETWORK_TIMEOUT_SECONDS", 600.0)
+
+
+@dataclass
+class GitResult:
+    """Outcome of an async git command."""
+
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    # Kill the whole process group: helpers spawned by git (ssh, credential and
+    # hook processes) would otherwise keep the output pipes open.
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    # Shielded so the process is reaped even while the caller is being cancelled.
+    await asyncio.shield(proc.wait())
+
+
+async def _run_git_command(
+    command: list[str],
+    cwd: str | Path | None = None,
+    check: bool = True,
+    env: dict[str, str] | None = None,
+    timeout: float | None = DEFAULT_TIMEOUT_SECONDS,
+) -> GitResult:
+    """
+    Run a git command without blocking the event loop.
+
+    Args:
+        command: The git command to execute (without 'git' prefix)
+        cwd: Working directory for the command
+        check: If True, raise exception on non-zero exit code
+        env: Environment variables for the command
+        timeout: Seconds before the command is killed (None to wait forever)
+
+    Returns:
+        GitResult: Exit code and decoded output
+
+    Raises:
+        GitCommandError: If the command fails and check=True
+        GitTimeoutError: If the command exceeds the timeout
+    """
+    full_command = ["git", *command]
+    merged_env = {**os.environ, **(env or {})}
+    # Ensure git never blocks on interactive prompts inside the executor.
+    merged_env["GIT_TERMINAL_PROMPT"] = "0"
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *full_command,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=merged_env,
+            start_new_session=True,
+        )
+    except FileNotFoundError:
+        raise GitError("Git is not installed or not in PATH") from None
+
+    try:
+        stdout_bytes, stderr_bytes = await asyncio.wait_for(
+            proc.communicate(), timeout=timeout
+        )
+    except TimeoutError:
+        await _terminate(proc)
+        raise GitTimeoutError(shlex.join(full_command), timeout or 0) from None
+    except asyncio.CancelledError:
+        await _terminate(proc)
+        raise
+
+    result = GitResult(
+        returncode=proc.returncode if proc.returncode is not None else -1,
+        stdout=stdout_bytes.decode("utf-8", errors="replace"),
+        stderr=stderr_bytes.decode("utf-8", errors="replace"),
+    )
+
+    stderr = result.stderr.strip()
+    if result.returncode != 0 and _looks_like_not_a_repository(stderr):
+        raise GitNotRepositoryError(stderr or "Not a git repository")
+
+    if check and result.returncode != 0:
+        raise GitCommandError(
+            command=shlex.join(full_command),
+            returncode=result.returncode,
+            stderr=stderr or None,
+        )
+
+    return result
+
+
+async def is_repository(cwd: str | Path | None = None) -> bool:
+    """Check if the directory is a git repository."""
+    try:
+        await _run_git_command(["rev-parse", "--git-dir"], cwd=cwd, check=True)
+        return True
+    except GitError:
+        return False
+
+
+async def has_commits(cwd: str | Path | None = None) -> bool:
+    """Check whether the repository has at least one commit (i.e., HEAD exists)."""
+    try:
+        result = await _run_git_command(
+            ["rev-parse", "--verify", "HEAD"], cwd=cwd, check=False
+        )
+        return result.returncode == 0
+    except GitError:
+        return False
+
+
+async def tag_ref(
+    name: str,
+    ref: str | None = None,
+    cwd: str | Path | None = None,
+    force: bool = False,
+) -> None:
+    """Create (or update) a lightweight tag."""
+    args = ["tag"]
+    if force:
+        args.append("-f")
+    args.append(name)
+    if ref:
+        args.append(ref)
+    await _run_git_command(args, cwd=cwd, check=True)
+
+
+async def init_repository(path: str | Path | None = None, bare: bool = False) -> Path:
+    """Initialize a new git repository and return its path."""
+    repo_path = Path(path) if path else Path.cwd()
+    if path:
+        repo_path.mkdir(parents=True, exist_ok=True)
+
+    args = ["init"]
+    if bare:
+        args.append("--bare")
+
+    await _run_git_command(args, cwd=repo_path, check=True)
+    return repo_path.resolve()
+
+
+async def get_current_branch(cwd: str | Path | None = None) -> str:
+    """Get the name of the current branch (or the commit hash when detached)."""
+    try:
+        result = await _run_git_command(
+            ["symbolic-ref", "--short", "HEAD"], cwd=cwd, check=True
+        )
+        branch = result.stdout.strip()
+        if branch:
+            return branch
+    except GitCommandError:
+        pass
+
+    result = await _run_git_command(
+        ["rev-parse", "--abbrev-ref", "HEAD"], cwd=cwd, check=True
+    )
+    branch = result.stdout.strip()
+
+    if branch == "HEAD":
+        try:
+            result = await _run_git_command(["rev-parse", "HEAD"], cwd=cwd, check=True)
+            branch = result.stdout.strip()
+        except GitCommandError:
+            return "HEAD"
+
+    return branch
+
+
+async def get_current_commit(cwd: str | Path | None = None) -> str:
+    """Get the hash of the current commit (HEAD)."""
+    result = await _run_git_command(["rev-parse", "HEAD"], cwd=cwd, check=True)
+    return result.stdout.strip()
+
+
+async def get_status(cwd: str | Path | None = None) -> GitStatus:
+    """Get the current git status."""
+    branch = await get_current_branch(cwd)
+
+    result = await _run_git_command(
+        ["status", "--porcelain=v1", "--untracked-files=all", "-z"],
+        cwd=cwd,
+        check=True,
+    )
+    staged, modified, untracked, deleted, renamed = _parse_status_porcelain_v1_z(
+        result.stdout
+    )
+
+    return GitStatus(
+        branch=branch,
+        staged=staged,
+        modified=modified,
+        untracked=untracked,
+        deleted=deleted,
+        renamed=renamed,
+    )
+
+
+async def add_files(
+    files: str | list[str],
+    cwd: str | Path | None = None,
+    update: bool = False,
+    all_files: bool = False,
+) -> None:
+    """Stage files for commit."""
+    args = ["add"]
+
+    if update:
+        args.append("-u")
+    if all_files:
+        args.append("-A")
+
+    if isinstance(files, str):
+        args.append(files)
+    else:
+        args.extend(files)
+
+    await _run_git_command(args, cwd=cwd, check=True)
+
+
+async def commit(
+    message: str,
+    cwd: str | Path | None = None,
+    allow_empty: bool = False,
+    amend: bool = False,
+    no_verify: bool = False,
+    sign_off: bool = False,
+) -> str:
+    """Create a commit and return its hash."""
+    args = ["commit", "-m", message]
+
+    if allow_empty:
+        args.append("--allow-empty")
+    if amend:
+        args.append("--amend")
+    if no_verify:
+        args.append("--no-verify")
+    if sign_off:
+        args.append("--signoff")
+
+    await _run_git_command(args, cwd=cwd, check=True)
+
+    return await get_current_commit(cwd)
+
+
+async def diff(
+    file: str | None = None,
+    cached: bool = False,
+    cwd: str | Path | None = None,
+    context_lines: int | None = None,
+    name_only: bool = False,
+) -> str:
+    """Show differences of the working tree (or the index with cached=True)."""
+    args = ["diff"]
+
+    if cached:
+        args.append("--cached")
+    if context_lines:
+        args.extend(["-U", str(context_lines)])
+    if name_only:
+        args.append("--name-only")
+    if file:
+        args.append(file)
+
+    result = await _run_git_command(args, cwd=cwd, check=False)
+    return result.stdout
+
+
+async def get_numstat(
+    cwd: str | Path | None = None, cached: bool = False
+) -> dict[str, tuple[int, int]]:
+    """Get (added_lines, deleted_lines) per changed file."""
+    args = ["diff", "--numstat"]
+    if cached:
+        args.append("--cached")
+
+    result = await _run_git_command(args, cwd=cwd, check=True)
+    return _parse_numstat(result.stdout)
+
+
+async def diff_files(
+    cwd: str | Path | None = None, cached: bool = False
+) -> list[GitFileDiff]:
+    """Line counts and patch of every changed file, from a single `git diff`."""
+    args = ["diff", "--numstat", "--patch", "-z"]
+    if cached:
+        args.append("--cached")
+
+    result = await _run_git_command(args, cwd=cwd, check=True)
+    return _parse_numstat_patch(result.stdout)
+
+
+async def supports_fsmonitor(cwd: str | Path | None = None) -> bool:
+    """Whether git's builtin fsmonitor daemon is available (platform/version)."""
+    try:
+        result = await _run_git_command(
+            ["fsmonitor--daemon", "status"], cwd=cwd, check=False
+        )
+    except GitError:
+        return False
+    stderr = result.stderr.lower()
+    return "not supported" not in stderr and "not a git command" not in stderr
+
+
+async def list_remotes(cwd: str | Path | None = None) -> list[GitRemote]:
+    """List remote repositories."""
+    result = await _run_git_command(["remote", "-v"], cwd=cwd, check=True)
+    return _parse_remotes(result.stdout)
+
+
+async def remote_url(name: str = "origin", cwd: str | Path | None = None) -> str:
+    """Get the URL of a remote repository.
+
+    Raises:
+        GitError: If remote not found
+    """
+    try:
+        result = await _run_git_command(
+            ["remote", "get-url", name], cwd=cwd, check=True
+        )
+        return result.stdout.strip()
+    except GitCommandError as e:
+        raise GitError(f"Remote '{name}' not found") from e
+
+
+async def set_config(
+    key: str,
+    value: str,
+    cwd: str | Path | None = None,
+    global_config: bool = False,
+) -> None:
+    """Set a git configuration value."""
+    args = ["config", "--global" if global_config else "--local", key, value]
+    await _run_git_command(args, cwd=cwd, check=True)
+
+
+async def fetch(
+    remote: str | None = None,
+    branch: str | None = None,
+    cwd: str | Path | None = None,
+    all_branches: bool = False,
+    prune: bool = False,
+    env: dict[str, str] | None = None,
+) -> None:
+    """Fetch from remote repository."""
+    args = ["fetch"]
+
+    if all_branches:
+        args.append("--all")
+    if prune:
+        args.append("--prune")
+
+    if remote:
+        args.append(remote)
+        if branch:
+            args.append(branch)
+
+    await _run_git_command(
+        args, cwd=cwd, check=True, env=env, timeout=NETWORK_TIMEOUT_SECONDS
+    )
+
+
+async def checkout(
+    ref: str,
+    cwd: str | Path | None = None,
+    create_branch: bool = False,
+    force: bool = False,
+) -> str:
+    """Checkout a branch or commit and return the checked-out reference."""
+    args = ["checkout"]
+
+    if create_branch:
+        args.append("-b")
+    if force:
+        args.append("-f")
+
+    args.append(ref)
+
+    await _run_git_command(args, cwd=cwd, check=True)
+
+    return ref
+
+
+async def clone(
+    url: str,
+    path: str | Path | None = None,
+    branch: str | None = None,
+    depth: int | None = None,
+    single_branch: bool = False,
+    bare: bool = False,
+    env: dict[str, str] | None = None,
+    reference: str | Path | None = None,
+    dissociate: bool = False,
+) -> Path:
+    """Clone a repository and return the path of the clone.
+
+    Raises:
+        GitError: If clone fails
+    """
+    args = ["clone"]
+
+    if branch:
+        args.extend(["--branch", branch])
+    if depth:
+        args.extend(["--depth", str(depth)])
+    if single_branch:
+        args.append("--single-branch")
+    if bare:
+        args.append("--bare")
+    if reference:
+        args.extend(["--reference-if-able", str(reference)])
+    if dissociate:
+        args.append("--dissociate")
+
+    args.append(url)
+
+    if path:
+        args.append(str(path))
+
+    await _run_git_command(args, check=True, env=env, timeout=NETWORK_TIMEOUT_SECONDS)
+
+    repo_path = Path(path) if path else Path(url.split("/")[-1].replace(".git", ""))
+    return repo_path.resolve()
@@ -7,6 +7,7 @@ All functions require explicit cwd parameter.
 """
 
 import os
+import re
 import shlex
 import subprocess
 from dataclasses import dataclass, field
@@ -42,6 +43,18 @@ class GitNotRepositoryError(GitError):
     pass
 
 
+class GitTimeoutError(GitError):
+    """Exception raised when a git command does not finish in time."""
+
+    command: str
+    timeout: float
+
+    def __init__(self, command: str, timeout: float):
+        self.command = command
+        self.timeout = timeout
+        super().__init__(f"Git command '{command}' timed out after {timeout:g}s")
+
+
 def _looks_like_not_a_repository(stderr: str) -> bool:
     lower = stderr.lower()
     return (
@@ -106,6 +119,17 @@ class GitRemote:
     push_url: str
 
 
+@dataclass
+class GitFileDiff:
+    """Line counts and patch of one file in a diff."""
+
+    path: str
+    added_lines: int
+    deleted_lines: int
+    patch: str
+    old_path: str | None = None
+
+
 def _run_git_command(
     command: list[str],
     cwd: str | Path | None = None,
@@ -690,9 +714,67 @@ def get_numstat(
         args.append("--cached")
 
     result = _run_git_command(args, cwd=cwd, check=True)
+    return _parse_numstat(result.stdout)
+
+
+_PATCH_HEADER = re.compile(r"^diff --(?:git|cc|combined) ", re.MULTILINE)
+
+
+def _parse_numstat_patch(output: str) -> list[GitFileDiff]:
+    """Parse `git diff --numstat -z -p` output into per-file diffs.
+
+    The NUL-separated numstat records come first (renames as an empty path followed
+    by the old and new paths), then the patches in the same order.
+    """
+    stats, _, patch_text = output.partition("\x00\x00")
+    records = stats.split("\x00")
+    starts = [m.start() for m in _PATCH_HEADER.finditer(patch_text)]
+    patches = [
+        patch_text[start:end]
+        for start, end in zip(starts, [*starts[1:], len(patch_text)])
+    ]
 
+    diffs: list[GitFileDiff] = []
+    i = 0
+    while i < len(records):
+        parts = records[i].split("\t", 2)
+        i += 1
+        if len(parts) < 3:
+            continue
+        path, old_path = parts[2], None
+        if not path:
+            old_path = records[i] if i < len(records) else ""
+            path = records[i + 1] if i + 1 < len(records) else ""
+            i += 2
+        try:
+            added = int(parts[0]) if parts[0] != "-" else 0
+            deleted = int(parts[1]) if parts[1] != "-" else 0
+        except ValueError:
+            continue
+        diffs.append(
+            GitFileDiff(
+                path=path,
+                added_lines=added,
+                deleted_lines=deleted,
+                patch="",
+                old_path=old_path,
+            )
+        )
+
+    if len(patches) == len(diffs):
+        for file_diff, patch in zip(diffs, patches):
+            file_diff.patch = patch
+    else:
+        # Unexpected layout (e.g. unmerged entries): match on the patch header.
+        for file_diff in diffs:
+            header = f"diff --git a/{file_diff.old_path or file_diff.path} b/{file_diff.path}\n"
+            file_diff.patch = next((p for p in patches if p.startswith(header)), "")
+    return diffs
+
+
+def _parse_numstat(output: str) -> dict[str, tuple[int, int]]:
     numstat = {}
-    for line in result.stdout.strip().split("\n"):
+    for line in output.strip().split("\n"):
         if not line:
             continue
         parts = line.split("\t")
@@ -906,10 +988,13 @@ def list_remotes(cwd: str | Path | None = None) -> list[GitRemote]:
         GitNotRepositoryError: If not a git repository
     """
     result = _run_git_command(["remote", "-v"], cwd=cwd, check=True)
+    return _parse_remotes(result.stdout)
+
 
+def _parse_remotes(output: str) -> list[GitRemote]:
     remotes: dict[str, GitRemote] = {}
 
-    for line in result.stdout.splitlines():
+    for line in output.splitlines():
         parts = line.split()
         if len(parts) >= 3:
             name = parts[0]
@@ -1089,6 +1174,8 @@ def clone(
     single_branch: bool = False,
     bare: bool = False,
     env: dict[str, str] | None = None,
+    reference: str | Path | None = None,
+    dissociate: bool = False,
 ) -> Path:
     """
     Clone a repository.
@@ -1100,6 +1187,8 @@ def clone(
         depth: Number of commits to fetch (shallow clone)
         single_branch: If True, clone only one branch
         bare: If True, create a bare repository
+        reference: Local repository to borrow objects from (skipped if missing)
+        dissociate: If True, copy borrowed objects so the clone is self-contained
 
     Returns:
         Path: Path to the cloned repository
@@ -1117,6 +1206,10 @@ def clone(
         args.append("--single-branch")
     if bare:
         args.append("--bare")
+    if reference:
+        args.extend(["--reference-if-able", str(reference)])
+    if dissociate:
+        args.append("--dissociate")
 
     args.append(url)
 
@@ -0,0 +1,62 @@
+from typing import Any
+
+from app.schemas.callback import AgentStateDelta, FileChangeKey
+
+
+def _file_key(change: dict[str, Any]) -> tuple[str, str]:
+    return change.get("path") or "", change.get("status") or ""
+
+
+def diff_state(
+    previous: dict[str, Any], current: dict[str, Any], base_seq: int
+) -> AgentStateDelta | None:
+    """Delta turning the JSON-dumped `previous` state into `current`.
+
+    Returns None when nothing changed.
+    """
+    delta = AgentStateDelta(base_seq=base_seq)
+
+    for key, value in current.items():
+        if key == "mcp_status":
+            before = {m.get("server_name"): m for m in previous.get(key) or []}
+            after = {m.get("server_name"): m for m in value or []}
+            delta.mcp_upserts = [
+                m for name, m in after.items() if before.get(name) != m
+            ]
+            delta.mcp_removed = [name for name in before if name not in after]
+        elif key == "workspace_state":
+            prev_ws = previous.get(key)
+            if value is None:
+                if prev_ws is not None:
+                    delta.fields[key] = None
+                continue
+            header = {k: v for k, v in value.items() if k != "file_changes"}
+            prev_header = (
+                {k: v for k, v in prev_ws.items() if k != "file_changes"}
+                if prev_ws is not None
+                else None
+            )
+            if header != prev_header:
+                delta.fields[key] = header
+            before = {
+                _file_key(c): c for c in (prev_ws or {}).get("file_changes") or []
+            }
+            after = {_file_key(c): c for c in value.get("file_changes") or []}
+            delta.file_upserts = [c for k, c in after.items() if before.get(k) != c]
+            delta.file_removed = [
+                FileChangeKey(path=path, status=status)
+                for path, status in before
+                if (path, status) not in after
+            ]
+        elif previous.get(key) != value:
+            delta.fields[key] = value
+
+    if not (
+        delta.fields
+        or delta.mcp_upserts
+        or delta.mcp_removed
+        or delta.file_upserts
+        or delta.file_removed
+    ):
+        return None
+    return delta
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+import app.core.callback_outbox as outbox_module
+from app.core.callback import (
+    CallbackSender,
+    _for_adoption,
+    adopt_outboxes,
+    replay_outbox,
+)
+from app.core.callback_outbox import CallbackOutbox, claim_outbox
+from app.schemas.callback import AgentCallbackRequest
+from app.schemas.enums import CallbackStatus
+from app.schemas.state import AgentCurrentState
+
+
+@pytest.fixture(autouse=True)
+def outbox_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CALLBACK_OUTBOX_DIR", str(tmp_path))
+    monkeypatch.setattr(outbox_module, "_claimed_paths", set())
+    return tmp_path
+
+
+def _report(callback_id: str, status=CallbackStatus.RUNNING, **fields):
+    fields.setdefault("progress", 0)
+    return AgentCallbackRequest(
+        session_id="s1", status=status, callback_id=callback_id, **fields
+    )
+
+
+def _write(run_id: str, *reports: AgentCallbackRequest) -> CallbackOutbox:
+    async def put() -> CallbackOutbox:
+        outbox = CallbackOutbox.create("s1", "http://manager/callback", run_id)
+        for report in reports:
+            await outbox.put(report)
+        return outbox
+
+    outbox = asyncio.run(put())
+    outbox_module.release_outbox(outbox.path)
+    return outbox
+
+
+class RecordingClient:
+    def __init__(self, accept: int | None = None) -> None:
+        self.accept = accept
+        self.sent: list[AgentCallbackRequest] = []
+
+    async def send(self, report: AgentCallbackRequest) -> bool:
+        return bool(await self.send_batch([report]))
+
+    async def send_batch(self, reports: list[AgentCallbackRequest]) -> int:
+        applied = reports if self.accept is None else reports[: self.accept]
+        self.sent.extend(applied)
+        return len(applied)
+
+
+def test_load_returns_reports_that_were_put_but_not_acked():
+    outbox = _write("run-1", _report("a"), _report("b"), _report("c"))
+    asyncio.run(outbox.ack(["a", "c"]))
+
+    loaded, reports = CallbackOutbox.load(outbox.path)
+
+    assert [r.callback_id for r in reports] == ["b"]
+    assert loaded.callback_url == "http://manager/callback"
+    assert loaded.run_id == "run-1"
+    assert loaded.pending_count == 1
+
+
+def test_load_ignores_a_torn_last_line():
+    outbox = _write("run-1", _report("a"))
+    with open(outbox.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "ack", "ids": ["a"')
+
+    _, reports = CallbackOutbox.load(outbox.path)
+
+    assert [r.callback_id for r in reports] == ["a"]
+
+
+def test_adoption_keeps_the_outcome_of_another_run():
+    terminal = _report(
+        "t",
+        status=CallbackStatus.COMPLETED,
+        state_patch=AgentCurrentState(),
+        state_seq=9,
+    )
+
+    adopted = _for_adoption(terminal, "run-1", same_run=False)
+
+    assert adopted.status == CallbackStatus.COMPLETED
+    assert adopted.run_id == "run-1"
+    assert adopted.state_patch is None and adopted.state_seq is None
+
+
+def test_adoption_downgrades_an_outcome_it_cannot_attribute():
+    terminal = _report("t", status=CallbackStatus.FAILED, error_message="boom")
+
+    same_run = _for_adoption(terminal, "run-1", same_run=True)
+    unknown_run = _for_adoption(terminal, None, same_run=False)
+
+    assert same_run.status == CallbackStatus.RUNNING
+    assert same_run.error_message is None
+    # Without a message there is nothing left worth sending.
+    assert unknown_run is None
+
+
+def test_adoption_drops_stateless_progress_of_other_runs():
+    assert _for_adoption(_report("p"), "run-1", same_run=False) is None
+    message = _for_adoption(
+        _report("m", new_message={"text": "hi"}), "run-1", same_run=False
+    )
+    assert message is not None and message.run_id == "run-1"
+
+
+def test_adopt_outboxes_queues_left_behind_reports_and_skips_claimed_files():
+    left = _write("run-1", _report("m", new_message={"text": "hi"}))
+    busy = _write("run-2", _report("x", new_message={"text": "busy"}))
+    claim_outbox(busy.path)
+
+    async def run() -> tuple[int, list[str]]:
+        client = RecordingClient()
+        sender = CallbackSender(client)
+        adopted = await adopt_outboxes(sender, "s1", "run-3")
+        await sender.close()
+        return adopted, [r.callback_id for r in client.sent]
+
+    adopted, sent = asyncio.run(run())
+
+    assert (adopted, sent) == (1, ["m"])
+    assert not left.path.exists()
+    assert busy.path.exists()
+
+
+def test_replay_delivers_in_order_and_resumes_after_a_failure():
+    outbox = _write(
+        "run-1",
+        _report("a", new_message={"n": 1}),
+        _report("b", state_patch=AgentCurrentState(), state_seq=4),
+        _report("c", status=CallbackStatus.COMPLETED),
+    )
+
+    partial = RecordingClient(accept=1)
+    assert asyncio.run(replay_outbox(outbox.path, partial, batch_size=2)) is False
+    assert [r.callback_id for r in partial.sent] == ["a"]
+
+    rest = RecordingClient()
+    assert asyncio.run(replay_outbox(outbox.path, rest)) is True
+    assert [r.callback_id for r in rest.sent] == ["b", "c"]
+    # Replayed as recorded: state and outcome included, tagged with the run.
+    assert rest.sent[0].state_seq == 4
+    assert rest.sent[1].status == CallbackStatus.COMPLETED
+    assert {r.run_id for r in rest.sent} == {"run-1"}
+    assert not outbox.path.exists()
@@ -0,0 +1,79 @@
+import asyncio
+
+from app.core.callback import CallbackSender, coalesce_reports
+from app.schemas.callback import AgentCallbackRequest
+from app.schemas.enums import CallbackStatus
+from app.schemas.state import AgentCurrentState
+
+
+def _report(status=CallbackStatus.RUNNING, **fields) -> AgentCallbackRequest:
+    fields.setdefault("progress", 0)
+    return AgentCallbackRequest(session_id="s1", status=status, **fields)
+
+
+def test_coalesce_drops_progress_only_reports_superseded_by_later_ones():
+    progress = _report(progress=10)
+    message = _report(new_message={"text": "hi"})
+    state = _report(state_patch=AgentCurrentState())
+    latest = _report(progress=30)
+
+    assert coalesce_reports([progress, message, _report(), state, latest]) == [
+        message,
+        state,
+        latest,
+    ]
+
+
+def test_coalesce_keeps_the_last_report_and_terminal_reports():
+    terminal = _report(status=CallbackStatus.COMPLETED)
+    last = _report(progress=50)
+
+    assert coalesce_reports([terminal, last]) == [terminal, last]
+    assert coalesce_reports([last]) == [last]
+
+
+class FlakyClient:
+    """Fails the first `failures` requests, then applies everything it gets."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.delivered: list[str] = []
+
+    async def _attempt(self, reports: list[AgentCallbackRequest]) -> int:
+        if self.failures:
+            self.failures -= 1
+            return 0
+        self.delivered.extend(r.callback_id for r in reports)
+        return len(reports)
+
+    async def send(self, report: AgentCallbackRequest) -> bool:
+        return bool(await self._attempt([report]))
+
+    async def send_batch(self, reports: list[AgentCallbackRequest]) -> int:
+        return await self._attempt(reports)
+
+
+def test_undelivered_reports_are_retried_before_newer_ones():
+    async def run() -> tuple[list[str], list[str], int]:
+        client = FlakyClient(failures=5)
+        resyncs = 0
+
+        def on_failure() -> None:
+            nonlocal resyncs
+            resyncs += 1
+
+        sender = CallbackSender(
+            client, max_attempts=2, max_batch_size=1, on_failure=on_failure
+        )
+        sender.retry_base_seconds = 0
+        reports = [_report(new_message={"n": i}) for i in range(3)]
+        for report in reports:
+            await sender.submit(report)
+        await asyncio.wait_for(sender.close(), timeout=5)
+        return client.delivered, [r.callback_id for r in reports], resyncs
+
+    delivered, submitted, resyncs = asyncio.run(run())
+
+    # More failures than max_attempts: nothing is dropped and order is kept.
+    assert delivered == submitted
+    assert resyncs == 5
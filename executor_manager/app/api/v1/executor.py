@@ -8,6 +8,7 @@ from app.schemas.task import (
     TaskCancelRequest,
 )
 from app.scheduler.task_dispatcher import TaskDispatcher
+from app.services.config_cache import get_config_cache
 
 router = APIRouter(prefix="/executor", tags=["executor"])
 
@@ -59,5 +60,6 @@ async def get_executor_load() -> JSONResponse:
     """
     container_pool = TaskDispatcher.get_container_pool()
     stats = container_pool.get_container_stats()
+    stats["config_cache"] = get_config_cache().get_stats()
 
     return Response.success(data=stats)
@@ -1,21 +1,117 @@
-from fastapi import APIRouter, Query
+import mimetypes
+import os
+import zlib
+from collections.abc import Iterator
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import APIRouter, Query, Request
+from fastapi import Response as HTTPResponse
 from fastapi.responses import FileResponse
 from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
 from app.schemas.response import Response, ResponseSchema
-from app.schemas.workspace import FileNode
+from app.schemas.workspace import FileNode, FileTreePage
+from app.services.git_mirror_cache import get_git_mirror_cache
+from app.services.staging_cache import get_staging_cache
 from app.services.workspace_manager import WorkspaceManager
 
 router = APIRouter(prefix="/workspace", tags=["workspace"])
 workspace_manager = WorkspaceManager()
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(etag: str, headers: dict[str, str] | None = None) -> HTTPResponse:
+    return HTTPResponse(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": "no-cache", **(headers or {})},
+    )
+
+
+# Text-like types worth compressing on the fly; everything else is sent as-is.
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+_COMPRESS_MIN_BYTES = 1024
+_COMPRESS_CHUNK_BYTES = 64 * 1024
+
+
+def _file_etag(stat_result: os.stat_result) -> str:
+    """Strong ETag from inode, mtime (ns) and size; any rewrite changes it."""
+    return (
+        f'"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    )
+
+
+def _not_modified_since(request: Request, stat_result: os.stat_result) -> bool:
+    """If-Modified-Since check; ignored when If-None-Match is present (RFC 9110)."""
+    header = request.headers.get("if-modified-since")
+    if not header or request.headers.get("if-none-match"):
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(stat_result.st_mtime) <= since
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.replace(" ", "").lower().removeprefix("q=")
+            try:
+                return not params or float(q) > 0
+            except ValueError:
+                return True
+    return False
+
+
+def _gzip_file(path: Path) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    with path.open("rb") as f:
+        while chunk := f.read(_COMPRESS_CHUNK_BYTES):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.flush()
+
+
+def _inline_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"inline; filename*=utf-8''{quoted}"
+    return f'inline; filename="{filename}"'
+
+
 @router.get("/stats", response_model=ResponseSchema[dict])
 async def get_workspace_stats() -> JSONResponse:
     """Get workspace disk usage statistics."""
     stats = workspace_manager.get_disk_usage()
+    staging_cache = get_staging_cache()
+    if staging_cache is not None:
+        stats["staging_cache"] = staging_cache.get_stats()
+    git_mirror_cache = get_git_mirror_cache()
+    if git_mirror_cache is not None:
+        stats["git_mirror_cache"] = git_mirror_cache.get_stats()
     return Response.success(data=stats)
 
 
@@ -26,6 +122,13 @@ async def get_user_workspaces(user_id: str) -> JSONResponse:
     return Response.success(data=workspaces)
 
 
+@router.get("/users/{user_id}/usage", response_model=ResponseSchema[dict])
+async def get_user_usage(user_id: str) -> JSONResponse:
+    """Get recorded disk usage of a user's workspaces."""
+    usage = workspace_manager.get_user_usage(user_id)
+    return Response.success(data=usage)
+
+
 @router.post("/archive/{user_id}/{session_id}", response_model=ResponseSchema[dict])
 async def archive_workspace(
     user_id: str,
@@ -74,29 +177,120 @@ async def delete_workspace(
     "/files/{user_id}/{session_id}",
     response_model=ResponseSchema[list[FileNode]],
 )
-async def list_workspace_files(user_id: str, session_id: str) -> JSONResponse:
-    """List workspace files for a session."""
-    files = workspace_manager.list_workspace_files(
+async def list_workspace_files(
+    request: Request, user_id: str, session_id: str
+) -> HTTPResponse:
+    """List workspace files for a session.
+
+    Honors If-None-Match: an unchanged tree returns 304 without a body.
+    """
+    files, etag = workspace_manager.get_workspace_file_tree(
         user_id=user_id, session_id=session_id
     )
-    return Response.success(data=files)
+    if etag is None:
+        return Response.success(data=files)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    response = Response.success(data=files)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@router.get(
+    "/files/{user_id}/{session_id}/children",
+    response_model=ResponseSchema[FileTreePage],
+)
+async def list_workspace_dir(
+    request: Request,
+    user_id: str,
+    session_id: str,
+    path: str = Query(default="/", description="Directory within the workspace"),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+) -> HTTPResponse:
+    """List one workspace directory page for lazy tree expansion."""
+    try:
+        page = workspace_manager.list_workspace_dir(
+            user_id=user_id,
+            session_id=session_id,
+            dir_path=path,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise AppException(error_code=ErrorCode.BAD_REQUEST, message=str(exc))
+    if page is None:
+        raise AppException(error_code=ErrorCode.WORKSPACE_NOT_FOUND)
+    if _etag_matches(request, page["etag"]):
+        return _not_modified(page["etag"])
+    response = Response.success(data=page)
+    response.headers["ETag"] = page["etag"]
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @router.get("/file/{user_id}/{session_id}")
 async def get_workspace_file(
+    request: Request,
     user_id: str,
     session_id: str,
     path: str = Query(..., description="File path within the workspace"),
-) -> FileResponse:
-    """Serve a single file from workspace for preview/download."""
+) -> HTTPResponse:
+    """Serve a single file from workspace for preview/download.
+
+    Supports conditional requests (If-None-Match / If-Modified-Since -> 304) and byte
+    Range / If-Range requests. Full responses of text-like files are gzip-compressed
+    on the fly when the client accepts it (WORKSPACE_FILE_COMPRESSION_ENABLED).
+    """
     file_path = workspace_manager.resolve_workspace_file(
         user_id=user_id, session_id=session_id, file_path=path
     )
     if not file_path:
         raise AppException(error_code=ErrorCode.WORKSPACE_NOT_FOUND)
+    try:
+        stat_result = file_path.stat()
+    except OSError:
+        raise AppException(error_code=ErrorCode.WORKSPACE_NOT_FOUND)
+
+    media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+    etag = _file_etag(stat_result)
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    compress = (
+        get_settings().workspace_file_compression_enabled
+        and "range" not in request.headers
+        and media_type.startswith(_COMPRESSIBLE_TYPES)
+        and stat_result.st_size >= _COMPRESS_MIN_BYTES
+        and _accepts_gzip(request)
+    )
+    if compress:
+        # The compressed representation has its own validator.
+        etag = f'{etag[:-1]}-gzip"'
+
+    if _etag_matches(request, etag) or _not_modified_since(request, stat_result):
+        return _not_modified(etag, {**headers, "Last-Modified": last_modified})
+
+    if compress:
+        return StreamingResponse(
+            _gzip_file(file_path),
+            media_type=media_type,
+            headers={
+                **headers,
+                "ETag": etag,
+                "Last-Modified": last_modified,
+                "Content-Encoding": "gzip",
+                "Content-Disposition": _inline_disposition(file_path.name),
+            },
+        )
 
+    # FileResponse serves Range / If-Range requests (206 / 416) against these headers.
     return FileResponse(
         path=str(file_path),
         filename=file_path.name,
+        media_type=media_type,
+        stat_result=stat_result,
+        headers={**headers, "ETag": etag},
         content_disposition_type="inline",
     )
@@ -18,6 +18,7 @@ class ErrorCode(Enum):
     EXECUTOR_UNAVAILABLE = (30001, "Executor service unavailable")
     BACKEND_UNAVAILABLE = (30002, "Backend service unavailable")
     CALLBACK_FORWARD_FAILED = (30003, "Failed to forward callback to backend")
+    CALLBACK_REJECTED = (30004, "Callback rejected by backend")
     EXTERNAL_SERVICE_ERROR = (50201, "External service error")
     ENV_VAR_NOT_FOUND = (40001, "Environment variable not found")
     MCP_SERVER_NOT_FOUND = (40002, "MCP server not found")
@@ -32,6 +33,7 @@ class ErrorCode(Enum):
         22004,
         "Cannot delete persistent workspace without force flag",
     )
+    WORKSPACE_QUOTA_EXCEEDED = (22005, "Workspace disk quota exceeded")
 
     CONTAINER_START_FAILED = (31001, "Failed to start container")
     CONTAINER_NOT_FOUND = (31002, "Container not found")
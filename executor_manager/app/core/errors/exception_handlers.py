@@ -9,6 +9,9 @@ from app.schemas.response import Response
 
 logger = logging.getLogger(__name__)
 
+# Errors a client should retry; everything else maps to 400.
+_STATUS_CODES = {ErrorCode.CALLBACK_FORWARD_FAILED: 502}
+
 
 def setup_exception_handlers(app: FastAPI, *, debug: bool) -> None:
     @app.exception_handler(AppException)
@@ -19,7 +22,7 @@ def setup_exception_handlers(app: FastAPI, *, debug: bool) -> None:
             code=exc.code,
             message=exc.message,
             data=exc.details,
-            status_code=400,
+            status_code=_STATUS_CODES.get(exc.error_code, 400),
         )
 
     @app.exception_handler(HTTPException)
@@ -39,6 +39,30 @@ async def lifespan(app: FastAPI):
         pull_job_ids = register_pull_jobs(scheduler, pull_service, schedule_config)
         logger.info(f"Run pull service started (jobs={pull_job_ids})")
 
+    from app.scheduler.task_dispatcher import TaskDispatcher
+
+    # Standby containers of a crashed or restarted manager are never claimed.
+    try:
+        await TaskDispatcher.get_container_pool().sweep_orphaned_standby()
+    except Exception as exc:
+        logger.warning(f"Failed to sweep orphaned standby containers: {exc}")
+
+    warm_pool = None
+    if (
+        settings.executor_warm_pool_size > 0
+        or settings.executor_browser_warm_pool_size > 0
+    ):
+        logger.info("Starting executor warm pool...")
+        warm_pool = TaskDispatcher.get_container_pool()
+        warm_pool.ensure_warm_pool()
+        logger.info(
+            "Executor warm pool started",
+            extra={
+                "default_size": settings.executor_warm_pool_size,
+                "browser_size": settings.executor_browser_warm_pool_size,
+            },
+        )
+
     if settings.workspace_cleanup_enabled:
         from app.services.cleanup_service import CleanupService
 
@@ -46,6 +70,38 @@ async def lifespan(app: FastAPI):
         CleanupService(scheduler)
         logger.info("Workspace cleanup service initialized")
 
+    if settings.workspace_usage_reconcile_interval_minutes > 0:
+        from app.services.workspace_manager import WorkspaceManager
+
+        scheduler.add_job(
+            WorkspaceManager().reconcile_disk_usage,
+            trigger="interval",
+            minutes=settings.workspace_usage_reconcile_interval_minutes,
+            id="reconcile-workspace-usage",
+            replace_existing=True,
+        )
+        logger.info(
+            "Workspace usage reconciler scheduled",
+            extra={
+                "interval_minutes": settings.workspace_usage_reconcile_interval_minutes
+            },
+        )
+
+    if settings.workspace_export_gc_interval_hours > 0:
+        from app.services.callback_service import workspace_export_service
+
+        scheduler.add_job(
+            workspace_export_service.collect_garbage,
+            trigger="interval",
+            hours=settings.workspace_export_gc_interval_hours,
+            id="collect-workspace-exports",
+            replace_existing=True,
+        )
+        logger.info(
+            "Workspace export GC scheduled",
+            extra={"interval_hours": settings.workspace_export_gc_interval_hours},
+        )
+
     if settings.scheduled_tasks_enabled:
         from app.services.scheduled_task_dispatch_service import (
             ScheduledTaskDispatchService,
@@ -77,6 +133,18 @@ async def lifespan(app: FastAPI):
         await pull_service.shutdown()
         logger.info("Run pull service stopped")
 
+    if warm_pool:
+        logger.info("Stopping executor warm pool...")
+        with suppress(Exception):
+            await warm_pool.shutdown_warm_pool()
+        logger.info("Executor warm pool stopped")
+
     logger.info("Shutting down APScheduler...")
     scheduler.shutdown()
     logger.info("APScheduler shut down")
+
+    from app.core.http_client import get_http_client
+
+    with suppress(Exception):
+        await get_http_client().aclose()
+    logger.info("HTTP client pool closed")
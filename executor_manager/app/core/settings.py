@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,6 +21,39 @@ class Settings(BaseSettings):
     executor_url: str = Field(default="http://localhost:8080")
     callback_base_url: str = Field(default="http://localhost:8001")
 
+    # Shared HTTP client (Backend/Executor calls): keep-alive pool and retry policy.
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(
+        default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="HTTP_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    http_timeout_seconds: float = Field(default=5.0, alias="HTTP_TIMEOUT_SECONDS")
+    http_connect_timeout_seconds: float = Field(
+        default=5.0, alias="HTTP_CONNECT_TIMEOUT_SECONDS"
+    )
+    # Requires the optional `h2` package; falls back to HTTP/1.1 when missing.
+    http2_enabled: bool = Field(default=False, alias="HTTP2_ENABLED")
+    http_retry_max_attempts: int = Field(default=3, alias="HTTP_RETRY_MAX_ATTEMPTS")
+    http_retry_backoff_seconds: float = Field(
+        default=0.2, alias="HTTP_RETRY_BACKOFF_SECONDS"
+    )
+    http_retry_backoff_max_seconds: float = Field(
+        default=2.0, alias="HTTP_RETRY_BACKOFF_MAX_SECONDS"
+    )
+    # Executor containers get the connect timeout, keep-alive expiry, HTTP/2 and retry
+    # settings above, plus their own pool size and request timeout.
+    executor_http_max_connections: int = Field(
+        default=20, alias="EXECUTOR_HTTP_MAX_CONNECTIONS"
+    )
+    executor_http_max_keepalive_connections: int = Field(
+        default=10, alias="EXECUTOR_HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    executor_http_timeout_seconds: float = Field(
+        default=30.0, alias="EXECUTOR_HTTP_TIMEOUT_SECONDS"
+    )
+
     # Scheduler configuration
     max_concurrent_tasks: int = Field(default=5)
     task_timeout_seconds: int = Field(default=3600)
@@ -38,6 +72,18 @@ class Settings(BaseSettings):
     # include staging skills/attachments + spawning the executor container, which may take
     # longer than 30s on slow networks or large repos.
     task_claim_lease_seconds: int = Field(default=180, alias="TASK_CLAIM_LEASE_SECONDS")
+    # Long-poll the backend so queued runs are claimed as soon as they are enqueued.
+    # While the long-poll is healthy, interval pulls only run every
+    # TASK_PULL_SAFETY_INTERVAL_SECONDS as a safety net.
+    task_pull_long_poll_enabled: bool = Field(
+        default=True, alias="TASK_PULL_LONG_POLL_ENABLED"
+    )
+    task_pull_long_poll_seconds: int = Field(
+        default=25, alias="TASK_PULL_LONG_POLL_SECONDS"
+    )
+    task_pull_safety_interval_seconds: int = Field(
+        default=30, alias="TASK_PULL_SAFETY_INTERVAL_SECONDS"
+    )
 
     # Optional schedule config file (TOML/JSON). When provided, it becomes the source of truth.
     schedule_config_path: str | None = Field(default=None, alias="SCHEDULE_CONFIG_PATH")
@@ -101,6 +147,16 @@ class Settings(BaseSettings):
     executor_browser_image: str | None = Field(
         default="ghcr.io/poco-ai/poco-executor:full", alias="EXECUTOR_BROWSER_IMAGE"
     )
+    # Docker SDK calls are blocking; they run on a dedicated thread pool of this size so
+    # container lifecycle work for different sessions overlaps without stalling the loop.
+    docker_api_max_workers: int = Field(default=16, alias="DOCKER_API_MAX_WORKERS")
+    # Warm pool: number of idle, health-checked executor containers kept booted per image.
+    # Ephemeral runs claim a standby container instead of paying `docker run` + readiness,
+    # and the pool is refilled in the background. 0 disables the warm pool for that image.
+    executor_warm_pool_size: int = Field(default=0, alias="EXECUTOR_WARM_POOL_SIZE")
+    executor_browser_warm_pool_size: int = Field(
+        default=0, alias="EXECUTOR_BROWSER_WARM_POOL_SIZE"
+    )
     # Default desktop viewport used by the Playwright MCP inside executor containers.
     poco_browser_viewport_size: str = Field(
         default="1366x768", alias="POCO_BROWSER_VIEWPORT_SIZE"
@@ -126,9 +182,91 @@ class Settings(BaseSettings):
         default=True, alias="WORKSPACE_ARCHIVE_ENABLED"
     )
     workspace_archive_days: int = Field(default=7, alias="WORKSPACE_ARCHIVE_DAYS")
+    # "zstd" is opt-in: it needs the `zstandard` package (not a default dependency) and
+    # falls back to gzip without it.
+    workspace_archive_codec: Literal["zstd", "gzip"] = Field(
+        default="gzip", alias="WORKSPACE_ARCHIVE_CODEC"
+    )
+    workspace_archive_compression_level: int = Field(
+        default=3, alias="WORKSPACE_ARCHIVE_COMPRESSION_LEVEL"
+    )
+    # Cleanup runs on its own thread pool at lowered CPU/IO priority (nice value), with
+    # archive reads capped at WORKSPACE_CLEANUP_IO_LIMIT_MB_S across workers (0 = no cap).
+    workspace_cleanup_max_workers: int = Field(
+        default=4, alias="WORKSPACE_CLEANUP_MAX_WORKERS"
+    )
+    workspace_cleanup_nice: int = Field(default=10, alias="WORKSPACE_CLEANUP_NICE")
+    workspace_cleanup_io_limit_mb_s: float = Field(
+        default=64, alias="WORKSPACE_CLEANUP_IO_LIMIT_MB_S"
+    )
     workspace_ignore_dot_files: bool = Field(
         default=True, alias="WORKSPACE_IGNORE_DOT_FILES"
     )
+    # Directory listings cached for /workspace/files (validated by directory mtime).
+    workspace_file_tree_cache_max_dirs: int = Field(
+        default=20000, alias="WORKSPACE_FILE_TREE_CACHE_MAX_DIRS"
+    )
+    # Gzip text-like workspace files served by /workspace/file when the client accepts it.
+    workspace_file_compression_enabled: bool = Field(
+        default=True, alias="WORKSPACE_FILE_COMPRESSION_ENABLED"
+    )
+    # Per-user cap on recorded workspace disk usage (active + archived), checked before
+    # dispatch; 0 disables the check.
+    workspace_user_quota_bytes: int = Field(
+        default=0, alias="WORKSPACE_USER_QUOTA_BYTES"
+    )
+    # How often recorded workspace sizes are re-measured to correct drift; 0 disables.
+    workspace_usage_reconcile_interval_minutes: int = Field(
+        default=60, alias="WORKSPACE_USAGE_RECONCILE_INTERVAL_MINUTES"
+    )
+    # Content-addressed export: "user" / "global" store files as sha256 blobs shared by
+    # all sessions of a user / all users; "none" keeps per-session file keys.
+    workspace_export_dedup_scope: Literal["none", "user", "global"] = Field(
+        default="user", alias="WORKSPACE_EXPORT_DEDUP_SCOPE"
+    )
+    # Export garbage collection: exports of deleted sessions are removed, then blobs no
+    # remaining manifest references are deleted once older than the grace period (which
+    # covers exports still in flight). 0 disables the job.
+    workspace_export_gc_interval_hours: int = Field(
+        default=24, alias="WORKSPACE_EXPORT_GC_INTERVAL_HOURS"
+    )
+    workspace_export_gc_grace_hours: int = Field(
+        default=24, alias="WORKSPACE_EXPORT_GC_GRACE_HOURS"
+    )
+    # Node-local, content-addressed cache for staged skills/plugins (keyed by S3 key + ETag).
+    # Defaults to `<WORKSPACE_ROOT>/cache/staging` so staged copies can be reflinks.
+    staging_cache_enabled: bool = Field(default=True, alias="STAGING_CACHE_ENABLED")
+    staging_cache_dir: str | None = Field(default=None, alias="STAGING_CACHE_DIR")
+    staging_cache_max_bytes: int = Field(
+        default=2 * 1024**3, alias="STAGING_CACHE_MAX_BYTES"
+    )
+    # Node-level bare mirrors of public git repositories used by input repo clones and
+    # mounted read-only into executor containers as a clone reference.
+    # Defaults to `<WORKSPACE_ROOT>/cache/git`.
+    git_mirror_cache_enabled: bool = Field(
+        default=True, alias="GIT_MIRROR_CACHE_ENABLED"
+    )
+    git_mirror_cache_dir: str | None = Field(default=None, alias="GIT_MIRROR_CACHE_DIR")
+    git_mirror_cache_max_bytes: int = Field(
+        default=10 * 1024**3, alias="GIT_MIRROR_CACHE_MAX_BYTES"
+    )
+    git_mirror_fetch_interval_seconds: int = Field(
+        default=60, alias="GIT_MIRROR_FETCH_INTERVAL_SECONDS"
+    )
+    git_mirror_container_path: str = Field(
+        default="/opt/git-mirrors", alias="GIT_MIRROR_CONTAINER_PATH"
+    )
+    # Per-user cache of backend-resolved run config (MCP, skills, plugins, subagents,
+    # slash commands, CLAUDE.md, env map), invalidated by the backend config version.
+    resolved_config_cache_enabled: bool = Field(
+        default=True, alias="RESOLVED_CONFIG_CACHE_ENABLED"
+    )
+    resolved_config_cache_ttl_seconds: int = Field(
+        default=300, alias="RESOLVED_CONFIG_CACHE_TTL_SECONDS"
+    )
+    resolved_config_cache_max_users: int = Field(
+        default=1000, alias="RESOLVED_CONFIG_CACHE_MAX_USERS"
+    )
     s3_endpoint: str | None = Field(default=None, alias="S3_ENDPOINT")
     s3_access_key: str | None = Field(default=None, alias="S3_ACCESS_KEY")
     s3_secret_key: str | None = Field(default=None, alias="S3_SECRET_KEY")
@@ -140,6 +278,22 @@ class Settings(BaseSettings):
     )
     s3_read_timeout_seconds: int = Field(default=60, alias="S3_READ_TIMEOUT_SECONDS")
     s3_max_attempts: int = Field(default=3, alias="S3_MAX_ATTEMPTS")
+    s3_max_pool_connections: int = Field(default=32, alias="S3_MAX_POOL_CONNECTIONS")
+    # Worker threads per prefix/batch download (skills, plugins, attachments).
+    s3_download_max_workers: int = Field(default=16, alias="S3_DOWNLOAD_MAX_WORKERS")
+    # Worker threads per workspace export; large files additionally upload their
+    # multipart parts with S3_MULTIPART_MAX_CONCURRENCY threads each.
+    s3_upload_max_workers: int = Field(default=16, alias="S3_UPLOAD_MAX_WORKERS")
+    s3_upload_max_attempts: int = Field(default=3, alias="S3_UPLOAD_MAX_ATTEMPTS")
+    s3_multipart_threshold_mb: int = Field(
+        default=16, alias="S3_MULTIPART_THRESHOLD_MB"
+    )
+    s3_multipart_chunksize_mb: int = Field(
+        default=16, alias="S3_MULTIPART_CHUNKSIZE_MB"
+    )
+    s3_multipart_max_concurrency: int = Field(
+        default=4, alias="S3_MULTIPART_MAX_CONCURRENCY"
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from app.core.settings import get_settings
 from app.scheduler.pull_schedule_config import (
     IntervalPullRule,
     PullScheduleConfig,
@@ -47,6 +48,9 @@ def register_pull_jobs(
                 next_run_time=now_utc if rule.start_immediately else None,
             )
             job_ids.append(job_id)
+            if rule.long_poll and get_settings().task_pull_long_poll_enabled:
+                # The interval job stays registered as a safety net.
+                pull_service.start_wake_loop(rule.id, rule.schedule_modes)
             continue
 
         if isinstance(rule, WindowPullRule):
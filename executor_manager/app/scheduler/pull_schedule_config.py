@@ -16,6 +16,8 @@ class IntervalPullRule(BaseModel):
     schedule_modes: list[str] = Field(default_factory=list)
     seconds: int = 2
     start_immediately: bool = True
+    # Also long-poll the backend for this rule (see TASK_PULL_LONG_POLL_ENABLED).
+    long_poll: bool = True
 
     @field_validator("id")
     @classmethod
@@ -1,5 +1,6 @@
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -67,17 +68,40 @@ class AgentCurrentState(BaseModel):
     current_step: str | None = None
 
 
+class FileChangeKey(BaseModel):
+    """Identifies a file change (a path can be both modified and staged)."""
+
+    path: str
+    status: str
+
+
+class AgentStateDelta(BaseModel):
+    """Agent state changes since the callback whose state_seq is `base_seq`."""
+
+    base_seq: int
+    fields: dict[str, Any] = Field(default_factory=dict)
+    mcp_upserts: list[McpStatus] = Field(default_factory=list)
+    mcp_removed: list[str] = Field(default_factory=list)
+    file_upserts: list[FileChange] = Field(default_factory=list)
+    file_removed: list[FileChangeKey] = Field(default_factory=list)
+
+
 class AgentCallbackRequest(BaseModel):
     """Agent execution callback request."""
 
     session_id: str
-    time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    time: datetime = Field(default_factory=lambda: datetime.now(UTC))
     status: CallbackStatus
     progress: int
     error_message: str | None = None
     new_message: object | None = None
     state_patch: AgentCurrentState | None = None
+    state_delta: AgentStateDelta | None = None
+    state_seq: int | None = None
     sdk_session_id: str | None = None
+    # Idempotency key assigned by the executor; forwarded for backend dedupe.
+    callback_id: str | None = None
+    run_id: str | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
     workspace_archive_key: str | None = None
@@ -87,7 +111,27 @@ class AgentCallbackRequest(BaseModel):
 class CallbackReceiveResponse(BaseModel):
     """Callback receive response."""
 
-    status: str  # "received"
+    status: str  # "received", or "failed" when the backend did not apply it
     session_id: str
     callback_status: CallbackStatus
     progress: int
+    # The backend did not apply the callback's state: send a full snapshot above
+    # `state_seq` (the stored version) next.
+    resync_required: bool = False
+    state_seq: int | None = None
+
+
+class AgentCallbackBatchRequest(BaseModel):
+    """Several callbacks of one run, in order."""
+
+    callbacks: list[AgentCallbackRequest] = Field(min_length=1, max_length=500)
+
+
+class CallbackBatchReceiveResponse(BaseModel):
+    """Batch callback receive response.
+
+    One result per callback, in order; after the first "failed" one none were
+    applied, so the executor resends from there.
+    """
+
+    results: list[CallbackReceiveResponse]
@@ -97,3 +97,5 @@ class ContainerStatsResponse(BaseModel):
     persistent_containers: int
     ephemeral_containers: int
     containers: list[dict]
+    warm_pool: dict = Field(default_factory=dict)
+    config_cache: dict = Field(default_factory=dict)
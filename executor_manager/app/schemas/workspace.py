@@ -12,6 +12,13 @@ class FileNode(BaseModel):
     mimeType: str | None = None
 
 
+class FileTreePage(BaseModel):
+    path: str
+    entries: list[FileNode]
+    next_cursor: str | None = None
+    etag: str
+
+
 class WorkspaceExportResult(BaseModel):
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
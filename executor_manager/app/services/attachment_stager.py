@@ -9,6 +9,7 @@ from urllib.parse import urlparse
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.services.git_mirror_cache import get_git_mirror_cache
 from app.services.storage_service import S3StorageService
 from app.services.workspace_manager import WorkspaceManager
 
@@ -45,6 +46,8 @@ class AttachmentStager:
         inputs_root.mkdir(parents=True, exist_ok=True)
 
         staged: list[dict[str, Any]] = []
+        # File inputs are collected and downloaded in one parallel batch below.
+        file_downloads: list[tuple[str, str]] = []
         for item in inputs:
             if not isinstance(item, dict):
                 continue
@@ -66,27 +69,9 @@ class AttachmentStager:
                     rel_path = (
                         self._normalize_relative_path(name) or Path(str(s3_key)).name
                     )
-                destination = inputs_root / rel_path
-                destination.parent.mkdir(parents=True, exist_ok=True)
-                step_started = time.perf_counter()
-                self.storage_service.download_file(
-                    key=str(s3_key), destination=destination
-                )
-                logger.info(
-                    "timing",
-                    extra={
-                        "step": "input_stage_file_download",
-                        "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                        "user_id": user_id,
-                        "session_id": session_id,
-                        # "name" is reserved in LogRecord (logger name).
-                        "input_name": name or destination.name,
-                        "rel_path": rel_path,
-                        "s3_key": str(s3_key),
-                    },
-                )
+                file_downloads.append((str(s3_key), rel_path))
                 staged.append(
-                    self._build_staged(item, rel_path, name or destination.name)
+                    self._build_staged(item, rel_path, name or Path(rel_path).name)
                 )
                 continue
 
@@ -117,6 +102,23 @@ class AttachmentStager:
                 staged.append(self._build_staged(item, rel_path, name or repo_name))
                 continue
 
+        if file_downloads:
+            step_started = time.perf_counter()
+            summary = self.storage_service.download_objects(
+                objects=file_downloads, destination_dir=inputs_root
+            )
+            logger.info(
+                "timing",
+                extra={
+                    "step": "input_stage_file_download",
+                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "files": summary["files"],
+                    "bytes": summary["bytes"],
+                },
+            )
+
         logger.info(
             "timing",
             extra={
@@ -191,6 +193,12 @@ class AttachmentStager:
 
     @staticmethod
     def _clone_repo(repo_url: str, destination: Path, branch: str | None) -> None:
+        mirror_cache = get_git_mirror_cache()
+        if mirror_cache is not None and mirror_cache.clone(
+            repo_url, destination, branch=branch
+        ):
+            return
+
         args = ["git", "clone", "--depth", "1", "--single-branch"]
         if branch:
             args.extend(["--branch", branch])
@@ -1,8 +1,15 @@
 import asyncio
 import logging
+from collections import OrderedDict
 from datetime import datetime, timezone
 
-from app.schemas.callback import AgentCallbackRequest, CallbackReceiveResponse
+import httpx
+
+from app.schemas.callback import (
+    AgentCallbackRequest,
+    CallbackBatchReceiveResponse,
+    CallbackReceiveResponse,
+)
 from app.services.backend_client import BackendClient
 from app.services.workspace_export_service import (
     WorkspaceExportService,
@@ -11,6 +18,13 @@ from app.services.workspace_export_service import (
 
 logger = logging.getLogger(__name__)
 
+# Client errors that can succeed when retried.
+_RETRYABLE_CLIENT_ERRORS = frozenset({408, 425, 429})
+# Terminal callbacks whose side effects already ran, by callback_id (most recent
+# last). Executors resend callbacks whose acknowledgement they did not receive.
+_HANDLED_TERMINAL_IDS: OrderedDict[str, None] = OrderedDict()
+_HANDLED_TERMINAL_IDS_MAX = 10000
+
 
 backend_client = BackendClient()
 workspace_export_service = WorkspaceExportService()
@@ -114,23 +128,44 @@ class CallbackService:
         )
         return callback.model_copy(update={"state_patch": updated_state})
 
-    async def process_callback(
-        self, callback: AgentCallbackRequest
-    ) -> CallbackReceiveResponse:
-        """Process agent execution callback from executor.
-
-        Args:
-            callback: Callback data from executor
-
-        Returns:
-            CallbackReceiveResponse with acknowledgment
+    @classmethod
+    def _filter_state_delta(
+        cls, callback: AgentCallbackRequest
+    ) -> AgentCallbackRequest:
+        """Apply the state_patch visibility rules to a state delta.
 
-        Raises:
-            AppException: If callback forwarding to backend fails
+        Line totals are recomputed by the backend from the merged file list.
         """
-        from app.core.errors.error_codes import ErrorCode
-        from app.core.errors.exceptions import AppException
+        delta = callback.state_delta
+        if not delta:
+            return callback
+
+        mcp_upserts = [
+            m
+            for m in delta.mcp_upserts
+            if not cls._is_internal_mcp_server(m.server_name)
+        ]
+        file_upserts = [
+            fc
+            for fc in delta.file_upserts
+            if not cls._is_ignored_workspace_path(fc.path)
+        ]
+        if len(mcp_upserts) == len(delta.mcp_upserts) and len(file_upserts) == len(
+            delta.file_upserts
+        ):
+            return callback
+        return callback.model_copy(
+            update={
+                "state_delta": delta.model_copy(
+                    update={"mcp_upserts": mcp_upserts, "file_upserts": file_upserts}
+                )
+            }
+        )
 
+    def _prepare_callback(
+        self, callback: AgentCallbackRequest
+    ) -> tuple[AgentCallbackRequest, dict]:
+        """Log and filter a callback; return it with the payload for the backend."""
         # High-frequency callbacks: keep RUNNING as DEBUG; only completed/failed stay at INFO.
         summary_level = (
             logging.INFO
@@ -149,6 +184,7 @@ class CallbackService:
         )
 
         callback = self._filter_state_patch(callback)
+        callback = self._filter_state_delta(callback)
 
         if callback.state_patch:
             state = callback.state_patch
@@ -164,49 +200,195 @@ class CallbackService:
                     "todo_count": todo_count,
                     "mcp_count": mcp_count,
                     "file_change_count": file_count,
+                    "state_seq": callback.state_seq,
+                },
+            )
+        elif callback.state_delta:
+            delta = callback.state_delta
+            logger.debug(
+                "callback_state_delta_summary",
+                extra={
+                    "session_id": callback.session_id,
+                    "state_seq": callback.state_seq,
+                    "base_seq": delta.base_seq,
+                    "fields": sorted(delta.fields),
+                    "mcp_changes": len(delta.mcp_upserts) + len(delta.mcp_removed),
+                    "file_changes": len(delta.file_upserts) + len(delta.file_removed),
                 },
             )
 
-        try:
-            payload_model = callback
-            if callback.status in ["completed", "failed"]:
-                payload_model = callback.model_copy(
-                    update={"workspace_export_status": "pending"}
-                )
-            payload = payload_model.model_dump(mode="json")
-
-            # Forward callback to backend
-            await backend_client.forward_callback(payload)
+        payload_model = callback
+        if callback.status in ["completed", "failed"]:
+            payload_model = callback.model_copy(
+                update={"workspace_export_status": "pending"}
+            )
+        return callback, payload_model.model_dump(mode="json")
 
-            if callback.status in ["completed", "failed"]:
-                from app.scheduler.task_dispatcher import TaskDispatcher
+    async def _on_forwarded(
+        self, callback: AgentCallbackRequest, result: dict | None = None
+    ) -> None:
+        if callback.status in ["completed", "failed"]:
+            from app.scheduler.task_dispatcher import TaskDispatcher
 
+            if (result or {}).get("superseded"):
+                # A replayed outcome of an earlier run: the session's container and
+                # workspace belong to a later run now.
                 logger.info(
-                    "task_terminal_callback_received",
+                    "task_terminal_callback_superseded",
                     extra={
                         "session_id": callback.session_id,
+                        "run_id": callback.run_id,
                         "status": callback.status,
                     },
                 )
-                asyncio.create_task(self._export_and_forward(callback))
+                return
+
+            callback_id = callback.callback_id
+            if callback_id:
+                if callback_id in _HANDLED_TERMINAL_IDS:
+                    logger.info(
+                        "task_terminal_callback_duplicate",
+                        extra={
+                            "session_id": callback.session_id,
+                            "callback_id": callback_id,
+                        },
+                    )
+                    return
+                _HANDLED_TERMINAL_IDS[callback_id] = None
+                while len(_HANDLED_TERMINAL_IDS) > _HANDLED_TERMINAL_IDS_MAX:
+                    _HANDLED_TERMINAL_IDS.popitem(last=False)
+
+            logger.info(
+                "task_terminal_callback_received",
+                extra={
+                    "session_id": callback.session_id,
+                    "status": callback.status,
+                },
+            )
+            asyncio.create_task(self._export_and_forward(callback))
+            try:
                 await TaskDispatcher.on_task_complete(callback.session_id)
+            except Exception:
+                # Let the executor's retry run the side effects again.
+                if callback_id:
+                    _HANDLED_TERMINAL_IDS.pop(callback_id, None)
+                raise
+
+    @staticmethod
+    def _forward_error(exc: Exception, message: str) -> Exception:
+        """Error returned to the executor when forwarding failed.
 
-            return CallbackReceiveResponse(
-                status="received",
-                session_id=callback.session_id,
-                callback_status=callback.status,
-                progress=callback.progress,
+        A backend 4xx rejects the callback itself, so resending it is pointless;
+        any other failure is reported as retryable (502).
+        """
+        from app.core.errors.error_codes import ErrorCode
+        from app.core.errors.exceptions import AppException
+
+        if (
+            isinstance(exc, httpx.HTTPStatusError)
+            and exc.response.is_client_error
+            and exc.response.status_code not in _RETRYABLE_CLIENT_ERRORS
+        ):
+            return AppException(
+                error_code=ErrorCode.CALLBACK_REJECTED,
+                details={"status_code": exc.response.status_code},
             )
+        return AppException(
+            error_code=ErrorCode.CALLBACK_FORWARD_FAILED, message=message
+        )
 
-        except Exception:
+    @staticmethod
+    def _receive_response(
+        callback: AgentCallbackRequest,
+        status: str = "received",
+        result: dict | None = None,
+    ) -> CallbackReceiveResponse:
+        result = result or {}
+        return CallbackReceiveResponse(
+            status=status,
+            session_id=callback.session_id,
+            callback_status=callback.status,
+            progress=callback.progress,
+            resync_required=bool(result.get("resync_required")),
+            state_seq=result.get("state_seq"),
+        )
+
+    async def process_callback(
+        self, callback: AgentCallbackRequest
+    ) -> CallbackReceiveResponse:
+        """Process agent execution callback from executor.
+
+        Args:
+            callback: Callback data from executor
+
+        Returns:
+            CallbackReceiveResponse with acknowledgment
+
+        Raises:
+            AppException: If callback forwarding to backend fails
+        """
+        callback, payload = self._prepare_callback(callback)
+
+        try:
+            # Forward callback to backend
+            result = await backend_client.forward_callback(payload)
+            await self._on_forwarded(callback, result)
+            return self._receive_response(callback, result=result)
+
+        except Exception as exc:
             logger.exception(
                 "callback_forward_failed",
                 extra={"session_id": callback.session_id, "status": callback.status},
             )
-            raise AppException(
-                error_code=ErrorCode.CALLBACK_FORWARD_FAILED,
-                message="Failed to forward callback to backend",
+            raise self._forward_error(exc, "Failed to forward callback to backend")
+
+    async def process_callback_batch(
+        self, callbacks: list[AgentCallbackRequest]
+    ) -> CallbackBatchReceiveResponse:
+        """Process several callbacks of one run, forwarding them in one request.
+
+        Order is preserved end to end; the backend applies them sequentially and
+        stops at the first failure. Side effects only run for applied callbacks.
+
+        Raises:
+            AppException: If forwarding the batch to backend fails
+        """
+        prepared = [self._prepare_callback(callback) for callback in callbacks]
+
+        responses: list[CallbackReceiveResponse] = []
+        try:
+            results = await backend_client.forward_callback_batch(
+                [payload for _, payload in prepared]
+            )
+            for index, (callback, _) in enumerate(prepared):
+                result = results[index] if index < len(results) else {}
+                if not result.get("applied", True):
+                    responses.extend(
+                        self._receive_response(item, "failed")
+                        for item, _ in prepared[index:]
+                    )
+                    logger.warning(
+                        "callback_batch_partially_applied",
+                        extra={
+                            "session_id": callback.session_id,
+                            "applied": index,
+                            "count": len(prepared),
+                        },
+                    )
+                    break
+                await self._on_forwarded(callback, result)
+                responses.append(self._receive_response(callback, result=result))
+        except Exception as exc:
+            logger.exception(
+                "callback_batch_forward_failed",
+                extra={
+                    "session_id": callbacks[0].session_id,
+                    "count": len(callbacks),
+                },
             )
+            raise self._forward_error(exc, "Failed to forward callbacks to backend")
+
+        return CallbackBatchReceiveResponse(results=responses)
 
     async def _export_and_forward(self, callback: AgentCallbackRequest) -> None:
         try:
@@ -227,6 +409,7 @@ class CallbackService:
             progress=100 if callback.status == "completed" else callback.progress,
             error_message=callback.error_message,
             sdk_session_id=callback.sdk_session_id,
+            run_id=callback.run_id,
             workspace_files_prefix=result.workspace_files_prefix if result else None,
             workspace_manifest_key=result.workspace_manifest_key if result else None,
             workspace_archive_key=result.workspace_archive_key if result else None,
@@ -0,0 +1,164 @@
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from app.core.settings import get_settings
+from app.services.backend_client import BackendClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _UserEntry:
+    version: str
+    created_at: float
+    values: dict[Hashable, Any] = field(default_factory=dict)
+
+
+class ResolvedConfigCache:
+    """Per-user cache of backend-resolved run config.
+
+    Every lookup first reads the user's config version stamp from the backend (one
+    cheap call; concurrent lookups for the same user share it). Cached values are only
+    served while the stamp is unchanged and the entry is younger than the TTL; the
+    number of cached users is bounded with LRU eviction. When the stamp can't be read
+    (e.g. an older backend), lookups fall through to the backend uncached.
+    """
+
+    def __init__(
+        self,
+        *,
+        backend_client: BackendClient | None = None,
+        ttl_seconds: float,
+        max_users: int,
+        enabled: bool = True,
+    ) -> None:
+        self.backend_client = backend_client or BackendClient()
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_users = max(1, int(max_users))
+        self.enabled = enabled and self.ttl_seconds > 0
+
+        self._entries: OrderedDict[str, _UserEntry] = OrderedDict()
+        self._version_lookups: dict[str, asyncio.Task[str | None]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.version_errors = 0
+        self._hit_age_total = 0.0
+        self._hit_age_max = 0.0
+
+    async def _fetch_version(self, user_id: str) -> str | None:
+        try:
+            return await self.backend_client.get_config_version(user_id) or None
+        except Exception as exc:
+            self.version_errors += 1
+            logger.warning(f"Failed to fetch config version for user {user_id}: {exc}")
+            return None
+
+    async def get_version(self, user_id: str) -> str | None:
+        """Return the user's config version, coalescing concurrent lookups."""
+        task = self._version_lookups.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch_version(user_id))
+            self._version_lookups[user_id] = task
+            task.add_done_callback(
+                lambda _t, uid=user_id: self._version_lookups.pop(uid, None)
+            )
+        return await asyncio.shield(task)
+
+    def _current_entry(self, user_id: str, version: str) -> _UserEntry | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry.version != version:
+            self._entries.pop(user_id, None)
+            self.invalidations += 1
+            return None
+        if time.monotonic() - entry.created_at > self.ttl_seconds:
+            self._entries.pop(user_id, None)
+            self.expirations += 1
+            return None
+        return entry
+
+    async def fetch(
+        self, user_id: str, key: Hashable, loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Return the cached value for (user_id, key), loading it on a miss."""
+        if not self.enabled:
+            return await loader()
+        version = await self.get_version(user_id)
+        if version is None:
+            return await loader()
+
+        entry = self._current_entry(user_id, version)
+        if entry is not None and key in entry.values:
+            age = time.monotonic() - entry.created_at
+            self.hits += 1
+            self._hit_age_total += age
+            self._hit_age_max = max(self._hit_age_max, age)
+            self._entries.move_to_end(user_id)
+            # Callers mutate resolved config; never hand out the cached object.
+            return copy.deepcopy(entry.values[key])
+
+        self.misses += 1
+        value = await loader()
+
+        # Re-check after the await: another lookup may have replaced the entry.
+        entry = self._current_entry(user_id, version)
+        if entry is None:
+            entry = _UserEntry(version=version, created_at=time.monotonic())
+            self._entries[user_id] = entry
+        entry.values[key] = copy.deepcopy(value)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def get_stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "users": len(self._entries),
+            "max_users": self.max_users,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "version_errors": self.version_errors,
+            # Staleness: how old cached values were when served.
+            "avg_hit_age_seconds": (
+                round(self._hit_age_total / self.hits, 3) if self.hits else 0.0
+            ),
+            "max_hit_age_seconds": round(self._hit_age_max, 3),
+            "oldest_entry_age_seconds": round(
+                max((now - e.created_at for e in self._entries.values()), default=0.0),
+                3,
+            ),
+        }
+
+
+@lru_cache
+def get_config_cache() -> ResolvedConfigCache:
+    """Process-wide resolved config cache."""
+    settings = get_settings()
+    return ResolvedConfigCache(
+        ttl_seconds=settings.resolved_config_cache_ttl_seconds,
+        max_users=settings.resolved_config_cache_max_users,
+        enabled=settings.resolved_config_cache_enabled,
+    )
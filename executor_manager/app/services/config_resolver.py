@@ -1,12 +1,15 @@
+import asyncio
 import logging
 import re
 import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 from urllib.parse import urlparse
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.services.backend_client import BackendClient
+from app.services.config_cache import ResolvedConfigCache, get_config_cache
 
 
 _ENV_PATTERN = re.compile(r"\$\{([^}]+)\}")
@@ -49,8 +52,13 @@ def _resolve_env_value(value: Any, env_map: dict[str, str]) -> Any:
 
 
 class ConfigResolver:
-    def __init__(self, backend_client: BackendClient | None = None) -> None:
+    def __init__(
+        self,
+        backend_client: BackendClient | None = None,
+        config_cache: ResolvedConfigCache | None = None,
+    ) -> None:
         self.backend_client = backend_client or BackendClient()
+        self.config_cache = config_cache or get_config_cache()
 
     async def resolve(
         self,
@@ -69,66 +77,70 @@ class ConfigResolver:
             "run_id": run_id,
         }
 
-        step_started = time.perf_counter()
-        env_map = await self._get_env_map(user_id)
-        logger.info(
-            "timing",
-            extra={
-                "step": "config_resolve_env_map",
-                "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                **ctx,
-            },
-        )
+        async def timed(step: str, fetch: Awaitable[Any], **counts: Any) -> Any:
+            step_started = time.perf_counter()
+            result = await fetch
+            logger.info(
+                "timing",
+                extra={
+                    "step": step,
+                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
+                    # Offset from the start of resolve(); overlapping steps share it.
+                    "offset_ms": int((step_started - started) * 1000),
+                    **{key: count(result) for key, count in counts.items()},
+                    **ctx,
+                },
+            )
+            return result
 
-        step_started = time.perf_counter()
-        mcp_config = await self._resolve_effective_mcp_config(user_id, config_snapshot)
-        logger.info(
-            "timing",
-            extra={
-                "step": "config_resolve_mcp_config",
-                "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                "mcp_servers": len(mcp_config) if isinstance(mcp_config, dict) else 0,
-                **ctx,
-            },
-        )
+        async def fetch_subagents() -> dict:
+            try:
+                return await self._resolve_effective_subagents(user_id, config_snapshot)
+            except Exception as exc:
+                logger.warning(f"Failed to resolve subagents for user {user_id}: {exc}")
+                return {}
 
-        step_started = time.perf_counter()
-        skill_files = await self._resolve_effective_skill_files(
-            user_id, config_snapshot
-        )
-        logger.info(
-            "timing",
-            extra={
-                "step": "config_resolve_skill_files",
-                "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                "skills": len(skill_files) if isinstance(skill_files, dict) else 0,
-                **ctx,
-            },
-        )
-        input_files = config_snapshot.get("input_files") or []
+        def _size(value: Any) -> int:
+            return len(value) if isinstance(value, dict) else 0
 
-        step_started = time.perf_counter()
-        plugin_files = await self._resolve_effective_plugin_files(
-            user_id, config_snapshot
-        )
-        logger.info(
-            "timing",
-            extra={
-                "step": "config_resolve_plugin_files",
-                "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                "plugins": len(plugin_files) if isinstance(plugin_files, dict) else 0,
-                **ctx,
-            },
+        def _subagent_count(kind: str) -> Callable[[Any], int]:
+            return lambda value: (
+                _size(value.get(kind)) if isinstance(value, dict) else 0
+            )
+
+        # Backend fetches are independent; issue them together and template afterwards.
+        results = await asyncio.gather(
+            timed("config_resolve_env_map", self._get_env_map(user_id)),
+            timed(
+                "config_resolve_mcp_config",
+                self._resolve_effective_mcp_config(user_id, config_snapshot),
+                mcp_servers=_size,
+            ),
+            timed(
+                "config_resolve_skill_files",
+                self._resolve_effective_skill_files(user_id, config_snapshot),
+                skills=_size,
+            ),
+            timed(
+                "config_resolve_plugin_files",
+                self._resolve_effective_plugin_files(user_id, config_snapshot),
+                plugins=_size,
+            ),
+            timed(
+                "config_resolve_subagents",
+                fetch_subagents(),
+                subagents_structured=_subagent_count("structured_agents"),
+                subagents_raw=_subagent_count("raw_agents"),
+            ),
+            return_exceptions=True,
         )
+        # Surface failures in the order the sequential flow would have hit them.
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        env_map, mcp_config, skill_files, plugin_files, resolved_subagents = results
+        input_files = config_snapshot.get("input_files") or []
 
-        step_started = time.perf_counter()
-        try:
-            resolved_subagents = await self._resolve_effective_subagents(
-                user_id, config_snapshot
-            )
-        except Exception as exc:
-            logger.warning(f"Failed to resolve subagents for user {user_id}: {exc}")
-            resolved_subagents = {}
         structured_agents = (
             resolved_subagents.get("structured_agents")
             if isinstance(resolved_subagents, dict)
@@ -139,20 +151,6 @@ class ConfigResolver:
             if isinstance(resolved_subagents, dict)
             else None
         )
-        structured_count = (
-            len(structured_agents) if isinstance(structured_agents, dict) else 0
-        )
-        raw_count = len(raw_agents) if isinstance(raw_agents, dict) else 0
-        logger.info(
-            "timing",
-            extra={
-                "step": "config_resolve_subagents",
-                "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                "subagents_structured": structured_count,
-                "subagents_raw": raw_count,
-                **ctx,
-            },
-        )
 
         step_started = time.perf_counter()
         resolved_mcp = self._resolve_mcp(mcp_config, env_map)
@@ -229,7 +227,11 @@ class ConfigResolver:
         return {"git_token": token}
 
     async def _get_env_map(self, user_id: str) -> dict[str, str]:
-        return await self.backend_client.get_env_map(user_id=user_id)
+        return await self.config_cache.fetch(
+            user_id,
+            ("env_map",),
+            lambda: self.backend_client.get_env_map(user_id=user_id),
+        )
 
     async def _resolve_effective_mcp_config(
         self, user_id: str, config_snapshot: dict
@@ -243,19 +245,24 @@ class ConfigResolver:
         """
         server_ids = self._normalize_ids(config_snapshot.get("mcp_server_ids"))
         if server_ids:
-            return await self.backend_client.resolve_mcp_config(
-                user_id=user_id, server_ids=server_ids
-            )
+            return await self._resolve_mcp_ids(user_id, server_ids)
 
         mcp_config = config_snapshot.get("mcp_config")
         toggle_ids = self._extract_enabled_ids_from_toggles(mcp_config)
         if toggle_ids is not None:
-            return await self.backend_client.resolve_mcp_config(
-                user_id=user_id, server_ids=toggle_ids
-            )
+            return await self._resolve_mcp_ids(user_id, toggle_ids)
 
         return mcp_config if isinstance(mcp_config, dict) else {}
 
+    async def _resolve_mcp_ids(self, user_id: str, server_ids: list[int]) -> dict:
+        return await self.config_cache.fetch(
+            user_id,
+            ("mcp_config", tuple(server_ids)),
+            lambda: self.backend_client.resolve_mcp_config(
+                user_id=user_id, server_ids=server_ids
+            ),
+        )
+
     async def _resolve_effective_skill_files(
         self, user_id: str, config_snapshot: dict
     ) -> dict:
@@ -267,8 +274,12 @@ class ConfigResolver:
         """
         skill_ids = self._normalize_ids(config_snapshot.get("skill_ids"))
         if skill_ids:
-            return await self.backend_client.resolve_skill_config(
-                user_id=user_id, skill_ids=skill_ids
+            return await self.config_cache.fetch(
+                user_id,
+                ("skill_files", tuple(skill_ids)),
+                lambda: self.backend_client.resolve_skill_config(
+                    user_id=user_id, skill_ids=skill_ids
+                ),
             )
 
         legacy = config_snapshot.get("skill_files")
@@ -285,8 +296,12 @@ class ConfigResolver:
         """
         plugin_ids = self._normalize_ids(config_snapshot.get("plugin_ids"))
         if plugin_ids:
-            return await self.backend_client.resolve_plugin_config(
-                user_id=user_id, plugin_ids=plugin_ids
+            return await self.config_cache.fetch(
+                user_id,
+                ("plugin_files", tuple(plugin_ids)),
+                lambda: self.backend_client.resolve_plugin_config(
+                    user_id=user_id, plugin_ids=plugin_ids
+                ),
             )
 
         legacy = config_snapshot.get("plugin_files")
@@ -300,8 +315,12 @@ class ConfigResolver:
             subagent_ids = None
         else:
             subagent_ids = self._normalize_ids(config_snapshot.get("subagent_ids"))
-        return await self.backend_client.resolve_subagents(
-            user_id=user_id, subagent_ids=subagent_ids
+        return await self.config_cache.fetch(
+            user_id,
+            ("subagents", None if subagent_ids is None else tuple(subagent_ids)),
+            lambda: self.backend_client.resolve_subagents(
+                user_id=user_id, subagent_ids=subagent_ids
+            ),
         )
 
     @staticmethod
@@ -1,6 +1,13 @@
+import asyncio
+import functools
 import logging
+import random
 import time
-from typing import TYPE_CHECKING
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import docker
 import docker.errors
@@ -9,6 +16,7 @@ import httpx
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.core.settings import get_settings
+from app.services.git_mirror_cache import get_git_mirror_cache
 from app.services.workspace_manager import WorkspaceManager
 
 if TYPE_CHECKING:
@@ -16,18 +24,68 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Readiness polling backoff (seconds): starts fast so healthy containers are picked up
+# quickly, and backs off with jitter so concurrent waits don't poll in lockstep.
+_READY_POLL_INITIAL_S = 0.1
+_READY_POLL_MAX_S = 1.0
+
+
+@dataclass
+class StandbyContainer:
+    """Idle, health-checked executor container waiting to be claimed by a run."""
+
+    container: "Container"
+    slot_id: str
+    executor_url: str
+    browser_enabled: bool
+    created_at: float
+
 
 class ContainerPool:
-    """Executor container pool with ephemeral and persistent modes."""
+    """Executor container pool with ephemeral and persistent modes.
+
+    Optionally keeps a warm pool of standby containers per executor image, so ephemeral
+    runs can skip `docker run` and readiness checks on the dispatch path.
+
+    The docker SDK is synchronous, so every docker call runs on a dedicated thread pool
+    and readiness is polled with async jittered backoff. Create, readiness and cancel
+    calls for different sessions overlap without blocking the event loop.
+    """
 
     def __init__(self):
         self.docker_client = docker.from_env()
         self.settings = get_settings()
+        self._docker_executor = ThreadPoolExecutor(
+            max_workers=max(1, int(self.settings.docker_api_max_workers)),
+            thread_name_prefix="docker-api",
+        )
         self.workspace_manager = WorkspaceManager()
 
         self.containers: dict[str, "Container"] = {}
         self.session_to_container: dict[str, str] = {}
 
+        self._standby: dict[str, list[StandbyContainer]] = {}
+        self._standby_pending: dict[str, int] = {}
+        self._refill_tasks: set[asyncio.Task[None]] = set()
+        self._warm_pool_closed = False
+        self._warm_pool_hits = 0
+        self._warm_pool_misses = 0
+        self._warm_pool_refills = 0
+        self._warm_pool_refill_failures = 0
+        self._warm_pool_refill_last_ms = 0
+        self._warm_pool_refill_total_ms = 0
+
+    async def _docker_call(
+        self, fn: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> T:
+        """Run a blocking docker SDK call on the docker thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._docker_executor, functools.partial(fn, *args, **kwargs)
+        )
+
     async def get_or_create_container(
         self,
         session_id: str,
@@ -36,6 +94,7 @@ class ContainerPool:
         browser_enabled: bool = False,
         container_mode: str = "ephemeral",
         container_id: str | None = None,
+        workspace_bound: asyncio.Event | None = None,
     ) -> tuple[str, str]:
         """Get or create container.
 
@@ -45,6 +104,9 @@ class ContainerPool:
             browser_enabled: Whether this container needs the desktop/browser stack (noVNC/Chrome).
             container_mode: ephemeral | persistent
             container_id: Existing container ID to reuse
+            workspace_bound: Set once the session workspace directory is final, so callers
+                can stage files concurrently with container startup. A warm-pool claim moves
+                the workspace directory, so staging must not write before this is set.
 
         Returns:
             (executor_url, container_id)
@@ -62,7 +124,7 @@ class ContainerPool:
 
             # Best-effort refresh port mappings.
             try:
-                container.reload()
+                await self._docker_call(container.reload)
             except Exception:
                 pass
 
@@ -82,6 +144,8 @@ class ContainerPool:
                 await self.delete_container(container_id)
             else:
                 port_info = container.ports["8000/tcp"][0]
+                if workspace_bound is not None:
+                    workspace_bound.set()
                 logger.info(
                     "timing",
                     extra={
@@ -101,30 +165,32 @@ class ContainerPool:
                     container_id,
                 )
 
+        if container_mode == "ephemeral" and not (
+            workspace_bound is not None and workspace_bound.is_set()
+        ):
+            try:
+                claimed = await self._claim_standby_container(
+                    session_id=session_id,
+                    user_id=user_id,
+                    browser_enabled=browser_enabled,
+                    overall_started=overall_started,
+                )
+            finally:
+                if workspace_bound is not None:
+                    workspace_bound.set()
+            if claimed:
+                return claimed
+        if workspace_bound is not None:
+            workspace_bound.set()
+
         container_id = f"exec-{session_id[:8]}"
         container_name = f"executor-{session_id[:8]}"
 
-        # Remove stale container with the same name (best-effort).
-        step_started = time.perf_counter()
-        removed_stale = False
-        try:
-            old_container = self.docker_client.containers.get(container_name)
-            logger.warning(f"Removing stale container {container_name}")
-            old_container.remove(force=True)
-            removed_stale = True
-        except docker.errors.NotFound:
-            pass
-        logger.info(
-            "timing",
-            extra={
-                "step": "container_cleanup_stale",
-                "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                "session_id": session_id,
-                "user_id": user_id,
-                "container_id": container_id,
-                "container_name": container_name,
-                "removed": removed_stale,
-            },
+        await self._remove_stale_container(
+            container_name,
+            session_id=session_id,
+            user_id=user_id,
+            container_id=container_id,
         )
 
         logger.info(f"Creating new container {container_id} (mode: {container_mode})")
@@ -157,25 +223,17 @@ class ContainerPool:
         step_started = time.perf_counter()
         image = self._resolve_executor_image(browser_enabled=browser_enabled)
         ports = {"8000/tcp": None}
-        environment = {
-            "ANTHROPIC_BASE_URL": self.settings.anthropic_base_url,
-            "DEFAULT_MODEL": self.settings.default_model,
-            "WORKSPACE_PATH": "/workspace",
-            "USER_ID": user_id,
-            "SESSION_ID": session_id,
-        }
-        anthropic_api_key = (self.settings.anthropic_api_key or "").strip()
-        if anthropic_api_key:
-            environment["ANTHROPIC_API_KEY"] = anthropic_api_key
-        if browser_enabled:
-            environment["POCO_BROWSER_VIEWPORT_SIZE"] = (
-                self.settings.poco_browser_viewport_size
-            )
-        container = self.docker_client.containers.run(
+        environment = self._build_environment(
+            browser_enabled=browser_enabled,
+            user_id=user_id,
+            session_id=session_id,
+        )
+        container = await self._docker_call(
+            self.docker_client.containers.run,
             image=image,
             name=container_name,
             environment=environment,
-            volumes={workspace_volume: {"bind": "/workspace", "mode": "rw"}},
+            volumes=self._build_volumes(workspace_volume),
             ports=ports,
             detach=True,
             auto_remove=True,
@@ -199,10 +257,10 @@ class ContainerPool:
         self.containers[container_id] = container
         self.session_to_container[session_id] = container_id
 
-        self._wait_for_container_ready(container)
+        await self._wait_for_container_ready(container)
 
         step_started = time.perf_counter()
-        container.reload()
+        await self._docker_call(container.reload)
         port_info = container.ports.get("8000/tcp")
         if not port_info:
             raise AppException(
@@ -223,7 +281,7 @@ class ContainerPool:
         host_port = port_info[0]["HostPort"]
         executor_url = f"http://{published_host}:{host_port}"
 
-        self._wait_for_service_ready(executor_url)
+        await self._wait_for_service_ready(executor_url)
 
         logger.info(
             f"Container {container_id} started for session {session_id} on port {host_port}"
@@ -243,6 +301,437 @@ class ContainerPool:
         )
         return executor_url, container_id
 
+    async def _remove_stale_container(
+        self,
+        container_name: str,
+        *,
+        session_id: str,
+        user_id: str,
+        container_id: str,
+    ) -> None:
+        """Remove a stale container with the same name (best-effort)."""
+        step_started = time.perf_counter()
+        removed_stale = False
+        try:
+            old_container = await self._docker_call(
+                self.docker_client.containers.get, container_name
+            )
+            logger.warning(f"Removing stale container {container_name}")
+            await self._docker_call(old_container.remove, force=True)
+            removed_stale = True
+        except docker.errors.NotFound:
+            pass
+        logger.info(
+            "timing",
+            extra={
+                "step": "container_cleanup_stale",
+                "duration_ms": int((time.perf_counter() - step_started) * 1000),
+                "session_id": session_id,
+                "user_id": user_id,
+                "container_id": container_id,
+                "container_name": container_name,
+                "removed": removed_stale,
+            },
+        )
+
+    def _build_environment(
+        self,
+        *,
+        browser_enabled: bool,
+        user_id: str | None = None,
+        session_id: str | None = None,
+    ) -> dict[str, str]:
+        """Build executor container environment.
+
+        Standby containers are started before the session is known, so USER_ID and
+        SESSION_ID are only set for containers created for a specific session.
+        """
+        environment = {
+            "ANTHROPIC_BASE_URL": self.settings.anthropic_base_url,
+            "DEFAULT_MODEL": self.settings.default_model,
+            "WORKSPACE_PATH": "/workspace",
+            # Pooled HTTP client of the callback/user-input/computer clients.
+            "HTTP_MAX_CONNECTIONS": str(self.settings.executor_http_max_connections),
+            "HTTP_MAX_KEEPALIVE_CONNECTIONS": str(
+                self.settings.executor_http_max_keepalive_connections
+            ),
+            "HTTP_KEEPALIVE_EXPIRY_SECONDS": str(
+                self.settings.http_keepalive_expiry_seconds
+            ),
+            "HTTP_TIMEOUT_SECONDS": str(self.settings.executor_http_timeout_seconds),
+            "HTTP_CONNECT_TIMEOUT_SECONDS": str(
+                self.settings.http_connect_timeout_seconds
+            ),
+            "HTTP2_ENABLED": "true" if self.settings.http2_enabled else "false",
+            "HTTP_RETRY_MAX_ATTEMPTS": str(self.settings.http_retry_max_attempts),
+            "HTTP_RETRY_BACKOFF_SECONDS": str(self.settings.http_retry_backoff_seconds),
+            "HTTP_RETRY_BACKOFF_MAX_SECONDS": str(
+                self.settings.http_retry_backoff_max_seconds
+            ),
+        }
+        if self.settings.git_mirror_cache_enabled:
+            environment["GIT_MIRROR_DIR"] = self.settings.git_mirror_container_path
+        if user_id is not None:
+            environment["USER_ID"] = user_id
+        if session_id is not None:
+            environment["SESSION_ID"] = session_id
+        anthropic_api_key = (self.settings.anthropic_api_key or "").strip()
+        if anthropic_api_key:
+            environment["ANTHROPIC_API_KEY"] = anthropic_api_key
+        if browser_enabled:
+            environment["POCO_BROWSER_VIEWPORT_SIZE"] = (
+                self.settings.poco_browser_viewport_size
+            )
+        return environment
+
+    def _build_volumes(self, workspace_volume: str) -> dict[str, dict[str, str]]:
+        """Workspace bind mount plus the read-only git mirror cache, when enabled."""
+        volumes = {workspace_volume: {"bind": "/workspace", "mode": "rw"}}
+        mirror_cache = get_git_mirror_cache()
+        if mirror_cache is not None:
+            volumes[str(mirror_cache.mirrors_dir)] = {
+                "bind": self.settings.git_mirror_container_path,
+                "mode": "ro",
+            }
+        return volumes
+
+    @staticmethod
+    def _warm_pool_key(browser_enabled: bool) -> str:
+        return "browser" if browser_enabled else "default"
+
+    def _warm_pool_target(self, browser_enabled: bool) -> int:
+        if browser_enabled:
+            return max(0, int(self.settings.executor_browser_warm_pool_size))
+        return max(0, int(self.settings.executor_warm_pool_size))
+
+    def warm_pool_enabled(self) -> bool:
+        return self._warm_pool_target(False) > 0 or self._warm_pool_target(True) > 0
+
+    def ensure_warm_pool(self) -> None:
+        """Schedule background refills until every warm pool reaches its target size."""
+        if self._warm_pool_closed:
+            return
+        for browser_enabled in (False, True):
+            key = self._warm_pool_key(browser_enabled)
+            target = self._warm_pool_target(browser_enabled)
+            idle = len(self._standby.get(key, []))
+            pending = self._standby_pending.get(key, 0)
+            for _ in range(max(0, target - idle - pending)):
+                self._standby_pending[key] = self._standby_pending.get(key, 0) + 1
+                task = asyncio.create_task(self._refill_standby(browser_enabled))
+                self._refill_tasks.add(task)
+                task.add_done_callback(self._refill_tasks.discard)
+
+    async def _refill_standby(self, browser_enabled: bool) -> None:
+        key = self._warm_pool_key(browser_enabled)
+        started = time.perf_counter()
+        try:
+            standby = await self._start_standby_container(browser_enabled)
+        except Exception as exc:
+            self._warm_pool_refill_failures += 1
+            logger.warning(
+                "warm_pool_refill_failed",
+                extra={"pool": key, "error": str(exc)},
+            )
+            return
+        finally:
+            self._standby_pending[key] = max(0, self._standby_pending.get(key, 0) - 1)
+
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        if self._warm_pool_closed:
+            await self._discard_standby(standby)
+            return
+
+        self._standby.setdefault(key, []).append(standby)
+        self._warm_pool_refills += 1
+        self._warm_pool_refill_last_ms = duration_ms
+        self._warm_pool_refill_total_ms += duration_ms
+        logger.info(
+            "timing",
+            extra={
+                "step": "container_warm_pool_refill",
+                "duration_ms": duration_ms,
+                "pool": key,
+                "slot_id": standby.slot_id,
+                "idle": len(self._standby[key]),
+                "executor_url": standby.executor_url,
+            },
+        )
+
+    async def _start_standby_container(self, browser_enabled: bool) -> StandbyContainer:
+        """Start a standby executor container and wait until it is healthy."""
+        published_host = (
+            self.settings.executor_published_host or ""
+        ).strip() or "localhost"
+        slot_id = f"standby-{uuid.uuid4().hex[:12]}"
+        workspace_volume = self.workspace_manager.create_standby_volume(slot_id)
+        image = self._resolve_executor_image(browser_enabled=browser_enabled)
+        labels = {
+            "owner": "executor_manager",
+            "container_id": slot_id,
+            "container_mode": "ephemeral",
+            "browser_enabled": "true" if browser_enabled else "false",
+            "warm_pool": "standby",
+        }
+
+        container: "Container | None" = None
+        try:
+            container = await self._docker_call(
+                self.docker_client.containers.run,
+                image=image,
+                name=f"executor-{slot_id}",
+                environment=self._build_environment(browser_enabled=browser_enabled),
+                volumes=self._build_volumes(workspace_volume),
+                ports={"8000/tcp": None},
+                detach=True,
+                auto_remove=True,
+                labels=labels,
+                extra_hosts={"host.docker.internal": "host-gateway"},
+            )
+            await self._wait_for_container_ready(container)
+            await self._docker_call(container.reload)
+            port_info = container.ports.get("8000/tcp")
+            if not port_info:
+                raise AppException(
+                    error_code=ErrorCode.CONTAINER_START_FAILED,
+                    message=f"Container {container.name} has no port mapping",
+                )
+            executor_url = f"http://{published_host}:{port_info[0]['HostPort']}"
+            await self._wait_for_service_ready(executor_url)
+        except BaseException:
+            if container is not None:
+                try:
+                    await self._docker_call(container.remove, force=True)
+                except Exception:
+                    pass
+            self.workspace_manager.remove_standby_volume(slot_id)
+            raise
+
+        return StandbyContainer(
+            container=container,
+            slot_id=slot_id,
+            executor_url=executor_url,
+            browser_enabled=browser_enabled,
+            created_at=time.time(),
+        )
+
+    async def _discard_standby(self, standby: StandbyContainer) -> None:
+        """Stop a standby container and drop its workspace directory (best-effort)."""
+        try:
+            await self._docker_call(standby.container.remove, force=True)
+        except Exception:
+            pass
+        self.workspace_manager.remove_standby_volume(standby.slot_id)
+
+    async def _claim_standby_container(
+        self,
+        *,
+        session_id: str,
+        user_id: str,
+        browser_enabled: bool,
+        overall_started: float,
+    ) -> tuple[str, str] | None:
+        """Claim a standby container for a session, or return None on a miss."""
+        if self._warm_pool_closed or self._warm_pool_target(browser_enabled) <= 0:
+            return None
+
+        key = self._warm_pool_key(browser_enabled)
+        idle = self._standby.get(key, [])
+        standby: StandbyContainer | None = None
+        while idle:
+            candidate = idle.pop(0)
+            try:
+                await self._docker_call(candidate.container.reload)
+                if candidate.container.status == "running":
+                    standby = candidate
+                    break
+            except Exception:
+                pass
+            await self._discard_standby(candidate)
+
+        self.ensure_warm_pool()
+
+        if standby is None:
+            self._warm_pool_misses += 1
+            logger.info(
+                "warm_pool_miss",
+                extra={
+                    "pool": key,
+                    "session_id": session_id,
+                    "user_id": user_id,
+                },
+            )
+            return None
+
+        container = standby.container
+        container_id = f"exec-{session_id[:8]}"
+        container_name = f"executor-{session_id[:8]}"
+        try:
+            await self._remove_stale_container(
+                container_name,
+                session_id=session_id,
+                user_id=user_id,
+                container_id=container_id,
+            )
+            # Rename so name-based lookups (e.g. cancel_task fallback) still resolve.
+            await self._docker_call(container.rename, container_name)
+            self.workspace_manager.bind_standby_volume(
+                user_id=user_id,
+                session_id=session_id,
+                slot_id=standby.slot_id,
+            )
+            self.workspace_manager.record_standby_claim(
+                standby.slot_id, session_id=session_id, user_id=user_id
+            )
+            await self._docker_call(container.reload)
+        except Exception as exc:
+            logger.warning(
+                "warm_pool_bind_failed",
+                extra={
+                    "pool": key,
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "slot_id": standby.slot_id,
+                    "error": str(exc),
+                },
+            )
+            self.workspace_manager.remove_standby_claim(standby.slot_id)
+            await self._discard_standby(standby)
+            self._warm_pool_misses += 1
+            return None
+
+        self._warm_pool_hits += 1
+        self.containers[container_id] = container
+        self.session_to_container[session_id] = container_id
+        logger.info(
+            "timing",
+            extra={
+                "step": "container_warm_pool_claim_total",
+                "duration_ms": int((time.perf_counter() - overall_started) * 1000),
+                "session_id": session_id,
+                "user_id": user_id,
+                "container_id": container_id,
+                "container_name": container_name,
+                "slot_id": standby.slot_id,
+                "standby_age_s": int(time.time() - standby.created_at),
+                "browser_enabled": bool(browser_enabled),
+            },
+        )
+        return standby.executor_url, container_id
+
+    async def sweep_orphaned_standby(self) -> None:
+        """Remove standby containers and slot directories left by a previous process.
+
+        Run at startup, before the warm pool is refilled. Claimed standbys were renamed
+        to their session's container name and are left alone; claim records whose
+        container is gone are dropped.
+        """
+        removed = 0
+        try:
+            containers = await self._docker_call(
+                self.docker_client.containers.list,
+                all=True,
+                filters={"label": ["owner=executor_manager", "warm_pool=standby"]},
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to list orphaned standby containers: {exc}")
+            containers = None
+        claimed_slots: set[str] = set()
+        for container in containers or []:
+            if not (container.name or "").startswith("executor-standby-"):
+                claimed_slots.add((container.labels or {}).get("container_id", ""))
+                continue
+            try:
+                await self._docker_call(container.remove, force=True)
+                removed += 1
+            except docker.errors.NotFound:
+                pass
+            except Exception as exc:
+                logger.warning(
+                    f"Failed to remove orphaned standby container {container.name}: {exc}"
+                )
+
+        # Without a container listing, every claim would look stale.
+        stale_claims = (
+            [
+                slot_id
+                for slot_id in self.workspace_manager.load_standby_claims()
+                if slot_id not in claimed_slots
+            ]
+            if containers is not None
+            else []
+        )
+        for slot_id in stale_claims:
+            self.workspace_manager.remove_standby_claim(slot_id)
+
+        tracked = {s.slot_id for idle in self._standby.values() for s in idle}
+        stale_slots = [
+            slot_id
+            for slot_id in self.workspace_manager.list_standby_volumes()
+            if slot_id not in tracked
+        ]
+        for slot_id in stale_slots:
+            self.workspace_manager.remove_standby_volume(slot_id)
+        if removed or stale_slots or stale_claims:
+            logger.info(
+                "warm_pool_orphans_swept",
+                extra={
+                    "containers": removed,
+                    "slots": len(stale_slots),
+                    "claims": len(stale_claims),
+                },
+            )
+
+    def _forget_standby_claim(self, container: "Container") -> None:
+        labels = getattr(container, "labels", None) or {}
+        if labels.get("warm_pool") == "standby" and labels.get("container_id"):
+            self.workspace_manager.remove_standby_claim(labels["container_id"])
+
+    async def shutdown_warm_pool(self) -> None:
+        """Stop refills and remove all idle standby containers."""
+        self._warm_pool_closed = True
+        tasks = list(self._refill_tasks)
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refill_tasks.clear()
+
+        standbys = [s for idle in self._standby.values() for s in idle]
+        self._standby.clear()
+        await asyncio.gather(
+            *(self._discard_standby(s) for s in standbys), return_exceptions=True
+        )
+
+    def _get_warm_pool_stats(self) -> dict:
+        pools: dict[str, dict] = {}
+        for browser_enabled in (False, True):
+            target = self._warm_pool_target(browser_enabled)
+            if target <= 0:
+                continue
+            key = self._warm_pool_key(browser_enabled)
+            pools[key] = {
+                "image": self._resolve_executor_image(browser_enabled=browser_enabled),
+                "target": target,
+                "idle": len(self._standby.get(key, [])),
+                "pending": self._standby_pending.get(key, 0),
+            }
+        lookups = self._warm_pool_hits + self._warm_pool_misses
+        return {
+            "enabled": self.warm_pool_enabled(),
+            "pools": pools,
+            "hits": self._warm_pool_hits,
+            "misses": self._warm_pool_misses,
+            "hit_ratio": round(self._warm_pool_hits / lookups, 4) if lookups else 0.0,
+            "refills": self._warm_pool_refills,
+            "refill_failures": self._warm_pool_refill_failures,
+            "refill_last_ms": self._warm_pool_refill_last_ms,
+            "refill_avg_ms": (
+                int(self._warm_pool_refill_total_ms / self._warm_pool_refills)
+                if self._warm_pool_refills
+                else 0
+            ),
+        }
+
     def _resolve_executor_image(self, *, browser_enabled: bool) -> str:
         """Pick executor image based on browser requirement."""
         if not browser_enabled:
@@ -263,7 +752,13 @@ class ContainerPool:
         raw = str(labels.get("browser_enabled", "")).strip().lower()
         return raw in {"true", "1", "yes"}
 
-    def _wait_for_container_ready(
+    @staticmethod
+    def _ready_poll_delay(attempt: int) -> float:
+        """Jittered exponential backoff delay for readiness polling."""
+        ceiling = min(_READY_POLL_MAX_S, _READY_POLL_INITIAL_S * (2 ** (attempt - 1)))
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def _wait_for_container_ready(
         self,
         container: "Container",
         timeout: int = 30,
@@ -274,7 +769,7 @@ class ContainerPool:
 
         while time.perf_counter() - started < timeout:
             attempts += 1
-            container.reload()
+            await self._docker_call(container.reload)
             if container.status == "running":
                 logger.info(
                     "timing",
@@ -287,7 +782,7 @@ class ContainerPool:
                     },
                 )
                 return
-            time.sleep(1)
+            await asyncio.sleep(self._ready_poll_delay(attempts))
 
         logger.warning(
             "timing",
@@ -304,7 +799,7 @@ class ContainerPool:
             message=f"Container {container.name} failed to start within {timeout}s",
         )
 
-    def _wait_for_service_ready(
+    async def _wait_for_service_ready(
         self,
         executor_url: str,
         timeout: int = 60,
@@ -314,11 +809,11 @@ class ContainerPool:
         attempts = 0
         health_url = f"{executor_url}/health"
 
-        while time.perf_counter() - started < timeout:
-            attempts += 1
-            try:
-                with httpx.Client(timeout=2.0) as client:
-                    response = client.get(health_url)
+        async with httpx.AsyncClient(timeout=2.0) as client:
+            while time.perf_counter() - started < timeout:
+                attempts += 1
+                try:
+                    response = await client.get(health_url)
                     if response.status_code == 200:
                         logger.info(
                             "timing",
@@ -333,9 +828,9 @@ class ContainerPool:
                         )
                         logger.info(f"Executor service ready at {executor_url}")
                         return
-            except httpx.RequestError:
-                pass
-            time.sleep(1)
+                except httpx.RequestError:
+                    pass
+                await asyncio.sleep(self._ready_poll_delay(attempts))
 
         logger.warning(
             "timing",
@@ -375,9 +870,10 @@ class ContainerPool:
             if container_mode == "ephemeral":
                 logger.info(f"Container {container_id} is ephemeral, stopping")
                 try:
-                    container.stop(timeout=10)
+                    await self._docker_call(container.stop, timeout=10)
                 except Exception as e:
                     logger.error(f"Failed to stop container {container_id}: {e}")
+                self._forget_standby_claim(container)
 
     async def delete_container(self, container_id: str) -> None:
         """Delete a container explicitly (mainly for persistent mode).
@@ -400,12 +896,12 @@ class ContainerPool:
             return
 
         try:
-            container.stop(timeout=10)
+            await self._docker_call(container.stop, timeout=10)
         except Exception as e:
             logger.error(f"Failed to stop container {cid}: {e}")
 
         try:
-            container.remove(force=True)
+            await self._docker_call(container.remove, force=True)
         except Exception:
             # Best-effort: the container might have already been removed.
             pass
@@ -440,34 +936,43 @@ class ContainerPool:
                 seen.add(cid)
                 containers_to_stop.append(c)
 
-        # Prefer exact match by full session_id label.
-        try:
-            found = self.docker_client.containers.list(
-                all=True, filters={"label": f"session_id={session_id}"}
+        # Resolve candidates concurrently: exact session_id label, logical container_id
+        # label (best-effort), and the deterministic name used by get_or_create_container.
+        lookups = [
+            self._docker_call(
+                self.docker_client.containers.list,
+                all=True,
+                filters={"label": f"session_id={session_id}"},
             )
-            _extend_unique(found)
-        except Exception:
-            pass
-
-        # Best-effort: if we know the logical container_id label, try to locate by that label too.
+        ]
         if container_id:
-            try:
-                found = self.docker_client.containers.list(
-                    all=True, filters={"label": f"container_id={container_id}"}
+            lookups.append(
+                self._docker_call(
+                    self.docker_client.containers.list,
+                    all=True,
+                    filters={"label": f"container_id={container_id}"},
                 )
-                _extend_unique(found)
-            except Exception:
-                pass
-
-        # Fallback to deterministic name (used by get_or_create_container).
-        try:
-            name = f"executor-{session_id[:8]}"
-            found = self.docker_client.containers.get(name)
-            _extend_unique([found])
-        except docker.errors.NotFound:
-            pass
-        except Exception:
-            pass
+            )
+        lookups.append(
+            self._docker_call(
+                self.docker_client.containers.get, f"executor-{session_id[:8]}"
+            )
+        )
+        # Claimed standby containers carry their slot labels, not the session's.
+        for slot_id, claim in self.workspace_manager.load_standby_claims().items():
+            if claim.get("session_id") == session_id:
+                lookups.append(
+                    self._docker_call(
+                        self.docker_client.containers.list,
+                        all=True,
+                        filters={"label": f"container_id={slot_id}"},
+                    )
+                )
+        for found in await asyncio.gather(*lookups, return_exceptions=True):
+            # NotFound and other lookup errors are best-effort misses.
+            if isinstance(found, BaseException):
+                continue
+            _extend_unique(found if isinstance(found, list) else [found])
 
         if not containers_to_stop:
             logger.info(
@@ -476,11 +981,11 @@ class ContainerPool:
             )
             return
 
-        for container in containers_to_stop:
+        async def _stop(container: "Container") -> None:
             labels = getattr(container, "labels", None) or {}
             logical_id = labels.get("container_id")
             try:
-                container.stop(timeout=10)
+                await self._docker_call(container.stop, timeout=10)
                 logger.info(
                     "container_stopped",
                     extra={
@@ -506,6 +1011,7 @@ class ContainerPool:
                 )
 
             # Clean up any stale bookkeeping for this logical container_id.
+            self._forget_standby_claim(container)
             if isinstance(logical_id, str) and logical_id:
                 self.containers.pop(logical_id, None)
                 bound_sessions = [
@@ -516,7 +1022,9 @@ class ContainerPool:
                 for sid in bound_sessions:
                     self.session_to_container.pop(sid, None)
 
-    def get_container_stats(self) -> dict[str, int | list[dict]]:
+        await asyncio.gather(*(_stop(c) for c in containers_to_stop))
+
+    def get_container_stats(self) -> dict[str, int | list[dict] | dict]:
         """Get container statistics."""
         persistent = 0
         ephemeral = 0
@@ -534,11 +1042,13 @@ class ContainerPool:
             "ephemeral_containers": ephemeral,
             "containers": [
                 {
-                    "container_id": c.labels.get("container_id", c.name),
+                    # Keyed by logical id: claimed standby containers keep their slot label.
+                    "container_id": cid,
                     "name": c.name,
                     "status": c.status,
                     "mode": c.labels.get("container_mode", "ephemeral"),
                 }
-                for c in self.containers.values()
+                for cid, c in self.containers.items()
             ],
+            "warm_pool": self._get_warm_pool_stats(),
         }
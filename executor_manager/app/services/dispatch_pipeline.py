@@ -0,0 +1,381 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
+from app.services.attachment_stager import AttachmentStager
+from app.services.backend_client import BackendClient
+from app.services.claude_md_stager import ClaudeMdStager
+from app.services.config_resolver import ConfigResolver
+from app.services.container_pool import ContainerPool
+from app.services.git_mirror_cache import get_git_mirror_cache
+from app.services.plugin_stager import PluginStager
+from app.services.skill_stager import SkillStager
+from app.services.slash_command_stager import SlashCommandStager
+from app.services.sub_agent_stager import SubAgentStager
+from app.services.workspace_manager import WorkspaceManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreparedDispatch:
+    resolved_config: dict
+    executor_url: str
+    container_id: str
+
+
+class DispatchPipeline:
+    """Prepare a run for execution: resolve config, stage files and start the container.
+
+    Steps form a dependency graph instead of a strict sequence:
+
+    - container creation only needs the session workspace, so it starts immediately;
+    - slash commands and CLAUDE.md only need the user, so they start immediately too;
+    - skills, plugins, inputs and subagents start as soon as the config is resolved.
+
+    Stagers write into the session workspace, so they wait until the container pool has
+    bound it (a warm-pool claim moves the workspace directory into place). Blocking stager
+    I/O (S3 downloads, git clones) runs in worker threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        backend_client: BackendClient,
+        container_pool: ContainerPool,
+        config_resolver: ConfigResolver | None = None,
+        skill_stager: SkillStager | None = None,
+        plugin_stager: PluginStager | None = None,
+        attachment_stager: AttachmentStager | None = None,
+        claude_md_stager: ClaudeMdStager | None = None,
+        slash_command_stager: SlashCommandStager | None = None,
+        subagent_stager: SubAgentStager | None = None,
+        workspace_manager: WorkspaceManager | None = None,
+    ) -> None:
+        self.backend_client = backend_client
+        self.container_pool = container_pool
+        self.config_resolver = config_resolver or ConfigResolver(backend_client)
+        self.skill_stager = skill_stager or SkillStager()
+        self.plugin_stager = plugin_stager or PluginStager()
+        self.attachment_stager = attachment_stager or AttachmentStager()
+        self.claude_md_stager = claude_md_stager or ClaudeMdStager()
+        self.slash_command_stager = slash_command_stager or SlashCommandStager()
+        self.subagent_stager = subagent_stager or SubAgentStager()
+        self.workspace_manager = workspace_manager or WorkspaceManager()
+        self.user_quota_bytes = get_settings().workspace_user_quota_bytes
+        self._background_tasks: set[asyncio.Task[Any]] = set()
+
+    @staticmethod
+    def _log_timing(step: str, started: float, **extra: Any) -> None:
+        logger.info(
+            "timing",
+            extra={
+                "step": step,
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+                **extra,
+            },
+        )
+
+    async def _check_user_quota(self, user_id: str) -> None:
+        if self.user_quota_bytes <= 0:
+            return
+        usage = await asyncio.to_thread(self.workspace_manager.get_user_usage, user_id)
+        if usage["total_bytes"] >= self.user_quota_bytes:
+            raise AppException(
+                error_code=ErrorCode.WORKSPACE_QUOTA_EXCEEDED,
+                details={
+                    "user_id": user_id,
+                    "used_bytes": usage["total_bytes"],
+                    "quota_bytes": self.user_quota_bytes,
+                },
+            )
+
+    def _refresh_workspace_size(self, user_id: str, session_id: str) -> None:
+        """Record the staged workspace size without delaying the dispatch."""
+
+        async def refresh() -> None:
+            try:
+                await asyncio.to_thread(
+                    self.workspace_manager.refresh_workspace_size, user_id, session_id
+                )
+            except Exception as exc:
+                logger.warning(
+                    f"Failed to refresh workspace size for session {session_id}: {exc}"
+                )
+
+        task = asyncio.create_task(refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _warm_git_mirror(self, repo_url: str) -> None:
+        """Refresh the node mirror the executor clones `repo_url` against.
+
+        Runs in the background: the executor falls back to a plain clone when the
+        mirror is missing, so this only speeds up later runs of the same repository.
+        """
+        mirror_cache = get_git_mirror_cache()
+        if mirror_cache is None or not repo_url.startswith(("https://", "http://")):
+            return
+
+        async def warm() -> None:
+            try:
+                await asyncio.to_thread(mirror_cache.ensure_mirror, repo_url)
+            except Exception as exc:
+                logger.warning(f"Failed to warm git mirror for {repo_url}: {exc}")
+
+        task = asyncio.create_task(warm())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def prepare(
+        self,
+        *,
+        user_id: str,
+        session_id: str,
+        config_snapshot: dict,
+        container_mode: str,
+        container_id: str | None,
+        step_prefix: str,
+        ctx: dict[str, Any],
+        task_id: str | None = None,
+        run_id: str | None = None,
+        stage_claude_md: bool = True,
+    ) -> PreparedDispatch:
+        """Run all dispatch preparation steps and return the executor target.
+
+        Dispatch is refused up front when the user is over WORKSPACE_USER_QUOTA_BYTES.
+        Timing logs keep the `{step_prefix}_<step>` names of the sequential flow. When any
+        required step fails, the remaining steps are awaited before re-raising so the
+        caller's cleanup (e.g. cancel_task) sees a settled container state.
+        """
+        pipeline_started = time.perf_counter()
+        await self._check_user_quota(user_id)
+        self._warm_git_mirror(str(config_snapshot.get("repo_url") or "").strip())
+        workspace_bound = asyncio.Event()
+        browser_enabled = bool(config_snapshot.get("browser_enabled"))
+
+        async def resolve_config() -> dict:
+            step_started = time.perf_counter()
+            resolved = await self.config_resolver.resolve(
+                user_id,
+                config_snapshot,
+                session_id=session_id,
+                task_id=task_id,
+                run_id=run_id,
+            )
+            self._log_timing(f"{step_prefix}_resolve_config", step_started, **ctx)
+            return resolved
+
+        config_task = asyncio.create_task(resolve_config())
+
+        async def create_container() -> tuple[str, str]:
+            step_started = time.perf_counter()
+            try:
+                result = await self.container_pool.get_or_create_container(
+                    session_id=session_id,
+                    user_id=user_id,
+                    browser_enabled=browser_enabled,
+                    container_mode=container_mode,
+                    container_id=container_id,
+                    workspace_bound=workspace_bound,
+                )
+            finally:
+                workspace_bound.set()
+            self._log_timing(
+                f"{step_prefix}_get_or_create_container",
+                step_started,
+                container_mode=container_mode,
+                container_id=result[1],
+                browser_enabled=browser_enabled,
+                **ctx,
+            )
+            return result
+
+        async def stage_skills() -> dict:
+            resolved = await config_task
+            await workspace_bound.wait()
+            step_started = time.perf_counter()
+            staged = await asyncio.to_thread(
+                self.skill_stager.stage_skills,
+                user_id=user_id,
+                session_id=session_id,
+                skills=resolved.get("skill_files") or {},
+            )
+            self._log_timing(
+                f"{step_prefix}_stage_skills",
+                step_started,
+                skills_staged=len(staged),
+                **ctx,
+            )
+            return staged
+
+        async def stage_plugins() -> dict:
+            resolved = await config_task
+            await workspace_bound.wait()
+            step_started = time.perf_counter()
+            staged = await asyncio.to_thread(
+                self.plugin_stager.stage_plugins,
+                user_id=user_id,
+                session_id=session_id,
+                plugins=resolved.get("plugin_files") or {},
+            )
+            self._log_timing(
+                f"{step_prefix}_stage_plugins",
+                step_started,
+                plugins_staged=len(staged),
+                **ctx,
+            )
+            return staged
+
+        async def stage_inputs() -> list:
+            resolved = await config_task
+            await workspace_bound.wait()
+            step_started = time.perf_counter()
+            staged = await asyncio.to_thread(
+                self.attachment_stager.stage_inputs,
+                user_id=user_id,
+                session_id=session_id,
+                inputs=resolved.get("input_files") or [],
+            )
+            self._log_timing(
+                f"{step_prefix}_stage_inputs",
+                step_started,
+                inputs_staged=len(staged),
+                **ctx,
+            )
+            return staged
+
+        async def stage_slash_commands() -> None:
+            step_started = time.perf_counter()
+            resolved_commands = await self.config_resolver.config_cache.fetch(
+                user_id,
+                ("slash_commands",),
+                lambda: self.backend_client.resolve_slash_commands(user_id=user_id),
+            )
+            await workspace_bound.wait()
+            staged_commands = await asyncio.to_thread(
+                self.slash_command_stager.stage_commands,
+                user_id=user_id,
+                session_id=session_id,
+                commands=resolved_commands,
+            )
+            self._log_timing(
+                f"{step_prefix}_stage_slash_commands",
+                step_started,
+                commands_staged=len(staged_commands),
+                **ctx,
+            )
+
+        async def stage_subagents() -> None:
+            resolved = await config_task
+            raw_agents_val = resolved.get("subagent_raw_agents")
+            raw_agents = raw_agents_val if isinstance(raw_agents_val, dict) else {}
+            await workspace_bound.wait()
+            step_started = time.perf_counter()
+            try:
+                staged_agents = await asyncio.to_thread(
+                    self.subagent_stager.stage_raw_agents,
+                    user_id=user_id,
+                    session_id=session_id,
+                    raw_agents=raw_agents,
+                )
+                self._log_timing(
+                    f"{step_prefix}_stage_subagents",
+                    step_started,
+                    subagents_requested=len(raw_agents),
+                    subagents_staged=len(staged_agents),
+                    **ctx,
+                )
+            except Exception as exc:
+                # Best-effort: keep tasks running even if staging fails.
+                logger.warning(
+                    f"Failed to stage subagents for session {session_id}: {exc}"
+                )
+
+        async def stage_claude_md_file() -> None:
+            # Stage user-level CLAUDE.md (persistent instructions) into ~/.claude.
+            step_started = time.perf_counter()
+            try:
+                claude_md = await self.config_resolver.config_cache.fetch(
+                    user_id,
+                    ("claude_md",),
+                    lambda: self.backend_client.get_claude_md(user_id=user_id),
+                )
+                enabled = bool(claude_md.get("enabled"))
+                content = (
+                    claude_md.get("content")
+                    if isinstance(claude_md.get("content"), str)
+                    else ""
+                )
+                await workspace_bound.wait()
+                staged_md = await asyncio.to_thread(
+                    self.claude_md_stager.stage,
+                    user_id=user_id,
+                    session_id=session_id,
+                    enabled=enabled,
+                    content=content,
+                )
+                bytes_val = staged_md.get("bytes", 0)
+                self._log_timing(
+                    f"{step_prefix}_stage_claude_md",
+                    step_started,
+                    enabled=bool(staged_md.get("enabled")),
+                    bytes=int(bytes_val) if isinstance(bytes_val, int) else 0,
+                    **ctx,
+                )
+            except Exception as exc:
+                # Best-effort: don't block execution if CLAUDE.md staging fails.
+                logger.warning(
+                    f"Failed to stage CLAUDE.md for session {session_id}: {exc}"
+                )
+
+        container_task = asyncio.create_task(create_container())
+        skills_task = asyncio.create_task(stage_skills())
+        plugins_task = asyncio.create_task(stage_plugins())
+        inputs_task = asyncio.create_task(stage_inputs())
+        tasks: list[asyncio.Task[Any]] = [
+            config_task,
+            container_task,
+            skills_task,
+            plugins_task,
+            inputs_task,
+            asyncio.create_task(stage_slash_commands()),
+            asyncio.create_task(stage_subagents()),
+        ]
+        if stage_claude_md:
+            tasks.append(asyncio.create_task(stage_claude_md_file()))
+
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for t in tasks:
+                t.cancel()
+            raise
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        resolved_config = config_task.result()
+        resolved_config.pop("subagent_raw_agents", None)
+        resolved_config["skill_files"] = skills_task.result()
+        resolved_config["plugin_files"] = plugins_task.result()
+        resolved_config["input_files"] = inputs_task.result()
+        executor_url, resolved_container_id = container_task.result()
+        self._refresh_workspace_size(user_id, session_id)
+
+        self._log_timing(
+            f"{step_prefix}_pipeline_total",
+            pipeline_started,
+            container_id=resolved_container_id,
+            **ctx,
+        )
+        return PreparedDispatch(
+            resolved_config=resolved_config,
+            executor_url=executor_url,
+            container_id=resolved_container_id,
+        )
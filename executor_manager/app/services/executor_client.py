@@ -1,5 +1,6 @@
 import httpx
 
+from app.core.http_client import get_http_client
 from app.core.settings import get_settings
 from app.core.observability.request_context import (
     generate_request_id,
@@ -15,6 +16,7 @@ class ExecutorClient:
     def __init__(self) -> None:
         self.settings = get_settings()
         self.executor_url = self.settings.executor_url
+        self.http = get_http_client()
 
     @staticmethod
     def _trace_headers() -> dict[str, str]:
@@ -35,6 +37,7 @@ class ExecutorClient:
         callback_base_url: str | None = None,
         sdk_session_id: str | None = None,
         permission_mode: str = "default",
+        state_seq: int | None = None,
     ) -> str:
         """Call Executor to execute a task.
 
@@ -47,24 +50,25 @@ class ExecutorClient:
             config: Task configuration
             callback_base_url: Base URL for callback-related APIs
             sdk_session_id: Claude SDK session ID for resuming conversations
+            state_seq: Last stored state version the run's callbacks continue from
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{executor_url}/v1/tasks/execute",
-                json={
-                    "session_id": session_id,
-                    "run_id": run_id,
-                    "prompt": prompt,
-                    "callback_url": callback_url,
-                    "callback_token": callback_token,
-                    "callback_base_url": callback_base_url,
-                    "config": config,
-                    "sdk_session_id": sdk_session_id,
-                    "permission_mode": permission_mode or "default",
-                },
-                headers=self._trace_headers(),
-                timeout=httpx.Timeout(30.0, connect=10.0),
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["session_id"]
+        response = await self.http.post(
+            f"{executor_url}/v1/tasks/execute",
+            json={
+                "session_id": session_id,
+                "run_id": run_id,
+                "prompt": prompt,
+                "callback_url": callback_url,
+                "callback_token": callback_token,
+                "callback_base_url": callback_base_url,
+                "config": config,
+                "sdk_session_id": sdk_session_id,
+                "permission_mode": permission_mode or "default",
+                "state_seq": state_seq,
+            },
+            headers=self._trace_headers(),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["session_id"]
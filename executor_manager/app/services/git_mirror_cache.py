@@ -0,0 +1,260 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_MIRRORS_DIR = "mirrors"
+_LOCKS_DIR = "locks"
+# Mirrors used this recently are never evicted: a container may be cloning from one.
+_EVICT_GRACE_SECONDS = 600
+# Fetch anonymously: host credential helpers must never pull private repositories into
+# a cache that is mounted into every executor container.
+_ANONYMOUS_GIT = ["git", "-c", "credential.helper=", "-c", "core.askPass="]
+
+
+def mirror_key(repo_url: str) -> str:
+    """Cache key of a repository URL (mirrored by the executor's reference lookup)."""
+    clean = repo_url.strip().split("?", 1)[0].split("#", 1)[0].rstrip("/")
+    clean = clean.removesuffix(".git").lower()
+    return hashlib.sha256(clean.encode("utf-8")).hexdigest()
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class GitMirrorCache:
+    """Node-level cache of bare mirrors of public git repositories.
+
+    Each repository is mirrored once (`git clone --mirror`) and refreshed with
+    `git fetch` at most every `fetch_interval_seconds`; clones are then served from
+    the local mirror instead of the network. The mirrors directory is also mounted
+    read-only into executor containers, which clone with `--reference-if-able` and
+    `--dissociate`. Per-repository file locks serialize mirror updates across threads
+    and manager processes. Total size is bounded with LRU eviction (recency = the
+    mtime of the mirror's metadata file).
+    """
+
+    def __init__(
+        self,
+        *,
+        root: Path,
+        max_bytes: int,
+        fetch_interval_seconds: float,
+        timeout_seconds: float = 600,
+    ) -> None:
+        self.root = root
+        self.mirrors_dir = root / _MIRRORS_DIR
+        self.locks_dir = root / _LOCKS_DIR
+        self.max_bytes = max(0, int(max_bytes))
+        self.fetch_interval_seconds = max(0.0, float(fetch_interval_seconds))
+        self.timeout_seconds = timeout_seconds
+        self.mirrors_dir.mkdir(parents=True, exist_ok=True)
+        self.locks_dir.mkdir(parents=True, exist_ok=True)
+
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.fetches = 0
+        self.mirrors_created = 0
+        self.failures = 0
+        self.evictions = 0
+
+    @contextmanager
+    def _repo_lock(self, key: str) -> Iterator[None]:
+        with open(self.locks_dir / f"{key}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _run_git(self, args: list[str], cwd: Path | None = None) -> None:
+        subprocess.run(
+            [*_ANONYMOUS_GIT, *args],
+            cwd=cwd,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=self.timeout_seconds,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def ensure_mirror(self, repo_url: str) -> Path | None:
+        """Create or refresh the mirror of `repo_url`; None if it is unavailable.
+
+        A failed refresh of an existing mirror still returns it (slightly stale objects
+        only cost the clone an extra fetch).
+        """
+        key = mirror_key(repo_url)
+        mirror = self.mirrors_dir / f"{key}.git"
+        meta_file = self.mirrors_dir / f"{key}.json"
+        with self._repo_lock(key):
+            meta: dict = {}
+            if mirror.is_dir():
+                try:
+                    meta = json.loads(meta_file.read_text(encoding="utf-8"))
+                except Exception:
+                    meta = {}
+            fetched_at = float(meta.get("fetched_at") or 0)
+            if (
+                mirror.is_dir()
+                and time.time() - fetched_at < self.fetch_interval_seconds
+            ):
+                self._count("hits")
+                os.utime(meta_file)
+                return mirror
+
+            step_started = time.perf_counter()
+            created = not mirror.is_dir()
+            try:
+                if created:
+                    tmp = self.mirrors_dir / f".tmp-{key}-{uuid.uuid4().hex[:8]}"
+                    try:
+                        self._run_git(
+                            ["clone", "--mirror", "--quiet", repo_url, str(tmp)]
+                        )
+                        tmp.rename(mirror)
+                    finally:
+                        shutil.rmtree(tmp, ignore_errors=True)
+                    self._count("mirrors_created")
+                else:
+                    self._run_git(["fetch", "--prune", "--quiet"], cwd=mirror)
+                    self._count("fetches")
+            except (subprocess.SubprocessError, OSError) as exc:
+                self._count("failures")
+                stderr = getattr(exc, "stderr", None) or exc
+                logger.warning(f"Git mirror update failed for {repo_url}: {stderr}")
+                return mirror if mirror.is_dir() else None
+
+            size = _dir_size(mirror)
+            meta_file.write_text(
+                json.dumps(
+                    {"url": repo_url, "fetched_at": time.time(), "size_bytes": size}
+                ),
+                encoding="utf-8",
+            )
+            logger.info(
+                "timing",
+                extra={
+                    "step": "git_mirror_clone" if created else "git_mirror_fetch",
+                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
+                    "repo_url": repo_url,
+                    "size_bytes": size,
+                },
+            )
+
+        self._evict()
+        return mirror
+
+    def clone(
+        self,
+        repo_url: str,
+        destination: Path,
+        *,
+        branch: str | None = None,
+        depth: int | None = 1,
+    ) -> bool:
+        """Clone `repo_url` into `destination` from its local mirror.
+
+        The clone's origin points at `repo_url`. Returns False (leaving nothing at
+        `destination`) when the mirror is unavailable, so the caller can clone over the
+        network instead.
+        """
+        mirror = self.ensure_mirror(repo_url)
+        if mirror is None:
+            return False
+        args = ["clone", "--quiet", "--single-branch"]
+        if depth:
+            # file:// makes git honor --depth for a local source.
+            args.extend(["--depth", str(depth)])
+        if branch:
+            args.extend(["--branch", branch])
+        args.extend([mirror.resolve().as_uri(), str(destination)])
+        try:
+            self._run_git(args)
+            self._run_git(["remote", "set-url", "origin", repo_url], cwd=destination)
+        except (subprocess.SubprocessError, OSError) as exc:
+            stderr = getattr(exc, "stderr", None) or exc
+            logger.warning(f"Clone from git mirror failed for {repo_url}: {stderr}")
+            shutil.rmtree(destination, ignore_errors=True)
+            return False
+        return True
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, str, int]] = []
+        for meta_file in self.mirrors_dir.glob("*.json"):
+            try:
+                meta = json.loads(meta_file.read_text(encoding="utf-8"))
+                entries.append(
+                    (
+                        meta_file.stat().st_mtime,
+                        meta_file.stem,
+                        int(meta.get("size_bytes") or 0),
+                    )
+                )
+            except Exception:
+                continue
+        total = sum(size for _, _, size in entries)
+        now = time.time()
+        for used_at, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if now - used_at < _EVICT_GRACE_SECONDS:
+                continue
+            with self._repo_lock(key):
+                shutil.rmtree(self.mirrors_dir / f"{key}.git", ignore_errors=True)
+                (self.mirrors_dir / f"{key}.json").unlink(missing_ok=True)
+            total -= size
+            self._count("evictions")
+            logger.info("git_mirror_evicted", extra={"key": key, "size_bytes": size})
+
+    def get_stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {
+                "hits": self.hits,
+                "fetches": self.fetches,
+                "mirrors_created": self.mirrors_created,
+                "failures": self.failures,
+                "evictions": self.evictions,
+                "max_bytes": self.max_bytes,
+            }
+
+
+@lru_cache
+def get_git_mirror_cache() -> GitMirrorCache | None:
+    """Process-wide git mirror cache, or None when disabled."""
+    settings = get_settings()
+    if not settings.git_mirror_cache_enabled:
+        return None
+    root = (settings.git_mirror_cache_dir or "").strip()
+    return GitMirrorCache(
+        root=Path(root) if root else Path(settings.workspace_root) / "cache" / "git",
+        max_bytes=settings.git_mirror_cache_max_bytes,
+        fetch_interval_seconds=settings.git_mirror_fetch_interval_seconds,
+    )
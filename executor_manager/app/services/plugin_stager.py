@@ -7,6 +7,7 @@ from typing import Any
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.services.staging_cache import StagingCache, get_staging_cache
 from app.services.storage_service import S3StorageService
 from app.services.workspace_manager import WorkspaceManager
 
@@ -18,9 +19,11 @@ class PluginStager:
         self,
         storage_service: S3StorageService | None = None,
         workspace_manager: WorkspaceManager | None = None,
+        staging_cache: StagingCache | None = None,
     ) -> None:
         self.storage_service = storage_service or S3StorageService()
         self.workspace_manager = workspace_manager or WorkspaceManager()
+        self.staging_cache = staging_cache or get_staging_cache()
 
     @staticmethod
     def _validate_plugin_name(name: str) -> None:
@@ -96,7 +99,13 @@ class PluginStager:
 
             try:
                 step_started = time.perf_counter()
-                if entry.get("is_prefix") or str(s3_key).endswith("/"):
+                is_prefix = bool(entry.get("is_prefix")) or str(s3_key).endswith("/")
+                cache_result: dict[str, Any] = {}
+                if self.staging_cache is not None:
+                    cache_result = self.staging_cache.stage(
+                        s3_key=str(s3_key), is_prefix=is_prefix, target_dir=target_dir
+                    )
+                elif is_prefix:
                     self.storage_service.download_prefix(
                         prefix=str(s3_key), destination_dir=target_dir
                     )
@@ -115,8 +124,10 @@ class PluginStager:
                         "session_id": session_id,
                         "plugin_name": name,
                         "s3_key": str(s3_key),
-                        "is_prefix": bool(entry.get("is_prefix"))
-                        or str(s3_key).endswith("/"),
+                        "is_prefix": is_prefix,
+                        "cache_hit": cache_result.get("cache_hit"),
+                        "unchanged": cache_result.get("unchanged"),
+                        "bytes": cache_result.get("bytes"),
                     },
                 )
             except Exception as exc:
@@ -6,20 +6,22 @@ import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+import httpx
+
 from app.core.settings import get_settings
 from app.scheduler.task_dispatcher import TaskDispatcher
 from app.services.backend_client import BackendClient
 from app.services.executor_client import ExecutorClient
 from app.services.config_resolver import ConfigResolver
-from app.services.skill_stager import SkillStager
-from app.services.plugin_stager import PluginStager
-from app.services.attachment_stager import AttachmentStager
-from app.services.claude_md_stager import ClaudeMdStager
-from app.services.slash_command_stager import SlashCommandStager
-from app.services.sub_agent_stager import SubAgentStager
+from app.services.dispatch_pipeline import DispatchPipeline
 
 logger = logging.getLogger(__name__)
 
+# Must not exceed the backend's RunBatchClaimRequest.limit bound.
+_MAX_CLAIM_BATCH = 50
+# Must not exceed the backend's RunWaitRequest.timeout_seconds bound.
+_MAX_LONG_POLL_SECONDS = 60
+
 
 class RunPullService:
     """Background service that pulls queued runs from Backend and dispatches them."""
@@ -30,12 +32,11 @@ class RunPullService:
         self.executor_client = ExecutorClient()
         self.container_pool = TaskDispatcher.get_container_pool()
         self.config_resolver = ConfigResolver(self.backend_client)
-        self.skill_stager = SkillStager()
-        self.plugin_stager = PluginStager()
-        self.attachment_stager = AttachmentStager()
-        self.claude_md_stager = ClaudeMdStager()
-        self.slash_command_stager = SlashCommandStager()
-        self.subagent_stager = SubAgentStager()
+        self.dispatch_pipeline = DispatchPipeline(
+            backend_client=self.backend_client,
+            container_pool=self.container_pool,
+            config_resolver=self.config_resolver,
+        )
 
         self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
         self._semaphore = asyncio.Semaphore(self.settings.max_concurrent_tasks)
@@ -44,6 +45,10 @@ class RunPullService:
         self._logged_started = False
         self._windows_until: dict[str, datetime] = {}
         self._window_locks: dict[str, asyncio.Lock] = {}
+        self._wake_tasks: dict[str, asyncio.Task[None]] = {}
+        # Keyed by schedule modes: last successful long-poll / last safety-net poll.
+        self._wake_healthy_at: dict[tuple[str, ...], float] = {}
+        self._safety_polled_at: dict[tuple[str, ...], float] = {}
 
     def _get_window_lock(self, window_id: str) -> asyncio.Lock:
         lock = self._window_locks.get(window_id)
@@ -107,10 +112,125 @@ class RunPullService:
 
         await self.poll(schedule_modes=schedule_modes)
 
-    async def poll(self, schedule_modes: list[str] | None = None) -> None:
-        """Poll backend run queue and dispatch as many as capacity allows."""
+    @staticmethod
+    def _modes_key(schedule_modes: list[str] | None) -> tuple[str, ...]:
+        return tuple(sorted(schedule_modes or ()))
+
+    def _covered_by_wake_loop(self, schedule_modes: list[str] | None) -> bool:
+        """True when a healthy wake loop makes this interval poll redundant.
+
+        One interval poll per TASK_PULL_SAFETY_INTERVAL_SECONDS still goes through, to
+        pick up runs the backend can't notify about (e.g. released expired leases).
+        """
+        key = self._modes_key(schedule_modes)
+        healthy_at = self._wake_healthy_at.get(key)
+        now = time.monotonic()
+        max_gap = self._long_poll_seconds() + self.settings.http_timeout_seconds
+        if healthy_at is None or now - healthy_at > max_gap:
+            return False
+        safety_interval = max(1, int(self.settings.task_pull_safety_interval_seconds))
+        if now - self._safety_polled_at.get(key, 0.0) < safety_interval:
+            return True
+        self._safety_polled_at[key] = now
+        return False
+
+    def _long_poll_seconds(self) -> int:
+        return min(
+            _MAX_LONG_POLL_SECONDS,
+            max(1, int(self.settings.task_pull_long_poll_seconds)),
+        )
+
+    def start_wake_loop(
+        self, loop_id: str, schedule_modes: list[str] | None = None
+    ) -> None:
+        """Start (or restart) a long-poll loop claiming runs as soon as they're queued."""
         if self._shutdown:
             return
+        existing = self._wake_tasks.pop(loop_id, None)
+        if existing:
+            existing.cancel()
+        self._wake_tasks[loop_id] = asyncio.create_task(
+            self._wake_loop(loop_id, schedule_modes)
+        )
+
+    async def _wake_loop(
+        self, loop_id: str, schedule_modes: list[str] | None = None
+    ) -> None:
+        key = self._modes_key(schedule_modes)
+        timeout_seconds = self._long_poll_seconds()
+        backoff = 1.0
+        logger.info(
+            f"Run wake loop started (id={loop_id}, schedule_modes={schedule_modes}, "
+            f"timeout={timeout_seconds}s)"
+        )
+        while not self._shutdown:
+            # Only ask the backend once there is capacity to run what it offers.
+            async with self._semaphore:
+                pass
+
+            step_started = time.perf_counter()
+            try:
+                ready = await self.backend_client.wait_for_runs(
+                    timeout_seconds=timeout_seconds, schedule_modes=schedule_modes
+                )
+            except asyncio.CancelledError:
+                raise
+            except httpx.HTTPStatusError as e:
+                self._wake_healthy_at.pop(key, None)
+                if e.response.status_code in (404, 405):
+                    logger.warning(
+                        f"Backend does not support /runs/wait; run wake loop {loop_id} "
+                        "stopped, falling back to interval polling"
+                    )
+                    return
+                logger.warning(f"Run wake loop {loop_id} wait failed: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+            except Exception as e:
+                self._wake_healthy_at.pop(key, None)
+                logger.warning(f"Run wake loop {loop_id} wait failed: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+
+            self._wake_healthy_at[key] = time.monotonic()
+            if not ready:
+                backoff = 1.0
+                continue
+
+            waited_ms = int((time.perf_counter() - step_started) * 1000)
+            claimed = await self.poll(schedule_modes=schedule_modes, from_wake=True)
+            logger.info(
+                "timing",
+                extra={
+                    "step": "run_pull_wake",
+                    "duration_ms": waited_ms,
+                    "worker_id": self.worker_id,
+                    "schedule_modes": schedule_modes,
+                    "claimed": claimed,
+                },
+            )
+            if claimed:
+                backoff = 1.0
+            else:
+                # `ready` is only a hint: another worker may have won the race, or the
+                # queued runs can't be claimed yet (e.g. their session already has an
+                # active run). Back off so a lasting hint doesn't spin the loop.
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def poll(
+        self, schedule_modes: list[str] | None = None, *, from_wake: bool = False
+    ) -> int:
+        """Poll backend run queue and dispatch as many as capacity allows.
+
+        Returns the number of runs claimed.
+        """
+        if self._shutdown:
+            return 0
+        if not from_wake and self._covered_by_wake_loop(schedule_modes):
+            return 0
 
         lease_seconds = max(5, int(self.settings.task_claim_lease_seconds))
 
@@ -121,17 +241,23 @@ class RunPullService:
             )
             self._logged_started = True
 
+        claimed_total = 0
         while not self._shutdown and not self._semaphore.locked():
-            await self._semaphore.acquire()
+            # Reserve every free slot, then claim that many runs in one round trip.
+            slots = 0
+            while slots < _MAX_CLAIM_BATCH and not self._semaphore.locked():
+                await self._semaphore.acquire()
+                slots += 1
 
             try:
                 step_started = time.perf_counter()
-                claim = await self.backend_client.claim_run(
+                claims = await self.backend_client.claim_runs(
                     worker_id=self.worker_id,
+                    limit=slots,
                     lease_seconds=lease_seconds,
                     schedule_modes=schedule_modes,
                 )
-                if claim:
+                if claims:
                     logger.info(
                         "timing",
                         extra={
@@ -142,24 +268,38 @@ class RunPullService:
                             "worker_id": self.worker_id,
                             "lease_seconds": lease_seconds,
                             "schedule_modes": schedule_modes,
+                            "requested": slots,
+                            "claimed": len(claims),
                         },
                     )
             except Exception as e:
-                logger.error(f"Failed to claim run from backend: {e}")
-                self._semaphore.release()
-                return
+                logger.error(f"Failed to claim runs from backend: {e}")
+                for _ in range(slots):
+                    self._semaphore.release()
+                return claimed_total
 
-            if not claim:
+            claimed_total += len(claims)
+            for _ in range(slots - len(claims)):
                 self._semaphore.release()
-                return
 
-            task = asyncio.create_task(self._handle_claim(claim))
-            self._tasks.add(task)
-            task.add_done_callback(self._on_task_done)
+            for claim in claims:
+                task = asyncio.create_task(self._handle_claim(claim))
+                self._tasks.add(task)
+                task.add_done_callback(self._on_task_done)
+
+            if len(claims) < slots:
+                # Queue drained (or only blocked sessions remain).
+                return claimed_total
+        return claimed_total
 
     async def shutdown(self) -> None:
-        """Request shutdown and cancel inflight dispatch tasks."""
+        """Request shutdown and cancel wake loops and inflight dispatch tasks."""
         self._shutdown = True
+        wake_tasks = list(self._wake_tasks.values())
+        self._wake_tasks.clear()
+        for t in wake_tasks:
+            t.cancel()
+        await asyncio.gather(*wake_tasks, return_exceptions=True)
         await self._drain_tasks()
 
     def _on_task_done(self, task: asyncio.Task[None]) -> None:
@@ -208,173 +348,19 @@ class RunPullService:
         }
 
         try:
-            step_started = time.perf_counter()
-            resolved_config = await self.config_resolver.resolve(
-                user_id,
-                config_snapshot,
-                session_id=session_id,
-                run_id=str(run_id),
-            )
-            logger.info(
-                "timing",
-                extra={
-                    "step": "run_dispatch_resolve_config",
-                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                    **ctx,
-                },
-            )
-
-            step_started = time.perf_counter()
-            staged_skills = self.skill_stager.stage_skills(
-                user_id=user_id,
-                session_id=session_id,
-                skills=resolved_config.get("skill_files") or {},
-            )
-            resolved_config["skill_files"] = staged_skills
-            logger.info(
-                "timing",
-                extra={
-                    "step": "run_dispatch_stage_skills",
-                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                    "skills_staged": len(staged_skills),
-                    **ctx,
-                },
-            )
-
-            step_started = time.perf_counter()
-            staged_plugins = self.plugin_stager.stage_plugins(
-                user_id=user_id,
-                session_id=session_id,
-                plugins=resolved_config.get("plugin_files") or {},
-            )
-            resolved_config["plugin_files"] = staged_plugins
-            logger.info(
-                "timing",
-                extra={
-                    "step": "run_dispatch_stage_plugins",
-                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                    "plugins_staged": len(staged_plugins),
-                    **ctx,
-                },
-            )
-
-            step_started = time.perf_counter()
-            staged_inputs = self.attachment_stager.stage_inputs(
-                user_id=user_id,
-                session_id=session_id,
-                inputs=resolved_config.get("input_files") or [],
-            )
-            resolved_config["input_files"] = staged_inputs
-            logger.info(
-                "timing",
-                extra={
-                    "step": "run_dispatch_stage_inputs",
-                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                    "inputs_staged": len(staged_inputs),
-                    **ctx,
-                },
-            )
-
-            step_started = time.perf_counter()
-            resolved_commands = await self.backend_client.resolve_slash_commands(
-                user_id=user_id
-            )
-            staged_commands = self.slash_command_stager.stage_commands(
+            prepared = await self.dispatch_pipeline.prepare(
                 user_id=user_id,
                 session_id=session_id,
-                commands=resolved_commands,
-            )
-            logger.info(
-                "timing",
-                extra={
-                    "step": "run_dispatch_stage_slash_commands",
-                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                    "commands_staged": len(staged_commands),
-                    **ctx,
-                },
-            )
-
-            # Stage user-level CLAUDE.md (persistent instructions) into ~/.claude.
-            step_started = time.perf_counter()
-            try:
-                claude_md = await self.backend_client.get_claude_md(user_id=user_id)
-                enabled = bool(claude_md.get("enabled"))
-                content = (
-                    claude_md.get("content")
-                    if isinstance(claude_md.get("content"), str)
-                    else ""
-                )
-                staged_md = self.claude_md_stager.stage(
-                    user_id=user_id,
-                    session_id=session_id,
-                    enabled=enabled,
-                    content=content,
-                )
-                bytes_val = staged_md.get("bytes", 0)
-                logger.info(
-                    "timing",
-                    extra={
-                        "step": "run_dispatch_stage_claude_md",
-                        "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                        "enabled": bool(staged_md.get("enabled")),
-                        "bytes": int(bytes_val) if isinstance(bytes_val, int) else 0,
-                        **ctx,
-                    },
-                )
-            except Exception as exc:
-                # Best-effort: don't block execution if CLAUDE.md staging fails.
-                logger.warning(
-                    f"Failed to stage CLAUDE.md for session {session_id}: {exc}"
-                )
-
-            step_started = time.perf_counter()
-            raw_agents_val = resolved_config.pop("subagent_raw_agents", None)
-            raw_agents = raw_agents_val if isinstance(raw_agents_val, dict) else {}
-            try:
-                staged_agents = self.subagent_stager.stage_raw_agents(
-                    user_id=user_id,
-                    session_id=session_id,
-                    raw_agents=raw_agents,
-                )
-                logger.info(
-                    "timing",
-                    extra={
-                        "step": "run_dispatch_stage_subagents",
-                        "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                        "subagents_requested": len(raw_agents),
-                        "subagents_staged": len(staged_agents),
-                        **ctx,
-                    },
-                )
-            except Exception as exc:
-                # Best-effort: keep tasks running even if staging fails.
-                logger.warning(
-                    f"Failed to stage subagents for session {session_id}: {exc}"
-                )
-
-            step_started = time.perf_counter()
-            browser_enabled = bool(resolved_config.get("browser_enabled"))
-            (
-                executor_url,
-                container_id,
-            ) = await self.container_pool.get_or_create_container(
-                session_id=session_id,
-                user_id=user_id,
-                browser_enabled=browser_enabled,
+                config_snapshot=config_snapshot,
                 container_mode=container_mode,
                 container_id=container_id,
+                step_prefix="run_dispatch",
+                ctx=ctx,
+                run_id=str(run_id),
             )
-            logger.info(
-                "timing",
-                extra={
-                    "step": "run_dispatch_get_or_create_container",
-                    "duration_ms": int((time.perf_counter() - step_started) * 1000),
-                    "container_mode": container_mode,
-                    "container_id": container_id,
-                    "browser_enabled": browser_enabled,
-                    **ctx,
-                },
-            )
+            resolved_config = prepared.resolved_config
+            executor_url = prepared.executor_url
+            container_id = prepared.container_id
 
             step_started = time.perf_counter()
             await self.executor_client.execute_task(
@@ -388,6 +374,7 @@ class RunPullService:
                 callback_base_url=self.settings.callback_base_url,
                 sdk_session_id=sdk_session_id,
                 permission_mode=permission_mode,
+                state_seq=claim.get("state_seq"),
             )
             logger.info(
                 "timing",
@@ -0,0 +1,375 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import threading
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from app.core.settings import get_settings
+from app.services.storage_service import S3StorageService
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_NAME = "manifest.json"
+_FILES_DIR = "files"
+# Records of what was staged where (kept outside the workspace, which agents can see);
+# they let re-staging skip unchanged content.
+_STAGED_DIR = "staged"
+# Linux FICLONE ioctl: copy-on-write clone of a file (btrfs, XFS with reflink=1).
+_FICLONE = 0x40049409
+
+
+def _clone_file(src: Path, dst: Path, *, reflink: bool) -> bool:
+    """Copy src to dst, as a reflink when allowed and supported; returns True if so."""
+    if reflink:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+    return False
+
+
+def _snapshot_files(root: Path) -> list[dict[str, Any]]:
+    files: list[dict[str, Any]] = []
+    for path in root.rglob("*"):
+        if path.is_file():
+            st = path.stat()
+            files.append(
+                {
+                    "path": path.relative_to(root).as_posix(),
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                }
+            )
+    return files
+
+
+class StagingCache:
+    """Node-local, content-addressed cache for staged skills and plugins.
+
+    Entries are keyed by the S3 key plus the ETag/size of every object under it, so a
+    changed object produces a new entry. Entries live under the workspace root (same
+    filesystem as session workspaces) and are materialized into a session as private
+    copies (copy-on-write reflinks where the filesystem supports them), never as
+    hardlinks: executors run as root, so a shared inode would let one session's edits
+    leak into every other session staging the same entry. Cached files are verified
+    against their recorded size/mtime before reuse. Total size is bounded with LRU
+    eviction.
+    """
+
+    def __init__(
+        self,
+        *,
+        root: Path,
+        max_bytes: int,
+        storage_service: S3StorageService | None = None,
+    ) -> None:
+        self.root = root
+        self.entries_dir = root / "entries"
+        self.staged_dir = root / _STAGED_DIR
+        self.max_bytes = max(0, int(max_bytes))
+        self.storage_service = storage_service or S3StorageService()
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.staged_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entry_locks: dict[str, threading.Lock] = {}
+        self._pins: dict[str, int] = {}
+        self._entries: OrderedDict[str, int] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.unchanged = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from disk (recency = manifest mtime)."""
+        found: list[tuple[float, str, int]] = []
+        for entry in self.entries_dir.iterdir():
+            if entry.name.startswith("."):
+                # Leftover temp dir from an interrupted download.
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            manifest_file = entry / _MANIFEST_NAME
+            try:
+                manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+                found.append(
+                    (
+                        manifest_file.stat().st_mtime,
+                        entry.name,
+                        int(manifest.get("total_bytes", 0)),
+                    )
+                )
+            except Exception:
+                shutil.rmtree(entry, ignore_errors=True)
+        for _, digest, size in sorted(found):
+            self._entries[digest] = size
+
+        # Drop staging records of workspaces that no longer exist.
+        for record_file in self.staged_dir.glob("*.json"):
+            try:
+                record = json.loads(record_file.read_text(encoding="utf-8"))
+                if Path(record["target"]).is_dir():
+                    continue
+            except Exception:
+                pass
+            record_file.unlink(missing_ok=True)
+
+    @staticmethod
+    def _fingerprint(s3_key: str, objects: list[dict[str, Any]]) -> str:
+        payload = json.dumps(
+            {
+                "key": s3_key,
+                "objects": sorted(
+                    (o["relative"], o["etag"], o["size"]) for o in objects
+                ),
+            },
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _list_objects(self, s3_key: str, is_prefix: bool) -> list[dict[str, Any]]:
+        if not is_prefix:
+            meta = self.storage_service.head_object(s3_key)
+            return [{**meta, "relative": PurePosixPath(s3_key).name}]
+        objects: list[dict[str, Any]] = []
+        for meta in self.storage_service.list_object_meta(s3_key):
+            key = meta["key"]
+            if key.endswith("/"):
+                continue
+            relative = key[len(s3_key) :].lstrip("/")
+            if not relative:
+                continue
+            objects.append({**meta, "relative": relative})
+        return objects
+
+    def _entry_lock(self, digest: str) -> threading.Lock:
+        with self._lock:
+            lock = self._entry_locks.get(digest)
+            if lock is None:
+                lock = threading.Lock()
+                self._entry_locks[digest] = lock
+            return lock
+
+    @staticmethod
+    def _verify_entry(entry_dir: Path) -> dict[str, Any] | None:
+        """Return the manifest when every cached file still matches it."""
+        try:
+            manifest = json.loads(
+                (entry_dir / _MANIFEST_NAME).read_text(encoding="utf-8")
+            )
+            files_dir = entry_dir / _FILES_DIR
+            for item in manifest.get("files", []):
+                st = (files_dir / item["path"]).stat()
+                if st.st_size != item["size"] or st.st_mtime_ns != item["mtime_ns"]:
+                    return None
+            return manifest
+        except Exception:
+            return None
+
+    def _populate_entry(
+        self, digest: str, s3_key: str, objects: list[dict[str, Any]]
+    ) -> int:
+        tmp_dir = self.entries_dir / f".tmp-{digest}-{uuid.uuid4().hex[:8]}"
+        files_dir = tmp_dir / _FILES_DIR
+        files_dir.mkdir(parents=True)
+        try:
+            self.storage_service.download_objects(
+                objects=[(obj["key"], obj["relative"]) for obj in objects],
+                destination_dir=files_dir,
+            )
+            files: list[dict[str, Any]] = []
+            total = 0
+            for obj in objects:
+                target = S3StorageService._safe_destination(files_dir, obj["relative"])
+                os.chmod(target, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                st = target.stat()
+                files.append(
+                    {
+                        "path": target.relative_to(files_dir).as_posix(),
+                        "size": st.st_size,
+                        "mtime_ns": st.st_mtime_ns,
+                    }
+                )
+                total += st.st_size
+            manifest = {"s3_key": s3_key, "total_bytes": total, "files": files}
+            (tmp_dir / _MANIFEST_NAME).write_text(
+                json.dumps(manifest), encoding="utf-8"
+            )
+
+            entry_dir = self.entries_dir / digest
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            tmp_dir.rename(entry_dir)
+            return total
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _materialize(entry_dir: Path, target_dir: Path) -> bool:
+        """Copy cached files into target_dir; returns True if they were all reflinked."""
+        files_dir = entry_dir / _FILES_DIR
+        reflinked = True
+        for src in files_dir.rglob("*"):
+            rel = src.relative_to(files_dir)
+            dst = target_dir / rel
+            if src.is_dir():
+                dst.mkdir(parents=True, exist_ok=True)
+                continue
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            # After the first unsupported clone, plain copies from here on.
+            reflinked = _clone_file(src, dst, reflink=reflinked)
+        return reflinked
+
+    def _record_file(self, target_dir: Path) -> Path:
+        key = hashlib.sha256(str(target_dir.resolve()).encode("utf-8")).hexdigest()
+        return self.staged_dir / f"{key}.json"
+
+    def _is_staged(self, target_dir: Path, digest: str) -> bool:
+        """True when target_dir holds an untouched copy of the entry `digest`."""
+        try:
+            record = json.loads(
+                self._record_file(target_dir).read_text(encoding="utf-8")
+            )
+            if record.get("digest") != digest:
+                return False
+            return sorted(record["files"], key=lambda f: f["path"]) == sorted(
+                _snapshot_files(target_dir), key=lambda f: f["path"]
+            )
+        except Exception:
+            return False
+
+    def _record_staged(self, target_dir: Path, digest: str) -> None:
+        record = {
+            "target": str(target_dir.resolve()),
+            "digest": digest,
+            "files": _snapshot_files(target_dir),
+        }
+        self._record_file(target_dir).write_text(json.dumps(record), encoding="utf-8")
+
+    def _evict(self) -> None:
+        with self._lock:
+            total = sum(self._entries.values())
+            victims: list[str] = []
+            for digest, size in self._entries.items():
+                if total <= self.max_bytes:
+                    break
+                if self._pins.get(digest):
+                    continue
+                victims.append(digest)
+                total -= size
+            for digest in victims:
+                self._entries.pop(digest, None)
+                self._entry_locks.pop(digest, None)
+        for digest in victims:
+            shutil.rmtree(self.entries_dir / digest, ignore_errors=True)
+            self.evictions += 1
+            logger.info("staging_cache_evicted", extra={"digest": digest})
+
+    def stage(
+        self, *, s3_key: str, is_prefix: bool, target_dir: Path
+    ) -> dict[str, Any]:
+        """Stage an S3 object or prefix into target_dir through the cache.
+
+        Returns a summary with `cache_hit`, `unchanged` and `bytes` for timing logs.
+        """
+        objects = self._list_objects(s3_key, is_prefix)
+        digest = self._fingerprint(s3_key, objects)
+        total_bytes = sum(int(o["size"]) for o in objects)
+
+        if self._is_staged(target_dir, digest):
+            with self._lock:
+                self.unchanged += 1
+                self.bytes_saved += total_bytes
+            return {"cache_hit": True, "unchanged": True, "bytes": total_bytes}
+
+        entry_dir = self.entries_dir / digest
+        with self._lock:
+            self._pins[digest] = self._pins.get(digest, 0) + 1
+        try:
+            with self._entry_lock(digest):
+                # Check disk rather than the in-memory index: other manager processes
+                # sharing the cache directory may have populated this entry.
+                manifest = self._verify_entry(entry_dir)
+                cache_hit = manifest is not None
+                if manifest is None:
+                    size = self._populate_entry(digest, s3_key, objects)
+                    with self._lock:
+                        self._entries[digest] = size
+                        self.misses += 1
+                        self.bytes_downloaded += size
+                else:
+                    with self._lock:
+                        self._entries[digest] = int(manifest.get("total_bytes", 0))
+                        self.hits += 1
+                        self.bytes_saved += total_bytes
+                with self._lock:
+                    self._entries.move_to_end(digest)
+                os.utime(entry_dir / _MANIFEST_NAME)
+
+                if target_dir.exists():
+                    shutil.rmtree(target_dir)
+                target_dir.mkdir(parents=True, exist_ok=True)
+                reflinked = self._materialize(entry_dir, target_dir)
+                self._record_staged(target_dir, digest)
+        finally:
+            with self._lock:
+                self._pins[digest] -= 1
+                if not self._pins[digest]:
+                    self._pins.pop(digest, None)
+
+        self._evict()
+        return {
+            "cache_hit": cache_hit,
+            "unchanged": False,
+            "bytes": total_bytes,
+            "reflinked": reflinked,
+        }
+
+    def get_stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.unchanged
+            return {
+                "entries": len(self._entries),
+                "size_bytes": sum(self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "unchanged": self.unchanged,
+                "hit_ratio": (
+                    round((self.hits + self.unchanged) / lookups, 4) if lookups else 0.0
+                ),
+                "evictions": self.evictions,
+                "bytes_saved": self.bytes_saved,
+                "bytes_downloaded": self.bytes_downloaded,
+            }
+
+
+@lru_cache
+def get_staging_cache() -> StagingCache | None:
+    """Process-wide staging cache, or None when disabled."""
+    settings = get_settings()
+    if not settings.staging_cache_enabled:
+        return None
+    root = (settings.staging_cache_dir or "").strip()
+    return StagingCache(
+        root=Path(root)
+        if root
+        else Path(settings.workspace_root) / "cache" / "staging",
+        max_bytes=settings.staging_cache_max_bytes,
+    )
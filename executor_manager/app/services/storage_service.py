@@ -1,8 +1,17 @@
+import io
 import logging
+import queue
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path, PurePosixPath
-from typing import Any, Iterable
+from typing import Any, BinaryIO
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
@@ -13,6 +22,122 @@ from app.core.settings import get_settings
 logger = logging.getLogger(__name__)
 
 
+@lru_cache
+def _get_s3_client() -> Any:
+    """Process-wide boto3 S3 client.
+
+    boto3 clients are thread-safe; sharing one keeps a single connection pool (sized by
+    S3_MAX_POOL_CONNECTIONS) across all services and download/upload worker threads.
+    """
+    settings = get_settings()
+    config_kwargs: dict[str, Any] = {
+        "connect_timeout": settings.s3_connect_timeout_seconds,
+        "read_timeout": settings.s3_read_timeout_seconds,
+        "retries": {
+            "max_attempts": settings.s3_max_attempts,
+            "mode": "standard",
+        },
+        "max_pool_connections": max(1, settings.s3_max_pool_connections),
+    }
+    if settings.s3_force_path_style:
+        config_kwargs["s3"] = {"addressing_style": "path"}
+    config = Config(**config_kwargs) if config_kwargs else None
+
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.s3_endpoint,
+        aws_access_key_id=settings.s3_access_key,
+        aws_secret_access_key=settings.s3_secret_key,
+        region_name=settings.s3_region,
+        config=config,
+    )
+
+
+class _StreamPipe(io.RawIOBase):
+    """Bounded in-memory pipe from a producer thread to an S3 streaming upload.
+
+    The producer's writes block once `max_chunks` are buffered, so memory stays at
+    roughly one multipart part regardless of the stream size. A producer failure is
+    re-raised on the reader side, which makes the transfer abort its multipart upload
+    instead of completing a truncated object.
+    """
+
+    _EOF = object()
+
+    def __init__(self, max_chunks: int = 8) -> None:
+        super().__init__()
+        self._chunks: queue.Queue[Any] = queue.Queue(maxsize=max_chunks)
+        self._buffer = bytearray()
+        self._eof = False
+        self._reader_closed = threading.Event()
+
+    # Producer side.
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        if chunk:
+            self._put(chunk)
+        return len(chunk)
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self._put(error if error is not None else self._EOF)
+
+    def _put(self, item: Any) -> None:
+        while True:
+            if self._reader_closed.is_set():
+                raise BrokenPipeError("Stream upload was aborted")
+            try:
+                self._chunks.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    # Consumer side.
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            item = self._chunks.get()
+            if item is self._EOF:
+                self._eof = True
+            elif isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            else:
+                self._buffer += item
+        # Consume from the front in place; re-slicing an immutable buffer on every
+        # read would copy the whole remainder each time.
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+    def close_reader(self) -> None:
+        self._reader_closed.set()
+
+
+@lru_cache
+def _get_transfer_config() -> TransferConfig:
+    """Multipart settings shared by all uploads and downloads.
+
+    Individual part requests are retried by botocore (S3_MAX_ATTEMPTS); a file whose
+    transfer still fails is retried as a whole by `upload_objects`.
+    """
+    settings = get_settings()
+    mb = 1024 * 1024
+    return TransferConfig(
+        multipart_threshold=max(5, settings.s3_multipart_threshold_mb) * mb,
+        multipart_chunksize=max(5, settings.s3_multipart_chunksize_mb) * mb,
+        max_concurrency=max(1, settings.s3_multipart_max_concurrency),
+    )
+
+
 class S3StorageService:
     def __init__(self) -> None:
         settings = get_settings()
@@ -33,27 +158,11 @@ class S3StorageService:
             )
 
         self.bucket = settings.s3_bucket
-
-        config_kwargs: dict[str, Any] = {
-            "connect_timeout": settings.s3_connect_timeout_seconds,
-            "read_timeout": settings.s3_read_timeout_seconds,
-            "retries": {
-                "max_attempts": settings.s3_max_attempts,
-                "mode": "standard",
-            },
-        }
-        if settings.s3_force_path_style:
-            config_kwargs["s3"] = {"addressing_style": "path"}
-        config = Config(**config_kwargs) if config_kwargs else None
-
-        self.client = boto3.client(
-            "s3",
-            endpoint_url=settings.s3_endpoint,
-            aws_access_key_id=settings.s3_access_key,
-            aws_secret_access_key=settings.s3_secret_key,
-            region_name=settings.s3_region,
-            config=config,
-        )
+        self.download_max_workers = max(1, settings.s3_download_max_workers)
+        self.upload_max_workers = max(1, settings.s3_upload_max_workers)
+        self.upload_max_attempts = max(1, settings.s3_upload_max_attempts)
+        self.client = _get_s3_client()
+        self.transfer_config = _get_transfer_config()
 
     def upload_file(
         self, *, file_path: str, key: str, content_type: str | None = None
@@ -62,12 +171,13 @@ class S3StorageService:
         if content_type:
             extra_args["ContentType"] = content_type
         try:
-            if extra_args:
-                self.client.upload_file(
-                    file_path, self.bucket, key, ExtraArgs=extra_args
-                )
-            else:
-                self.client.upload_file(file_path, self.bucket, key)
+            self.client.upload_file(
+                file_path,
+                self.bucket,
+                key,
+                ExtraArgs=extra_args or None,
+                Config=self.transfer_config,
+            )
         except (ClientError, BotoCoreError) as exc:
             logger.error(f"Failed to upload {file_path} to {key}: {exc}")
             raise AppException(
@@ -76,6 +186,201 @@ class S3StorageService:
                 details={"key": key, "file_path": file_path, "error": str(exc)},
             ) from exc
 
+    def object_exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as exc:
+            code = str(exc.response.get("Error", {}).get("Code") or "")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            logger.error(f"Failed to head object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to read object metadata",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+        except BotoCoreError as exc:
+            logger.error(f"Failed to head object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to read object metadata",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def touch_object(self, key: str, content_type: str | None = None) -> None:
+        """Refresh an object's last-modified time with a server-side self-copy."""
+        extra_args: dict[str, Any] = {"MetadataDirective": "REPLACE"}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        try:
+            self.client.copy(
+                {"Bucket": self.bucket, "Key": key},
+                self.bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config,
+            )
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to touch object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to refresh workspace object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def _upload_one(
+        self, file_path: str, key: str, content_type: str | None, skip_existing: bool
+    ) -> bool:
+        """Upload a file unless skip_existing and the key exists; True if uploaded.
+
+        An existing key is touched instead, so garbage collection measures its grace
+        period from this reuse rather than from the original upload.
+        """
+        if skip_existing and self.object_exists(key):
+            self.touch_object(key, content_type)
+            return False
+        self._upload_with_retry(file_path, key, content_type)
+        return True
+
+    def _upload_with_retry(
+        self, file_path: str, key: str, content_type: str | None
+    ) -> None:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.upload_file(
+                    file_path=file_path, key=key, content_type=content_type
+                )
+                return
+            except AppException:
+                if attempt >= self.upload_max_attempts:
+                    raise
+                logger.warning(
+                    "s3_upload_retry",
+                    extra={"key": key, "attempt": attempt},
+                )
+                time.sleep(random.uniform(0, min(5.0, 0.5 * 2 ** (attempt - 1))))
+
+    def upload_objects(
+        self,
+        *,
+        files: list[tuple[str, str, str | None]],
+        max_workers: int | None = None,
+        skip_existing: bool = False,
+    ) -> dict[str, int | float]:
+        """Upload `(file_path, key, content_type)` triples concurrently.
+
+        Uploads run on a bounded worker pool sharing the process-wide S3 client; files
+        above S3_MULTIPART_THRESHOLD_MB are split into parts uploaded in parallel.
+        A failed file is retried with jittered backoff before the batch fails. With
+        `skip_existing` (content-addressed keys), keys already in the bucket are not
+        uploaded again but touched, which restarts their GC grace period.
+        """
+        started = time.perf_counter()
+        sizes = {file_path: Path(file_path).stat().st_size for file_path, _, _ in files}
+        uploaded: list[str] = []
+
+        workers = max(1, min(max_workers or self.upload_max_workers, len(files)))
+        if workers == 1:
+            for file_path, key, content_type in files:
+                if self._upload_one(file_path, key, content_type, skip_existing):
+                    uploaded.append(file_path)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="s3-upload"
+            ) as pool:
+                futures = {
+                    pool.submit(
+                        self._upload_one, file_path, key, content_type, skip_existing
+                    ): file_path
+                    for file_path, key, content_type in files
+                }
+                try:
+                    for future in as_completed(futures):
+                        if future.result():
+                            uploaded.append(futures[future])
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        total_bytes = sum(sizes[file_path] for file_path in uploaded)
+
+        duration_s = time.perf_counter() - started
+        throughput = round(total_bytes / duration_s / 1024**2, 2) if duration_s else 0.0
+        logger.info(
+            "timing",
+            extra={
+                "step": "s3_upload_objects",
+                "duration_ms": int(duration_s * 1000),
+                "files": len(files),
+                "uploaded": len(uploaded),
+                "bytes": total_bytes,
+                "workers": workers,
+                "throughput_mb_s": throughput,
+            },
+        )
+        return {
+            "files": len(files),
+            "uploaded": len(uploaded),
+            "bytes": total_bytes,
+            "duration_ms": int(duration_s * 1000),
+            "throughput_mb_s": throughput,
+        }
+
+    def upload_stream(
+        self,
+        *,
+        key: str,
+        producer: Callable[[BinaryIO], None],
+        content_type: str | None = None,
+    ) -> None:
+        """Upload what `producer` writes to its stream, without a temp file.
+
+        The producer runs in a worker thread while the calling thread streams its
+        output to S3 as a multipart upload; nothing larger than a few parts is held in
+        memory. If either side fails the multipart upload is aborted.
+        """
+        pipe = _StreamPipe()
+
+        def produce() -> None:
+            try:
+                producer(pipe)  # type: ignore[arg-type]
+            except BaseException as exc:  # noqa: BLE001 - re-raised on the reader side
+                try:
+                    pipe.finish(exc)
+                except BrokenPipeError:
+                    pass
+                return
+            try:
+                pipe.finish()
+            except BrokenPipeError:
+                pass
+
+        thread = threading.Thread(target=produce, name="s3-stream", daemon=True)
+        thread.start()
+        extra_args = {"ContentType": content_type} if content_type else None
+        try:
+            self.client.upload_fileobj(
+                pipe,
+                self.bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config,
+            )
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to stream upload to {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to upload workspace file",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+        finally:
+            pipe.close_reader()
+            thread.join()
+
     def put_object(
         self,
         *,
@@ -96,6 +401,32 @@ class S3StorageService:
                 details={"key": key, "error": str(exc)},
             ) from exc
 
+    def delete_objects(self, keys: list[str]) -> int:
+        """Delete keys in batches of 1000 (the S3 DeleteObjects limit)."""
+        deleted = 0
+        for start in range(0, len(keys), 1000):
+            batch = keys[start : start + 1000]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True},
+                )
+            except (ClientError, BotoCoreError) as exc:
+                logger.error(f"Failed to delete {len(batch)} objects: {exc}")
+                raise AppException(
+                    error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                    message="Failed to delete objects",
+                    details={"keys": batch[:10], "error": str(exc)},
+                ) from exc
+            errors = response.get("Errors") or []
+            if errors:
+                logger.warning(
+                    "s3_delete_objects_partial_failure",
+                    extra={"failed": len(errors), "first_error": errors[0]},
+                )
+            deleted += len(batch) - len(errors)
+        return deleted
+
     def list_objects(self, prefix: str) -> Iterable[str]:
         try:
             paginator = self.client.get_paginator("list_objects_v2")
@@ -112,10 +443,71 @@ class S3StorageService:
                 details={"prefix": prefix, "error": str(exc)},
             ) from exc
 
+    def list_object_meta(self, prefix: str) -> list[dict[str, Any]]:
+        """List objects under a prefix with their ETag, size and modification time."""
+        objects: list[dict[str, Any]] = []
+        try:
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for item in page.get("Contents", []) or []:
+                    key = item.get("Key")
+                    if key:
+                        objects.append(
+                            {
+                                "key": key,
+                                "etag": str(item.get("ETag") or "").strip('"'),
+                                "size": int(item.get("Size") or 0),
+                                "last_modified": item.get("LastModified"),
+                            }
+                        )
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to list objects for {prefix}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to list objects",
+                details={"prefix": prefix, "error": str(exc)},
+            ) from exc
+        return objects
+
+    def head_object(self, key: str) -> dict[str, Any]:
+        """Fetch ETag and size for a single object."""
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=key)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to head object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to read object metadata",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+        return {
+            "key": key,
+            "etag": str(response.get("ETag") or "").strip('"'),
+            "size": int(response.get("ContentLength") or 0),
+        }
+
+    def get_object(self, key: str) -> bytes:
+        """Read a (small) object into memory."""
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"].read()
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to read object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to read object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
     def download_file(self, *, key: str, destination: Path) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        self._download_to(key, destination)
+
+    def _download_to(self, key: str, destination: Path) -> None:
         try:
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            self.client.download_file(self.bucket, key, str(destination))
+            self.client.download_file(
+                self.bucket, key, str(destination), Config=self.transfer_config
+            )
         except (ClientError, BotoCoreError) as exc:
             logger.error(f"Failed to download {key}: {exc}")
             raise AppException(
@@ -124,15 +516,95 @@ class S3StorageService:
                 details={"key": key, "error": str(exc)},
             ) from exc
 
-    def download_prefix(self, *, prefix: str, destination_dir: Path) -> None:
+    def download_objects(
+        self,
+        *,
+        objects: list[tuple[str, str]],
+        destination_dir: Path,
+        max_workers: int | None = None,
+    ) -> dict[str, int]:
+        """Download `(key, relative_path)` pairs into destination_dir concurrently.
+
+        Every destination is validated with `_safe_destination` before any download
+        starts, parent directories are created in one pass, and downloads run on a
+        bounded worker pool sharing the process-wide S3 client. Each destination is
+        written once: for repeated destinations the last pair wins, as it would when
+        downloading sequentially.
+        """
+        started = time.perf_counter()
+        by_target: dict[Path, str] = {}
+        for key, relative in objects:
+            target = self._safe_destination(destination_dir, relative)
+            previous = by_target.pop(target, None)
+            if previous is not None and previous != key:
+                logger.warning(
+                    "s3_download_duplicate_destination",
+                    extra={"path": str(target), "dropped_key": previous, "key": key},
+                )
+            by_target[target] = key
+        targets = [(key, target) for target, key in by_target.items()]
+        for parent in sorted({target.parent for _, target in targets}):
+            parent.mkdir(parents=True, exist_ok=True)
+
+        workers = max(1, min(max_workers or self.download_max_workers, len(targets)))
+        if workers == 1:
+            for key, target in targets:
+                self._download_to(key, target)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="s3-download"
+            ) as pool:
+                futures = [
+                    pool.submit(self._download_to, key, target)
+                    for key, target in targets
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        total_bytes = sum(target.stat().st_size for _, target in targets)
+        duration_s = time.perf_counter() - started
+        logger.info(
+            "timing",
+            extra={
+                "step": "s3_download_objects",
+                "duration_ms": int(duration_s * 1000),
+                "files": len(targets),
+                "bytes": total_bytes,
+                "workers": workers,
+                "throughput_mb_s": (
+                    round(total_bytes / duration_s / 1024**2, 2) if duration_s else 0.0
+                ),
+            },
+        )
+        return {
+            "files": len(targets),
+            "bytes": total_bytes,
+            "duration_ms": int(duration_s * 1000),
+        }
+
+    def download_prefix(
+        self,
+        *,
+        prefix: str,
+        destination_dir: Path,
+        max_workers: int | None = None,
+    ) -> dict[str, int]:
+        objects: list[tuple[str, str]] = []
         for key in self.list_objects(prefix):
             if key.endswith("/"):
                 continue
             relative = key[len(prefix) :].lstrip("/")
             if not relative:
                 continue
-            target = self._safe_destination(destination_dir, relative)
-            self.download_file(key=key, destination=target)
+            objects.append((key, relative))
+        return self.download_objects(
+            objects=objects, destination_dir=destination_dir, max_workers=max_workers
+        )
 
     @staticmethod
     def _safe_destination(destination_dir: Path, relative: str) -> Path:
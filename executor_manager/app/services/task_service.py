@@ -231,13 +231,12 @@ class TaskService:
         backend_client = BackendClient()
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{backend_client.settings.backend_url}/api/v1/sessions/{session_id}",
-                    headers=backend_client._trace_headers(),
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await backend_client.http.get(
+                f"{backend_client.settings.backend_url}/api/v1/sessions/{session_id}",
+                headers=backend_client._trace_headers(),
+            )
+            response.raise_for_status()
+            data = response.json()
 
             # Parse backend response (backend returns wrapped ResponseSchema)
             session_data = data.get("data", data)
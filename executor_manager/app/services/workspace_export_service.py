@@ -1,13 +1,20 @@
+import asyncio
+import hashlib
 import json
 import logging
 import mimetypes
 import os
-import zipfile
-from datetime import datetime, timezone
+import threading
+import time
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
+from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
 from app.schemas.workspace import WorkspaceExportResult
+from app.services.backend_client import BackendClient
 from app.services.storage_service import S3StorageService
 from app.services.workspace_manager import WorkspaceManager
 
@@ -18,7 +25,28 @@ workspace_manager = WorkspaceManager()
 storage_service = S3StorageService()
 
 
+# Local copy of the last exported manifest, kept next to meta.json (outside the
+# exported workspace directory) so incremental exports don't need to fetch it.
+_EXPORT_STATE_NAME = "export_manifest.json"
+_HASH_CHUNK_SIZE = 1024 * 1024
+_MANIFEST_NAME = "manifest.json"
+# Session ids per backend liveness query (the endpoint accepts up to 1000).
+_GC_SESSION_BATCH = 500
+
+
 class WorkspaceExportService:
+    def __init__(self) -> None:
+        self._session_locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _session_lock(self, session_id: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._session_locks[session_id] = lock
+            return lock
+
     def export_workspace(self, session_id: str) -> WorkspaceExportResult:
         user_id = workspace_manager.resolve_user_id(session_id)
         if not user_id:
@@ -36,69 +64,157 @@ class WorkspaceExportService:
                 workspace_export_status="failed",
             )
 
+        # Serialize exports of one session: both diff against the same state file.
+        with self._session_lock(session_id):
+            result = self._export(user_id, session_id, workspace_dir)
+
+        # The run has settled, so this is a good point to record the workspace size.
+        try:
+            workspace_manager.refresh_workspace_size(user_id, session_id)
+        except Exception as exc:
+            logger.warning(f"Failed to refresh workspace size for {session_id}: {exc}")
+        return result
+
+    def _export(
+        self, user_id: str, session_id: str, workspace_dir: Path
+    ) -> WorkspaceExportResult:
+        """Upload only files that changed since the previous export.
+
+        Files whose size and mtime match the previous manifest are reused as-is;
+        otherwise the content hash decides whether an upload is needed (touched but
+        unchanged files are not re-uploaded). Per-session objects of removed files are
+        deleted; content-addressed blobs may be shared and are left to
+        `collect_garbage`.
+        When nothing changed, the manifest is left untouched. The zip archive is not
+        built here; the backend assembles it from the manifest on first download.
+        """
+        started = time.perf_counter()
         prefix = f"workspaces/{user_id}/{session_id}"
         files_prefix = f"{prefix}/files"
-        manifest_key = f"{prefix}/manifest.json"
-        archive_key = f"{prefix}/archive.zip"
+        manifest_key = f"{prefix}/{_MANIFEST_NAME}"
+        # Written eagerly by earlier versions; stale once the manifest changes.
+        legacy_archive_key = f"{prefix}/archive.zip"
+        state_file = workspace_dir.parent / _EXPORT_STATE_NAME
+        blob_prefix = self._blob_prefix(user_id)
 
         try:
             files = self._collect_files(workspace_dir)
+            previous, has_previous = self._load_previous_manifest(state_file)
             manifest = {
                 "version": 1,
-                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "generated_at": datetime.now(UTC).isoformat(),
                 "files": [],
             }
+            if blob_prefix:
+                manifest["blob_prefix"] = blob_prefix
 
+            uploads: dict[str, tuple[str, str, str | None]] = {}
+            stale_keys: list[str] = []
+            hashed = 0
             for file_path in files:
                 rel_path = file_path.relative_to(workspace_dir).as_posix()
-                object_key = f"{files_prefix}/{rel_path}"
                 mime_type, _ = mimetypes.guess_type(file_path.name)
+                st = file_path.stat()
+                prev = previous.pop(rel_path, None)
 
-                storage_service.upload_file(
-                    file_path=str(file_path),
-                    key=object_key,
-                    content_type=mime_type,
+                if (
+                    prev is not None
+                    and prev.get("sha256")
+                    and prev.get("size") == st.st_size
+                    and prev.get("mtime_ns") == st.st_mtime_ns
+                ):
+                    digest = prev["sha256"]
+                else:
+                    digest = self._hash_file(file_path)
+                    hashed += 1
+
+                object_key = (
+                    self._blob_key(blob_prefix, digest)
+                    if blob_prefix
+                    else f"{files_prefix}/{rel_path}"
                 )
+                prev_key = prev.get("key") if prev is not None else None
+                if prev_key != object_key or prev.get("sha256") != digest:
+                    # Identical content within one export is uploaded once.
+                    uploads.setdefault(
+                        object_key, (str(file_path), object_key, mime_type)
+                    )
+                    if prev_key and prev_key != object_key:
+                        stale_keys.append(prev_key)
 
                 manifest["files"].append(
                     {
                         "path": rel_path,
                         "key": object_key,
-                        "size": file_path.stat().st_size,
+                        "size": st.st_size,
                         "mimeType": mime_type,
                         "status": "uploaded",
                         "last_modified": datetime.fromtimestamp(
-                            file_path.stat().st_mtime, tz=timezone.utc
+                            st.st_mtime, tz=UTC
                         ).isoformat(),
+                        "mtime_ns": st.st_mtime_ns,
+                        "sha256": digest,
                     }
                 )
 
-            storage_service.put_object(
-                key=manifest_key,
-                body=json.dumps(manifest, ensure_ascii=False).encode("utf-8"),
-                content_type="application/json",
-            )
+            upload_summary: dict[str, int | float] = {
+                "uploaded": 0,
+                "bytes": 0,
+                "duration_ms": 0,
+                "throughput_mb_s": 0.0,
+            }
+            if uploads:
+                upload_summary = storage_service.upload_objects(
+                    files=list(uploads.values()), skip_existing=bool(blob_prefix)
+                )
 
-            archive_path = self._create_archive(
-                workspace_dir=workspace_dir,
-                session_id=session_id,
-                files=files,
-            )
-            storage_service.upload_file(
-                file_path=str(archive_path),
-                key=archive_key,
-                content_type="application/zip",
+            # Whatever is left in `previous` no longer exists in the workspace.
+            stale_keys.extend(
+                item["key"] for item in previous.values() if item.get("key")
             )
+            removed_keys = [
+                key
+                for key in stale_keys
+                if isinstance(key, str) and key.startswith(f"{files_prefix}/")
+            ]
 
-            try:
-                archive_path.unlink(missing_ok=True)
-            except Exception:
-                logger.warning(f"Failed to cleanup archive temp file: {archive_path}")
+            changed = bool(uploads or previous or stale_keys)
+            if removed_keys or changed:
+                storage_service.delete_objects(
+                    removed_keys + ([legacy_archive_key] if changed else [])
+                )
+
+            # A rehashed file with the same content only refreshes the local state.
+            if changed or not has_previous:
+                storage_service.put_object(
+                    key=manifest_key,
+                    body=json.dumps(manifest, ensure_ascii=False).encode("utf-8"),
+                    content_type="application/json",
+                )
+
+            self._save_manifest_state(state_file, manifest)
+            logger.info(
+                "timing",
+                extra={
+                    "step": "workspace_export",
+                    "duration_ms": int((time.perf_counter() - started) * 1000),
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "files": len(files),
+                    "hashed": hashed,
+                    "uploaded": upload_summary["uploaded"],
+                    "deduplicated": len(uploads) - upload_summary["uploaded"],
+                    "uploaded_bytes": upload_summary["bytes"],
+                    "upload_ms": upload_summary["duration_ms"],
+                    "upload_throughput_mb_s": upload_summary["throughput_mb_s"],
+                    "removed": len(removed_keys),
+                    "incremental": has_previous,
+                },
+            )
 
             return WorkspaceExportResult(
                 workspace_files_prefix=files_prefix,
                 workspace_manifest_key=manifest_key,
-                workspace_archive_key=archive_key,
                 workspace_export_status="ready",
             )
         except AppException as exc:
@@ -112,6 +228,160 @@ class WorkspaceExportService:
                 error=str(exc), workspace_export_status="failed"
             )
 
+    async def collect_garbage(self) -> dict[str, int]:
+        """Mark-and-sweep exported objects.
+
+        Exports of sessions the backend reports as deleted are removed, then blobs
+        that no remaining manifest references are deleted once they are older than
+        the grace period (an export uploads its blobs before writing its manifest).
+        Manifests written while marking are read again before sweeping. Any manifest
+        that cannot be read aborts the run instead of risking live blobs.
+        """
+        settings = get_settings()
+        started = time.perf_counter()
+        mark_started = datetime.now(UTC)
+        objects = await asyncio.to_thread(
+            storage_service.list_object_meta, "workspaces/"
+        )
+        objects += await asyncio.to_thread(storage_service.list_object_meta, "blobs/")
+
+        blobs: list[dict[str, Any]] = []
+        session_keys: dict[str, list[str]] = {}
+        manifests: dict[str, str] = {}
+        for obj in objects:
+            parts = obj["key"].split("/")
+            if parts[0] == "blobs" or (len(parts) > 3 and parts[2] == "blobs"):
+                blobs.append(obj)
+            elif len(parts) > 3:
+                session_keys.setdefault(parts[2], []).append(obj["key"])
+                if len(parts) == 4 and parts[3] == _MANIFEST_NAME:
+                    manifests[parts[2]] = obj["key"]
+
+        backend = BackendClient()
+        deleted: set[str] = set()
+        session_ids = list(session_keys)
+        for start in range(0, len(session_ids), _GC_SESSION_BATCH):
+            deleted.update(
+                await backend.list_deleted_sessions(
+                    session_ids[start : start + _GC_SESSION_BATCH]
+                )
+            )
+        doomed = [key for sid in deleted for key in session_keys.get(sid, [])]
+
+        live_manifests = [key for sid, key in manifests.items() if sid not in deleted]
+        referenced = await asyncio.to_thread(self._referenced_keys, live_manifests)
+        rewritten = [
+            obj["key"]
+            for obj in await asyncio.to_thread(
+                storage_service.list_object_meta, "workspaces/"
+            )
+            if obj["key"].endswith(f"/{_MANIFEST_NAME}")
+            and obj["key"].split("/")[2] not in deleted
+            and (
+                obj.get("last_modified") is None or obj["last_modified"] >= mark_started
+            )
+        ]
+        referenced |= await asyncio.to_thread(self._referenced_keys, rewritten)
+
+        cutoff = mark_started - timedelta(
+            hours=max(0, settings.workspace_export_gc_grace_hours)
+        )
+        unreferenced = [
+            obj["key"]
+            for obj in blobs
+            if obj["key"] not in referenced
+            and obj.get("last_modified") is not None
+            and obj["last_modified"] < cutoff
+        ]
+        if doomed:
+            await asyncio.to_thread(storage_service.delete_objects, doomed)
+        if unreferenced:
+            await asyncio.to_thread(storage_service.delete_objects, unreferenced)
+
+        summary = {
+            "deleted_sessions": len(deleted),
+            "session_objects_deleted": len(doomed),
+            "blobs": len(blobs),
+            "blobs_deleted": len(unreferenced),
+        }
+        logger.info(
+            "timing",
+            extra={
+                "step": "workspace_export_gc",
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+                "manifests": len(live_manifests) + len(rewritten),
+                **summary,
+            },
+        )
+        return summary
+
+    @staticmethod
+    def _referenced_keys(manifest_keys: list[str]) -> set[str]:
+        referenced: set[str] = set()
+        for key in manifest_keys:
+            try:
+                manifest = json.loads(storage_service.get_object(key))
+            except ValueError:
+                manifest = None
+            if not isinstance(manifest, dict):
+                raise AppException(
+                    error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                    message="Unreadable workspace manifest",
+                    details={"key": key},
+                )
+            for item in manifest.get("files") or []:
+                if isinstance(item, dict) and isinstance(item.get("key"), str):
+                    referenced.add(item["key"])
+        return referenced
+
+    @staticmethod
+    def _blob_prefix(user_id: str) -> str | None:
+        scope = get_settings().workspace_export_dedup_scope
+        if scope == "global":
+            return "blobs/sha256"
+        if scope == "user":
+            return f"workspaces/{user_id}/blobs/sha256"
+        return None
+
+    @staticmethod
+    def _blob_key(blob_prefix: str, digest: str) -> str:
+        return f"{blob_prefix}/{digest[:2]}/{digest}"
+
+    @staticmethod
+    def _load_previous_manifest(
+        state_file: Path,
+    ) -> tuple[dict[str, dict[str, Any]], bool]:
+        """Return the previous manifest's files by path, and whether it was found."""
+        try:
+            data = json.loads(state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}, False
+        files = data.get("files") if isinstance(data, dict) else None
+        if not isinstance(files, list):
+            return {}, False
+        return (
+            {
+                item["path"]: item
+                for item in files
+                if isinstance(item, dict) and isinstance(item.get("path"), str)
+            },
+            True,
+        )
+
+    @staticmethod
+    def _save_manifest_state(state_file: Path, manifest: dict[str, Any]) -> None:
+        tmp_file = state_file.with_name(f".{state_file.name}.tmp")
+        tmp_file.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_file, state_file)
+
+    @staticmethod
+    def _hash_file(file_path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     def _collect_files(self, workspace_dir: Path) -> list[Path]:
         files: list[Path] = []
         ignore_names = workspace_manager._ignore_names
@@ -136,28 +406,6 @@ class WorkspaceExportService:
 
         return files
 
-    def _create_archive(
-        self,
-        *,
-        workspace_dir: Path,
-        session_id: str,
-        files: list[Path],
-    ) -> Path:
-        temp_dir = workspace_manager.temp_dir
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        archive_path = temp_dir / f"{session_id}.zip"
-
-        with zipfile.ZipFile(
-            archive_path,
-            "w",
-            compression=zipfile.ZIP_DEFLATED,
-        ) as zipf:
-            for file_path in files:
-                rel_path = file_path.relative_to(workspace_dir).as_posix()
-                zipf.write(file_path, arcname=f"workspace/{rel_path}")
-
-        return archive_path
-
     @staticmethod
     def _should_skip(path: Path, ignore_names: set[str], ignore_dot: bool) -> bool:
         name = path.name
@@ -1,17 +1,29 @@
+import base64
+import gzip
+import hashlib
 import json
 import logging
 import mimetypes
+import os
 import shutil
+import sqlite3
 import tarfile
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import BinaryIO, Literal
 
 from app.core.settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+_ARCHIVE_SUFFIXES = {"zstd": ".tar.zst", "gzip": ".tar.gz"}
+
 
 @dataclass
 class WorkspaceMeta:
@@ -23,17 +35,382 @@ class WorkspaceMeta:
     container_mode: Literal["ephemeral", "persistent"]
     workspace_path: str
     size_bytes: int = 0
+    size_updated_at: str | None = None
 
-    def to_dict(self) -> dict[str, str | int]:
+    def to_dict(self) -> dict[str, str | int | None]:
         return asdict(self)
 
 
+class _SessionIndex:
+    """Persistent session_id -> user_id index next to the workspaces (SQLite).
+
+    Shared by every WorkspaceManager on the same root (and by other processes through
+    the database file). Entries are advisory: callers verify a hit on disk and fall
+    back to a directory scan on a miss, so a stale or lost index (e.g. after a crash)
+    is repaired lazily, one lookup at a time.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cache: dict[str, str] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, user_id TEXT NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        """Drop a corrupt database; it is repopulated lazily."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+
+    def get(self, session_id: str) -> str | None:
+        with self._lock:
+            user_id = self._cache.get(session_id)
+        if user_id is not None:
+            return user_id
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT user_id FROM sessions WHERE session_id = ?", (session_id,)
+                )
+                .fetchone()
+            )
+        except sqlite3.DatabaseError as exc:
+            logger.warning(f"Session index unreadable, resetting: {exc}")
+            self._reset()
+            return None
+        if row is None:
+            return None
+        with self._lock:
+            self._cache[session_id] = row[0]
+        return row[0]
+
+    def put(self, session_id: str, user_id: str) -> None:
+        with self._lock:
+            if self._cache.get(session_id) == user_id:
+                return
+        try:
+            self._connect().execute(
+                "INSERT INTO sessions (session_id, user_id) VALUES (?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET user_id = excluded.user_id",
+                (session_id, user_id),
+            )
+        except sqlite3.DatabaseError as exc:
+            logger.warning(f"Failed to update session index, resetting: {exc}")
+            self._reset()
+            return
+        with self._lock:
+            self._cache[session_id] = user_id
+
+    def remove(self, session_id: str) -> None:
+        with self._lock:
+            self._cache.pop(session_id, None)
+        try:
+            self._connect().execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+        except sqlite3.DatabaseError as exc:
+            logger.warning(f"Failed to update session index: {exc}")
+
+
+@lru_cache
+def _get_session_index(db_path: Path) -> _SessionIndex:
+    return _SessionIndex(db_path)
+
+
+class _UsageLedger:
+    """In-memory disk usage totals for one workspace root, per session and per user.
+
+    Seeded on first use from the `size_bytes` recorded in each session's meta.json and
+    the archive tarball sizes (one small read per session instead of a stat per file),
+    then kept current by the WorkspaceManager as workspaces are measured, archived and
+    deleted. Sizes are as fresh as the last measurement; the periodic reconciler
+    re-measures everything and corrects drift.
+    """
+
+    def __init__(self, active_dir: Path, archive_dir: Path) -> None:
+        self.active_dir = active_dir
+        self.archive_dir = archive_dir
+        self.reconciled_at: str | None = None
+        self._lock = threading.Lock()
+        self._loaded = False
+        # session_id -> (user_id, size_bytes)
+        self._active: dict[str, tuple[str, int]] = {}
+        # archive path -> (user_id, size_bytes)
+        self._archives: dict[str, tuple[str, int]] = {}
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        active: dict[str, tuple[str, int]] = {}
+        for meta_file in self.active_dir.glob("*/*/meta.json"):
+            try:
+                data = json.loads(meta_file.read_text(encoding="utf-8"))
+                size = int(data.get("size_bytes") or 0)
+            except Exception:
+                size = 0
+            active[meta_file.parent.name] = (meta_file.parent.parent.name, size)
+        # Entries recorded before the first load are newer than meta.json.
+        active.update(self._active)
+        self._active = active
+        self._archives = {**_scan_archives(self.archive_dir), **self._archives}
+        self._loaded = True
+
+    def set_active(self, session_id: str, user_id: str, size_bytes: int) -> None:
+        with self._lock:
+            self._active[session_id] = (user_id, size_bytes)
+
+    def remove_active(self, session_id: str) -> None:
+        with self._lock:
+            self._active.pop(session_id, None)
+
+    def add_archive(self, archive_path: str, user_id: str, size_bytes: int) -> None:
+        with self._lock:
+            self._archives[archive_path] = (user_id, size_bytes)
+
+    def replace(
+        self,
+        active: dict[str, tuple[str, int]],
+        archives: dict[str, tuple[str, int]],
+    ) -> None:
+        with self._lock:
+            self._active = active
+            self._archives = archives
+            self._loaded = True
+            self.reconciled_at = datetime.now().isoformat()
+
+    def totals(self) -> dict[str, int]:
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                "active_bytes": sum(size for _, size in self._active.values()),
+                "archive_bytes": sum(size for _, size in self._archives.values()),
+                "active_workspaces": len(self._active),
+                "archived_workspaces": len(self._archives),
+                "users": len(
+                    {user for user, _ in self._active.values()}
+                    | {user for user, _ in self._archives.values()}
+                ),
+            }
+
+    def user_totals(self, user_id: str) -> dict[str, int]:
+        with self._lock:
+            self._ensure_loaded()
+            active = [size for user, size in self._active.values() if user == user_id]
+            archives = [
+                size for user, size in self._archives.values() if user == user_id
+            ]
+        return {
+            "active_bytes": sum(active),
+            "archive_bytes": sum(archives),
+            "active_workspaces": len(active),
+            "archived_workspaces": len(archives),
+        }
+
+
+@dataclass(frozen=True)
+class _DirEntry:
+    name: str
+    is_dir: bool
+    mime_type: str | None
+
+    @property
+    def sort_key(self) -> tuple[int, str, str]:
+        # Folders first, then case-insensitive name (the name itself breaks ties).
+        return (0 if self.is_dir else 1, self.name.lower(), self.name)
+
+
+class _DirListingCache:
+    """LRU cache of filtered, sorted directory listings, validated by directory mtime.
+
+    A directory's mtime changes whenever an entry is added, removed or renamed in it,
+    which is everything a listing shows, so a cached listing is served only while the
+    directory's mtime is unchanged. Listing a tree then costs one stat per directory
+    instead of a scandir, sort and stat per entry.
+    """
+
+    def __init__(self, max_dirs: int) -> None:
+        self.max_dirs = max(1, max_dirs)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[int, list[_DirEntry]]] = OrderedDict()
+
+    def get(self, path: str, mtime_ns: int) -> list[_DirEntry] | None:
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is None or cached[0] != mtime_ns:
+                return None
+            self._entries.move_to_end(path)
+            return cached[1]
+
+    def put(self, path: str, mtime_ns: int, entries: list[_DirEntry]) -> None:
+        with self._lock:
+            self._entries[path] = (mtime_ns, entries)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_dirs:
+                self._entries.popitem(last=False)
+
+
+@lru_cache
+def _get_dir_listing_cache(base_dir: Path) -> _DirListingCache:
+    return _DirListingCache(max_dirs=get_settings().workspace_file_tree_cache_max_dirs)
+
+
+def _encode_cursor(sort_key: tuple[int, str, str]) -> str:
+    raw = json.dumps(list(sort_key)).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        kind, lower, name = json.loads(raw)
+        return (int(kind), str(lower), str(name))
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+@lru_cache
+def _get_usage_ledger(base_dir: Path) -> _UsageLedger:
+    return _UsageLedger(base_dir / "active", base_dir / "archive")
+
+
+def _scan_archives(archive_dir: Path) -> dict[str, tuple[str, int]]:
+    """Map archive tarballs (`<user>/<date>/<session>.tar.*`) to (user_id, size)."""
+    archives: dict[str, tuple[str, int]] = {}
+    for archive_file in archive_dir.glob("*/*/*.tar.*"):
+        if not archive_file.name.endswith(tuple(_ARCHIVE_SUFFIXES.values())):
+            continue
+        try:
+            size = archive_file.stat().st_size
+        except OSError:
+            continue
+        archives[str(archive_file)] = (archive_file.parent.parent.name, size)
+    return archives
+
+
+class IoThrottle:
+    """Caps the combined byte rate of the threads sharing it (0 = unlimited)."""
+
+    # Up to this much unused budget may be spent in a burst.
+    _BURST_SECONDS = 1.0
+
+    def __init__(self, bytes_per_second: float) -> None:
+        self.bytes_per_second = max(0.0, float(bytes_per_second))
+        self._lock = threading.Lock()
+        self._next_free = time.monotonic()
+
+    def consume(self, size: int) -> None:
+        if self.bytes_per_second <= 0 or size <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_free, now - self._BURST_SECONDS)
+            self._next_free = start + size / self.bytes_per_second
+            delay = self._next_free - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _ThrottledWriter:
+    """Write-only file object that throttles writes before passing them on."""
+
+    def __init__(self, target: BinaryIO, throttle: IoThrottle | None) -> None:
+        self._target = target
+        self._throttle = throttle
+
+    def write(self, data: bytes) -> int:
+        if self._throttle is not None:
+            self._throttle.consume(len(data))
+        return self._target.write(data)
+
+
+@lru_cache
+def _resolve_archive_codec(codec: str) -> str:
+    if codec == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            logger.warning(
+                "zstd workspace archives requested but the 'zstandard' package is not "
+                "installed; falling back to gzip"
+            )
+            return "gzip"
+    return codec
+
+
+def _write_archive(
+    source: Path,
+    arcname: str,
+    destination: Path,
+    *,
+    codec: str,
+    level: int,
+    throttle: IoThrottle | None = None,
+) -> None:
+    """Stream `source` as a compressed tarball; `throttle` limits the bytes read."""
+    with open(destination, "wb") as raw:
+        if codec == "zstd":
+            import zstandard
+
+            compressor = zstandard.ZstdCompressor(
+                level=min(max(level, 1), 22)
+            ).stream_writer(raw, closefd=False)
+        else:
+            compressor = gzip.GzipFile(
+                fileobj=raw, mode="wb", compresslevel=min(max(level, 1), 9)
+            )
+        with compressor:
+            writer = _ThrottledWriter(compressor, throttle)
+            with tarfile.open(fileobj=writer, mode="w|") as tar:  # type: ignore[arg-type]
+                tar.add(source, arcname=arcname)
+
+
+def _measure_dir(path: Path) -> int:
+    """Total size of regular files under `path`, without following symlinks."""
+    total = 0
+    stack = [str(path)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
 class WorkspaceManager:
     settings: Settings
     base_dir: Path
     active_dir: Path
     archive_dir: Path
     temp_dir: Path
+    standby_dir: Path
+    standby_claims_dir: Path
 
     def __init__(self):
         self.settings = get_settings()
@@ -41,6 +418,14 @@ class WorkspaceManager:
         self.active_dir = self.base_dir / "active"
         self.archive_dir = self.base_dir / "archive"
         self.temp_dir = self.base_dir / "temp"
+        self.standby_dir = self.base_dir / "standby"
+        self.standby_claims_dir = self.base_dir / "standby-claims"
+        self.session_index = _get_session_index(self.base_dir / "index" / "sessions.db")
+        self.usage_ledger = _get_usage_ledger(self.base_dir)
+        self.dir_listing_cache = _get_dir_listing_cache(self.base_dir)
+        self.archive_codec = _resolve_archive_codec(
+            self.settings.workspace_archive_codec
+        )
         self.ignore_dot_files = self.settings.workspace_ignore_dot_files
 
         self._init_directories()
@@ -64,7 +449,13 @@ class WorkspaceManager:
 
     def _init_directories(self) -> None:
         """Initialize directory structure."""
-        for directory in [self.active_dir, self.archive_dir, self.temp_dir]:
+        for directory in [
+            self.active_dir,
+            self.archive_dir,
+            self.temp_dir,
+            self.standby_dir,
+            self.standby_claims_dir,
+        ]:
             directory.mkdir(parents=True, exist_ok=True)
             logger.debug("workspace_dir_ready", extra={"path": str(directory)})
 
@@ -86,6 +477,7 @@ class WorkspaceManager:
             (session_dir / "logs").mkdir(exist_ok=True)
 
             self._write_meta(session_dir, user_id, session_id)
+            self.session_index.put(session_id, user_id)
 
         return session_dir
 
@@ -102,92 +494,195 @@ class WorkspaceManager:
         return workspace_dir
 
     def resolve_user_id(self, session_id: str) -> str | None:
-        """Resolve user_id for a session by scanning workspace roots."""
+        """Resolve user_id for a session via the session index.
+
+        Falls back to scanning workspace roots when the index has no (valid) entry,
+        and records the result so the next lookup is O(1).
+        """
+        user_id = self.session_index.get(session_id)
+        if user_id is not None:
+            if (self.active_dir / user_id / session_id).exists():
+                return user_id
+            self.session_index.remove(session_id)
+
         if not self.active_dir.exists():
             return None
         for user_dir in self.active_dir.iterdir():
             if not user_dir.is_dir():
                 continue
             if (user_dir / session_id).exists():
+                self.session_index.put(session_id, user_dir.name)
                 return user_dir.name
         return None
 
-    def list_workspace_files(
+    def _list_dir(self, path: Path) -> tuple[int, list[_DirEntry]]:
+        """Return (mtime_ns, visible entries) of a directory, cached by mtime."""
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return 0, []
+        key = str(path)
+        cached = self.dir_listing_cache.get(key, mtime_ns)
+        if cached is not None:
+            return mtime_ns, cached
+
+        entries: list[_DirEntry] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name in self._ignore_names:
+                        continue
+                    if self.ignore_dot_files and entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_symlink():
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            entries.append(_DirEntry(entry.name, True, None))
+                        elif entry.is_file(follow_symlinks=False):
+                            mime_type, _ = mimetypes.guess_type(entry.name)
+                            entries.append(_DirEntry(entry.name, False, mime_type))
+                    except OSError:
+                        continue
+        except OSError:
+            return mtime_ns, []
+        entries.sort(key=lambda e: e.sort_key)
+        self.dir_listing_cache.put(key, mtime_ns, entries)
+        return mtime_ns, entries
+
+    @staticmethod
+    def _file_node(entry: _DirEntry, rel_path: str) -> dict:
+        if entry.is_dir:
+            return {
+                "id": rel_path,
+                "name": entry.name,
+                "type": "folder",
+                "path": rel_path,
+                "children": None,
+            }
+        return {
+            "id": rel_path,
+            "name": entry.name,
+            "type": "file",
+            "path": rel_path,
+            "mimeType": entry.mime_type,
+        }
+
+    def get_workspace_file_tree(
         self,
         user_id: str,
         session_id: str,
         *,
         max_depth: int = 8,
         max_entries: int = 4000,
-    ) -> list[dict]:
-        """List workspace files as a tree structure."""
+    ) -> tuple[list[dict], str | None]:
+        """List workspace files as a tree structure, with an ETag for the result.
+
+        The ETag is derived from the mtimes of the listed directories, so it changes
+        exactly when the tree does; None means the workspace does not exist.
+        """
         workspace_dir = self.get_session_workspace_dir(
             user_id=user_id, session_id=session_id
         )
         if not workspace_dir:
-            return []
+            return [], None
 
         counter = {"count": 0}
-        base = workspace_dir.resolve()
+        digest = hashlib.sha1(f"{max_depth}:{max_entries}".encode())
 
         def build_dir(current: Path, prefix: str, depth: int) -> list[dict]:
             if depth > max_depth:
                 return []
 
+            mtime_ns, entries = self._list_dir(current)
+            digest.update(f"\0{prefix}\0{mtime_ns}".encode())
             nodes: list[dict] = []
-            try:
-                entries = sorted(
-                    current.iterdir(),
-                    key=lambda p: (
-                        1 if p.is_file() else 0,
-                        p.name.lower(),
-                    ),
-                )
-            except Exception:
-                return []
-
             for entry in entries:
                 if counter["count"] >= max_entries:
                     break
+                counter["count"] += 1
 
-                if entry.name in self._ignore_names:
-                    continue
+                rel_path = f"{prefix}/{entry.name}"
+                node = self._file_node(entry, rel_path)
+                if entry.is_dir:
+                    node["children"] = build_dir(
+                        current / entry.name, rel_path, depth + 1
+                    )
+                nodes.append(node)
 
-                if self.ignore_dot_files and entry.name.startswith("."):
-                    continue
+            return nodes
 
-                if entry.is_symlink():
-                    continue
+        nodes = build_dir(workspace_dir.resolve(), "", 0)
+        return nodes, f'"{digest.hexdigest()}"'
 
-                rel_path = f"{prefix}/{entry.name}" if prefix else f"/{entry.name}"
-                counter["count"] += 1
+    def list_workspace_files(
+        self,
+        user_id: str,
+        session_id: str,
+        *,
+        max_depth: int = 8,
+        max_entries: int = 4000,
+    ) -> list[dict]:
+        """List workspace files as a tree structure."""
+        nodes, _ = self.get_workspace_file_tree(
+            user_id, session_id, max_depth=max_depth, max_entries=max_entries
+        )
+        return nodes
 
-                if entry.is_dir():
-                    children = build_dir(entry, rel_path, depth + 1)
-                    nodes.append(
-                        {
-                            "id": rel_path,
-                            "name": entry.name,
-                            "type": "folder",
-                            "path": rel_path,
-                            "children": children,
-                        }
-                    )
-                elif entry.is_file():
-                    mime_type, _ = mimetypes.guess_type(entry.name)
-                    nodes.append(
-                        {
-                            "id": rel_path,
-                            "name": entry.name,
-                            "type": "file",
-                            "path": rel_path,
-                            "mimeType": mime_type,
-                        }
-                    )
+    def list_workspace_dir(
+        self,
+        user_id: str,
+        session_id: str,
+        dir_path: str = "/",
+        *,
+        cursor: str | None = None,
+        limit: int = 200,
+    ) -> dict | None:
+        """List one workspace directory, one page at a time, for lazy tree expansion.
+
+        Folder entries carry `children: None`; the client lists them on expansion.
+        `next_cursor` continues after the last returned entry, so pages stay
+        consistent while entries are added or removed. Returns None when the
+        directory does not exist; raises ValueError for a malformed cursor.
+        """
+        workspace_dir = self.get_session_workspace_dir(
+            user_id=user_id, session_id=session_id
+        )
+        if not workspace_dir:
+            return None
 
-            return nodes
+        base = workspace_dir.resolve()
+        clean = (dir_path or "").strip().strip("/")
+        directory = (base / clean).resolve() if clean else base
+        try:
+            rel = directory.relative_to(base)
+        except ValueError:
+            return None
+        if not directory.is_dir():
+            return None
 
-        return build_dir(base, "", 0)
+        mtime_ns, entries = self._list_dir(directory)
+        start = 0
+        if cursor:
+            keys = [e.sort_key for e in entries]
+            start = bisect_right(keys, _decode_cursor(cursor))
+        page = entries[start : start + max(1, limit)]
+        has_more = start + len(page) < len(entries)
+
+        prefix = f"/{rel.as_posix()}" if rel.parts else ""
+        etag = hashlib.sha1(
+            f"{prefix}\0{mtime_ns}\0{cursor or ''}\0{limit}".encode()
+        ).hexdigest()
+        return {
+            "path": prefix or "/",
+            "entries": [
+                self._file_node(entry, f"{prefix}/{entry.name}") for entry in page
+            ],
+            "next_cursor": _encode_cursor(page[-1].sort_key)
+            if has_more and page
+            else None,
+            "etag": f'"{etag}"',
+        }
 
     def resolve_workspace_file(
         self,
@@ -228,7 +723,8 @@ class WorkspaceManager:
         task_id: str = "",
         container_mode: Literal["ephemeral", "persistent"] = "ephemeral",
     ) -> None:
-        """Write metadata file."""
+        """Write metadata file, keeping the recorded workspace size."""
+        previous = self.get_meta(user_id, session_id)
         meta = WorkspaceMeta(
             session_id=session_id,
             user_id=user_id,
@@ -238,9 +734,13 @@ class WorkspaceManager:
             container_mode=container_mode,
             workspace_path=str(session_dir / "workspace"),
         )
+        if previous:
+            meta.size_bytes = previous.size_bytes
+            meta.size_updated_at = previous.size_updated_at
 
         meta_file = session_dir / "meta.json"
         _ = meta_file.write_text(json.dumps(meta.to_dict(), indent=2), encoding="utf-8")
+        self.usage_ledger.set_active(session_id, user_id, meta.size_bytes)
         logger.debug(
             "workspace_meta_written",
             extra={"session_id": session_id, "meta_file": str(meta_file)},
@@ -275,18 +775,168 @@ class WorkspaceManager:
                 json.dumps(meta.to_dict(), indent=2), encoding="utf-8"
             )
 
+    def refresh_workspace_size(self, user_id: str, session_id: str) -> int | None:
+        """Measure a session workspace and record its size in meta.json and the ledger.
+
+        Called after staging and export; returns None if the workspace is gone.
+        """
+        session_dir = self.active_dir / user_id / session_id
+        meta = self.get_meta(user_id, session_id)
+        if meta is None:
+            return None
+        size = _measure_dir(session_dir)
+        meta.size_bytes = size
+        meta.size_updated_at = datetime.now().isoformat()
+        meta_file = session_dir / "meta.json"
+        try:
+            _ = meta_file.write_text(
+                json.dumps(meta.to_dict(), indent=2), encoding="utf-8"
+            )
+        except FileNotFoundError:
+            # Deleted or archived while we were measuring.
+            return None
+        self.usage_ledger.set_active(session_id, user_id, size)
+        return size
+
+    def get_user_usage(self, user_id: str) -> dict[str, int]:
+        """Recorded disk usage of a user's active and archived workspaces."""
+        usage = self.usage_ledger.user_totals(user_id)
+        usage["total_bytes"] = usage["active_bytes"] + usage["archive_bytes"]
+        return usage
+
     def get_workspace_volume(self, user_id: str, session_id: str) -> str:
         """Get container mount path."""
         workspace_dir = self.get_workspace_path(user_id, session_id, create=True)
         return str(workspace_dir / "workspace")
 
+    def create_standby_volume(self, slot_id: str) -> str:
+        """Create an empty workspace directory for a warm-pool standby container."""
+        slot_dir = self.standby_dir / slot_id
+        slot_dir.mkdir(parents=True, exist_ok=True)
+        return str(slot_dir)
+
+    def remove_standby_volume(self, slot_id: str) -> None:
+        """Remove a standby workspace directory (best-effort)."""
+        slot_dir = self.standby_dir / slot_id
+        if slot_dir.exists():
+            shutil.rmtree(slot_dir, ignore_errors=True)
+
+    def bind_standby_volume(self, user_id: str, session_id: str, slot_id: str) -> str:
+        """Move a standby workspace directory into a session's workspace location.
+
+        The standby container keeps its bind mount on the directory inode, so renaming the
+        directory into place makes the session workspace visible at `/workspace` without
+        restarting the container. Anything already staged into the session workspace is
+        moved into the standby directory first; on a name clash the session's entry
+        wins and the one the idle executor created is dropped. All moves are renames on
+        the same filesystem, so this is O(top-level entries) regardless of workspace
+        size. Any failure rolls every rename back, leaving the session workspace and
+        the standby directory as they were.
+        """
+        slot_dir = self.standby_dir / slot_id
+        if not slot_dir.is_dir():
+            raise FileNotFoundError(f"Standby workspace not found: {slot_dir}")
+
+        session_dir = self.get_workspace_path(user_id, session_id, create=True)
+        workspace_dir = session_dir / "workspace"
+        staged_dir = session_dir / f".workspace-staged-{slot_id}"
+        displaced_dir = session_dir / f".workspace-displaced-{slot_id}"
+
+        workspace_dir.rename(staged_dir)
+        try:
+            slot_dir.rename(workspace_dir)
+        except Exception:
+            staged_dir.rename(workspace_dir)
+            raise
+
+        # (source, destination) of each rename, undone in reverse order on failure.
+        moves: list[tuple[Path, Path]] = []
+        try:
+            for entry in list(staged_dir.iterdir()):
+                target = workspace_dir / entry.name
+                if target.exists() or target.is_symlink():
+                    displaced_dir.mkdir(exist_ok=True)
+                    target.rename(displaced_dir / entry.name)
+                    moves.append((target, displaced_dir / entry.name))
+                entry.rename(target)
+                moves.append((entry, target))
+            staged_dir.rmdir()
+        except Exception:
+            try:
+                for source, destination in reversed(moves):
+                    destination.rename(source)
+                workspace_dir.rename(slot_dir)
+                staged_dir.rename(workspace_dir)
+                if displaced_dir.exists():
+                    displaced_dir.rmdir()
+            except Exception:
+                logger.exception(
+                    "standby_bind_rollback_failed",
+                    extra={"session_id": session_id, "slot_id": slot_id},
+                )
+            raise
+
+        if displaced_dir.exists():
+            shutil.rmtree(displaced_dir, ignore_errors=True)
+        return str(workspace_dir)
+
+    def record_standby_claim(
+        self, slot_id: str, *, session_id: str, user_id: str
+    ) -> None:
+        """Persist which session claimed a standby container.
+
+        Docker cannot relabel a running container, so a claimed standby keeps its slot
+        labels (`container_id=<slot_id>`, no `session_id`/`user`). This record maps the
+        slot back to its session across manager restarts.
+        """
+        claim_file = self.standby_claims_dir / f"{slot_id}.json"
+        tmp_file = claim_file.with_name(f".{claim_file.name}.tmp")
+        self.standby_claims_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(
+            json.dumps(
+                {
+                    "slot_id": slot_id,
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "claimed_at": datetime.now().isoformat(),
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_file, claim_file)
+
+    def load_standby_claims(self) -> dict[str, dict[str, str]]:
+        """Claim records by slot id (see `record_standby_claim`)."""
+        claims: dict[str, dict[str, str]] = {}
+        if not self.standby_claims_dir.is_dir():
+            return claims
+        for claim_file in self.standby_claims_dir.glob("*.json"):
+            try:
+                data = json.loads(claim_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and data.get("session_id"):
+                claims[claim_file.stem] = data
+        return claims
+
+    def remove_standby_claim(self, slot_id: str) -> None:
+        (self.standby_claims_dir / f"{slot_id}.json").unlink(missing_ok=True)
+
+    def list_standby_volumes(self) -> list[str]:
+        """Slot ids of the standby workspace directories on disk."""
+        if not self.standby_dir.is_dir():
+            return []
+        return [p.name for p in self.standby_dir.iterdir() if p.is_dir()]
+
     def archive_workspace(
         self,
         user_id: str,
         session_id: str,
         keep_days: int = 7,
+        *,
+        throttle: IoThrottle | None = None,
     ) -> str | None:
-        """Archive workspace."""
+        """Archive workspace as a tarball compressed with WORKSPACE_ARCHIVE_CODEC."""
         session_dir = self.active_dir / user_id / session_id
 
         if not session_dir.exists():
@@ -298,14 +948,31 @@ class WorkspaceManager:
             archive_user_dir = self.archive_dir / user_id / date_str
             archive_user_dir.mkdir(parents=True, exist_ok=True)
 
-            archive_file = archive_user_dir / f"{session_id}.tar.gz"
-
-            with tarfile.open(archive_file, "w:gz") as tar:
-                tar.add(session_dir, arcname=session_id)
+            suffix = _ARCHIVE_SUFFIXES[self.archive_codec]
+            archive_file = archive_user_dir / f"{session_id}{suffix}"
+            # Written under a temporary name so an interrupted archive never looks done.
+            tmp_file = archive_user_dir / f".{archive_file.name}.tmp"
+            try:
+                _write_archive(
+                    session_dir,
+                    session_id,
+                    tmp_file,
+                    codec=self.archive_codec,
+                    level=self.settings.workspace_archive_compression_level,
+                    throttle=throttle,
+                )
+                tmp_file.replace(archive_file)
+            finally:
+                tmp_file.unlink(missing_ok=True)
 
             self.update_meta_status(user_id, session_id, "archived")
 
             shutil.rmtree(session_dir)
+            self.session_index.remove(session_id)
+            self.usage_ledger.remove_active(session_id)
+            self.usage_ledger.add_archive(
+                str(archive_file), user_id, archive_file.stat().st_size
+            )
 
             logger.info(f"Archived workspace: {session_dir} -> {archive_file}")
             return str(archive_file)
@@ -337,18 +1004,26 @@ class WorkspaceManager:
 
         try:
             shutil.rmtree(session_dir)
+            self.session_index.remove(session_id)
+            self.usage_ledger.remove_active(session_id)
             logger.info(f"Deleted workspace: {session_dir}")
             return True
         except Exception as e:
             logger.error(f"Failed to delete workspace {session_dir}: {e}")
             return False
 
-    def cleanup_expired_workspaces(self, max_age_hours: int = 24) -> dict[str, int]:
-        """Clean up expired workspaces."""
-        now = datetime.now()
-        cleaned = 0
-        archived = 0
-        errors = 0
+    def find_expired_workspaces(
+        self,
+        max_age_hours: int = 24,
+        now: datetime | None = None,
+    ) -> list[tuple[str, str, Literal["delete", "archive"]]]:
+        """List workspaces due for cleanup as (user_id, session_id, action).
+
+        Workspaces without metadata are deleted; expired active workspaces are deleted
+        when ephemeral and archived when persistent.
+        """
+        now = now or datetime.now()
+        expired: list[tuple[str, str, Literal["delete", "archive"]]] = []
 
         for user_dir in self.active_dir.iterdir():
             if not user_dir.is_dir():
@@ -361,43 +1036,31 @@ class WorkspaceManager:
                 meta = self.get_meta(user_dir.name, session_dir.name)
 
                 if not meta:
-                    if self.delete_workspace(
-                        user_dir.name, session_dir.name, force=True
-                    ):
-                        cleaned += 1
+                    expired.append((user_dir.name, session_dir.name, "delete"))
                     continue
 
                 created_at = datetime.fromisoformat(meta.created_at)
                 age = now - created_at
 
-                if meta.status == "active":
-                    if age > timedelta(hours=max_age_hours):
-                        logger.info(
-                            f"Workspace {session_dir.name} expired (age: {age})"
-                        )
-
-                        if meta.container_mode == "ephemeral":
-                            if self.delete_workspace(
-                                user_dir.name, session_dir.name, force=True
-                            ):
-                                cleaned += 1
-                        else:
-                            if self.archive_workspace(user_dir.name, session_dir.name):
-                                archived += 1
+                if meta.status == "active" and age > timedelta(hours=max_age_hours):
+                    logger.info(f"Workspace {session_dir.name} expired (age: {age})")
+                    action: Literal["delete", "archive"] = (
+                        "delete" if meta.container_mode == "ephemeral" else "archive"
+                    )
+                    expired.append((user_dir.name, session_dir.name, action))
 
-        return {
-            "cleaned": cleaned,
-            "archived": archived,
-            "errors": errors,
-        }
+        return expired
 
-    def get_disk_usage(self) -> dict[str, float | int | str]:
-        """Get disk usage statistics."""
+    def get_disk_usage(self) -> dict[str, float | int | str | None]:
+        """Get disk usage statistics.
+
+        Active and archive sizes come from the usage ledger rather than a walk of the
+        trees; only the (short-lived) temp directory is measured on each call.
+        """
         total, used, free = shutil.disk_usage(self.base_dir)
 
-        active_size = self._get_dir_size(self.active_dir)
-        archive_size = self._get_dir_size(self.archive_dir)
-        temp_size = self._get_dir_size(self.temp_dir)
+        usage = self.usage_ledger.totals()
+        temp_size = _measure_dir(self.temp_dir)
 
         return {
             "base_dir": str(self.base_dir),
@@ -405,29 +1068,73 @@ class WorkspaceManager:
             "used_gb": round(used / (1024**3), 2),
             "free_gb": round(free / (1024**3), 2),
             "usage_percent": round((used / total) * 100, 2),
-            "active_size_gb": round(active_size / (1024**3), 2),
-            "archive_size_gb": round(archive_size / (1024**3), 2),
+            "active_size_gb": round(usage["active_bytes"] / (1024**3), 2),
+            "archive_size_gb": round(usage["archive_bytes"] / (1024**3), 2),
             "temp_size_gb": round(temp_size / (1024**3), 2),
-            "active_workspaces": sum(1 for _ in self.active_dir.rglob("meta.json")),
-            "archived_workspaces": sum(1 for _ in self.archive_dir.rglob("*.tar.gz")),
+            "active_workspaces": usage["active_workspaces"],
+            "archived_workspaces": usage["archived_workspaces"],
+            "users": usage["users"],
+            "usage_reconciled_at": self.usage_ledger.reconciled_at,
         }
 
-    def _get_dir_size(self, path: Path) -> int:
-        """Get directory size."""
-        total = 0
-        for item in path.rglob("*"):
-            if item.is_file():
-                total += item.stat().st_size
-        return total
+    def reconcile_disk_usage(self) -> dict[str, int]:
+        """Re-measure every workspace and archive, correcting recorded sizes.
+
+        Sizes drift when workspaces change between refreshes (e.g. during a run) or
+        when files are removed outside the manager.
+        """
+        started = time.perf_counter()
+        active: dict[str, tuple[str, int]] = {}
+        corrected = 0
+        drift_bytes = 0
+        for meta_file in self.active_dir.glob("*/*/meta.json"):
+            session_dir = meta_file.parent
+            user_id = session_dir.parent.name
+            meta = self.get_meta(user_id, session_dir.name)
+            if meta is None:
+                continue
+            size = _measure_dir(session_dir)
+            active[session_dir.name] = (user_id, size)
+            if size == meta.size_bytes:
+                continue
+            corrected += 1
+            drift_bytes += abs(size - meta.size_bytes)
+            meta.size_bytes = size
+            meta.size_updated_at = datetime.now().isoformat()
+            try:
+                _ = meta_file.write_text(
+                    json.dumps(meta.to_dict(), indent=2), encoding="utf-8"
+                )
+            except FileNotFoundError:
+                active.pop(session_dir.name, None)
+
+        archives = _scan_archives(self.archive_dir)
+        self.usage_ledger.replace(active, archives)
+
+        stats = {
+            "workspaces": len(active),
+            "archives": len(archives),
+            "corrected": corrected,
+            "drift_bytes": drift_bytes,
+        }
+        logger.info(
+            "timing",
+            extra={
+                "step": "workspace_usage_reconcile",
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+                **stats,
+            },
+        )
+        return stats
 
-    def get_user_workspaces(self, user_id: str) -> list[dict[str, str | int]]:
+    def get_user_workspaces(self, user_id: str) -> list[dict[str, str | int | None]]:
         """Get all workspaces for a user."""
         user_dir = self.active_dir / user_id
 
         if not user_dir.exists():
             return []
 
-        workspaces: list[dict[str, str | int]] = []
+        workspaces: list[dict[str, str | int | None]] = []
         for session_dir in user_dir.iterdir():
             if not session_dir.is_dir():
                 continue
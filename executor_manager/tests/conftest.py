@@ -0,0 +1,7 @@
+import os
+
+# Settings are validated at import time; the services under test talk to fakes.
+os.environ.setdefault("S3_ENDPOINT", "http://s3.test")
+os.environ.setdefault("S3_ACCESS_KEY", "test")
+os.environ.setdefault("S3_SECRET_KEY", "test")
+os.environ.setdefault("S3_BUCKET", "test")
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+import app.services.workspace_export_service as export_module
+from app.services.storage_service import S3StorageService
+from app.services.workspace_export_service import WorkspaceExportService
+
+NOW = datetime.now(UTC)
+OLD = NOW - timedelta(days=3)
+
+
+class FakeStorage:
+    def __init__(self, objects: dict[str, tuple[bytes, datetime]]) -> None:
+        self.objects = objects
+        self.deleted: list[str] = []
+
+    def list_object_meta(self, prefix: str) -> list[dict]:
+        return [
+            {"key": key, "last_modified": modified}
+            for key, (_, modified) in self.objects.items()
+            if key.startswith(prefix)
+        ]
+
+    def get_object(self, key: str) -> bytes:
+        return self.objects[key][0]
+
+    def delete_objects(self, keys: list[str]) -> int:
+        for key in keys:
+            self.objects.pop(key)
+        self.deleted.extend(keys)
+        return len(keys)
+
+
+class FakeBackend:
+    def __init__(self, deleted_sessions: set[str]) -> None:
+        self.deleted_sessions = deleted_sessions
+
+    async def list_deleted_sessions(self, session_ids: list[str]) -> list[str]:
+        return [sid for sid in session_ids if sid in self.deleted_sessions]
+
+
+def _manifest(*keys: str) -> bytes:
+    return json.dumps({"files": [{"key": key} for key in keys]}).encode()
+
+
+@pytest.fixture
+def run_gc(monkeypatch):
+    def run(objects, *, deleted=(), grace_hours=24):
+        storage = FakeStorage(objects)
+        monkeypatch.setattr(export_module, "storage_service", storage)
+        monkeypatch.setattr(
+            export_module, "BackendClient", lambda: FakeBackend(set(deleted))
+        )
+        settings = export_module.get_settings()
+        monkeypatch.setattr(settings, "workspace_export_gc_grace_hours", grace_hours)
+        summary = asyncio.run(WorkspaceExportService().collect_garbage())
+        return summary, storage
+
+    return run
+
+
+def test_unreferenced_blobs_are_kept_within_the_grace_period(run_gc):
+    blob = "workspaces/u1/blobs/sha256/aa/aa1"
+    fresh = "workspaces/u1/blobs/sha256/bb/bb1"
+    stale = "workspaces/u1/blobs/sha256/cc/cc1"
+    summary, storage = run_gc(
+        {
+            "workspaces/u1/s1/manifest.json": (_manifest(blob), OLD),
+            blob: (b"", OLD),
+            fresh: (b"", NOW - timedelta(hours=1)),
+            stale: (b"", OLD),
+        }
+    )
+
+    assert storage.deleted == [stale]
+    assert summary["blobs_deleted"] == 1
+    assert fresh in storage.objects and blob in storage.objects
+
+
+def test_zero_grace_sweeps_every_unreferenced_blob(run_gc):
+    fresh = "blobs/sha256/bb/bb1"
+    _, storage = run_gc(
+        {fresh: (b"", NOW - timedelta(minutes=5))},
+        grace_hours=0,
+    )
+
+    assert storage.deleted == [fresh]
+
+
+def test_deleted_sessions_release_their_blobs_after_the_grace_period(run_gc):
+    shared = "workspaces/u1/blobs/sha256/aa/aa1"
+    only_deleted = "workspaces/u1/blobs/sha256/bb/bb1"
+    _, storage = run_gc(
+        {
+            "workspaces/u1/s1/manifest.json": (_manifest(shared), OLD),
+            "workspaces/u1/s2/manifest.json": (_manifest(shared, only_deleted), OLD),
+            "workspaces/u1/s2/files/x": (b"", OLD),
+            shared: (b"", OLD),
+            only_deleted: (b"", OLD),
+        },
+        deleted={"s2"},
+    )
+
+    assert sorted(storage.objects) == [shared, "workspaces/u1/s1/manifest.json"]
+
+
+def test_manifest_written_during_marking_protects_its_blobs(run_gc, monkeypatch):
+    blob = "workspaces/u1/blobs/sha256/aa/aa1"
+    objects = {
+        "workspaces/u1/s1/manifest.json": (_manifest(), OLD),
+        blob: (b"", OLD),
+    }
+    original = WorkspaceExportService._referenced_keys
+
+    def referenced_then_rewrite(manifest_keys):
+        # An export finishing while GC marks: the manifest now references the blob.
+        objects["workspaces/u1/s1/manifest.json"] = (
+            _manifest(blob),
+            datetime.now(UTC),
+        )
+        return original(manifest_keys)
+
+    monkeypatch.setattr(
+        WorkspaceExportService,
+        "_referenced_keys",
+        staticmethod(referenced_then_rewrite),
+    )
+    _, storage = run_gc(objects)
+
+    assert storage.deleted == []
+
+
+def test_skip_existing_touches_reused_blobs():
+    calls: list[tuple] = []
+
+    class FakeClient:
+        def head_object(self, **kwargs):
+            calls.append(("head", kwargs["Key"]))
+
+        def copy(self, source, bucket, key, ExtraArgs=None, Config=None):
+            calls.append(("copy", source["Key"], key, ExtraArgs))
+
+        def upload_file(self, *args, **kwargs):
+            calls.append(("upload",))
+
+    storage = S3StorageService.__new__(S3StorageService)
+    storage.bucket = "test"
+    storage.client = FakeClient()
+    storage.transfer_config = None
+
+    uploaded = storage._upload_one(__file__, "blobs/aa/aa1", "text/plain", True)
+
+    assert uploaded is False
+    assert calls == [
+        ("head", "blobs/aa/aa1"),
+        (
+            "copy",
+            "blobs/aa/aa1",
+            "blobs/aa/aa1",
+            {"MetadataDirective": "REPLACE", "ContentType": "text/plain"},
+        ),
+    ]
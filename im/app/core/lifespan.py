@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.core.database import Base, engine
+from app.core.http_client import get_http_client
 import app.models  # noqa: F401
 from app.services.dingtalk_stream_service import DingTalkStreamService
 from app.services.poller_service import PollerService
@@ -33,3 +34,4 @@ async def lifespan(_: FastAPI):
         for t in tasks:
             t.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
+        await get_http_client().aclose()
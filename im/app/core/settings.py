@@ -40,6 +40,24 @@ class Settings(BaseSettings):
         default=10.0, alias="POLL_HTTP_TIMEOUT_SECONDS"
     )
 
+    # Shared Backend HTTP client: keep-alive pool and retry policy.
+    http_max_connections: int = Field(default=50, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(
+        default=10, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="HTTP_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    # Requires the optional `h2` package; falls back to HTTP/1.1 when missing.
+    http2_enabled: bool = Field(default=False, alias="HTTP2_ENABLED")
+    http_retry_max_attempts: int = Field(default=3, alias="HTTP_RETRY_MAX_ATTEMPTS")
+    http_retry_backoff_seconds: float = Field(
+        default=0.2, alias="HTTP_RETRY_BACKOFF_SECONDS"
+    )
+    http_retry_backoff_max_seconds: float = Field(
+        default=2.0, alias="HTTP_RETRY_BACKOFF_MAX_SECONDS"
+    )
+
     # Telegram bot integration
     telegram_bot_token: str = Field(default="", alias="TELEGRAM_BOT_TOKEN")
     telegram_webhook_secret_token: str | None = Field(
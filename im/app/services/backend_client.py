@@ -3,6 +3,7 @@ from typing import Any
 
 import httpx
 
+from app.core.http_client import get_http_client
 from app.core.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ class BackendClient:
             self.settings.poll_http_timeout_seconds,
             connect=min(10.0, self.settings.poll_http_timeout_seconds),
         )
+        self.http = get_http_client()
 
     async def _request(
         self,
@@ -33,14 +35,14 @@ class BackendClient:
         json: Any | None = None,
     ) -> Any:
         url = f"{self.base_url}/api/v1{path}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.request(
-                method,
-                url,
-                params=params,
-                json=json,
-                headers={"X-User-Id": self.backend_user_id},
-            )
+        resp = await self.http.request(
+            method,
+            url,
+            timeout=self.timeout,
+            params=params,
+            json=json,
+            headers={"X-User-Id": self.backend_user_id},
+        )
 
         # Backend always returns JSON with {code,message,data} on success/error, but
         # still validate status code first for transport errors.